@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Compare the memory of a loaded components model with and without interning.
+
+Usage::
+
+    python benchmarks/io_memory.py --annotations 1000000
+
+A JSON document with the given number of compound annotations, five per compound,
+and reactions with two participants each is parsed. The memory retained by the
+resulting model is measured with tracemalloc once with interning of prefixes,
+biology qualifiers, and compartment identifiers and once without. Finally, the
+memory retained by records converted from the model is measured.
+
+"""
+
+
+import argparse
+import gc
+import json
+import tracemalloc
+from contextlib import contextmanager
+
+from cobra_component_models.io import ComponentsModel, set_interning
+from cobra_component_models.record import to_record
+
+
+PREFIXES = ["chebi", "kegg.compound", "metanetx.chemical", "bigg.metabolite", "hmdb"]
+QUALIFIERS = ["is", "isVersionOf", "hasPart", "isHomologTo", "is", "is"]
+COMPARTMENTS = ["cytosol", "extracellular", "mitochondrion", "periplasm"]
+
+
+@contextmanager
+def no_interning():
+    """Temporarily turn off the interning of the IO models."""
+    previous = set_interning(False)
+    try:
+        yield
+    finally:
+        set_interning(previous)
+
+
+def make_document(num_annotations: int) -> str:
+    """Create a JSON components document with the given number of annotations."""
+    num_compounds = num_annotations // len(PREFIXES)
+    compounds = {
+        f"c{i}": {
+            "id": f"c{i}",
+            "annotation": {
+                prefix: [
+                    {
+                        "biologyQualifier": QUALIFIERS[(i + j) % len(QUALIFIERS)],
+                        "identifier": f"{prefix}:{i}",
+                    }
+                ]
+                for j, prefix in enumerate(PREFIXES)
+            },
+        }
+        for i in range(num_compounds)
+    }
+    reactions = {
+        f"r{i}": {
+            "id": f"r{i}",
+            "reactants": {
+                f"c{i}": {
+                    "stoichiometry": "1",
+                    "compartment": COMPARTMENTS[i % len(COMPARTMENTS)],
+                }
+            },
+            "products": {
+                f"c{(i + 1) % num_compounds}": {
+                    "stoichiometry": "1",
+                    "compartment": COMPARTMENTS[(i + 1) % len(COMPARTMENTS)],
+                }
+            },
+        }
+        for i in range(num_compounds)
+    }
+    return json.dumps({"compounds": compounds, "reactions": reactions})
+
+
+def measure(document: str) -> int:
+    """Return the number of bytes retained by the parsed model."""
+    gc.collect()
+    tracemalloc.start()
+    model = ComponentsModel.parse_raw(document)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model
+    return size
+
+
+def measure_records(document: str) -> int:
+    """Return the number of bytes retained by records of the parsed model."""
+    gc.collect()
+    tracemalloc.start()
+    model = ComponentsModel.parse_raw(document)
+    records = [to_record(c) for c in model.compounds.values()] + [
+        to_record(r) for r in model.reactions.values()
+    ]
+    del model
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--annotations", type=int, default=1000000)
+    args = parser.parse_args()
+    document = make_document(args.annotations)
+    with no_interning():
+        regular = measure(document)
+    interned = measure(document)
+    print(f"without interning: {regular / 2 ** 20:.1f} MiB")
+    print(
+        f"with interning: {interned / 2 ** 20:.1f} MiB "
+        f"({1 - interned / regular:.0%} less)"
+    )
+    records = measure_records(document)
+    print(
+        f"records: {records / 2 ** 20:.1f} MiB ({records / interned:.0%} of the "
+        f"interned model)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Compare the parse throughput of the validation fast path with regular validation.
+
+Usage::
+
+    python benchmarks/io_validation.py --compounds 20000 --reactions 20000
+
+A synthetic components document is parsed once with the fast path and once with
+it disabled. Pass ``--no-gc`` to exclude the cyclic garbage collector, which
+otherwise traverses the growing number of model instances repeatedly.
+
+"""
+
+
+import argparse
+import gc
+import time
+from contextlib import contextmanager
+
+from cobra_component_models.io import (
+    AbstractBaseModel,
+    AnnotationModel,
+    CompartmentModel,
+    ComponentsModel,
+    CompoundModel,
+    NameModel,
+    ParticipantModel,
+    ReactionModel,
+)
+
+
+MODELS = [
+    AbstractBaseModel,
+    AnnotationModel,
+    CompartmentModel,
+    ComponentsModel,
+    CompoundModel,
+    NameModel,
+    ParticipantModel,
+    ReactionModel,
+]
+
+
+@contextmanager
+def regular_validation():
+    """Temporarily disable the fast path of all IO models."""
+    previous = {model: model.__dict__.get("__plain_fields__") for model in MODELS}
+    for model in MODELS:
+        model.__plain_fields__ = {}
+    try:
+        yield
+    finally:
+        for model, plain_fields in previous.items():
+            model.__plain_fields__ = plain_fields
+
+
+def make_document(num_compounds: int, num_reactions: int) -> dict:
+    """Create a components document shaped like typical database exports."""
+    compounds = {
+        f"c{i}": {
+            "id": f"c{i}",
+            "notes": "Generated for benchmarking.",
+            "charge": -1,
+            "chemicalFormula": "C2H3O2",
+            "names": {
+                "chebi": [
+                    {"name": f"compound {i}", "isPreferred": True},
+                    {"name": f"synonym {i}"},
+                ]
+            },
+            "annotation": {
+                "chebi": [
+                    {"biologyQualifier": "is", "identifier": f"CHEBI:{i}"},
+                    {
+                        "biologyQualifier": "isVersionOf",
+                        "identifier": f"CHEBI:{i + 1}",
+                        "isDeprecated": True,
+                    },
+                ],
+                "kegg.compound": [
+                    {"biologyQualifier": "is", "identifier": f"C{i:05d}"}
+                ],
+            },
+        }
+        for i in range(num_compounds)
+    }
+    reactions = {
+        f"r{i}": {
+            "id": f"r{i}",
+            "names": {"rhea": [{"name": f"reaction {i}"}]},
+            "annotation": {"rhea": [{"biologyQualifier": "is", "identifier": str(i)}]},
+            "reactants": {
+                f"c{i % num_compounds}": {"stoichiometry": "1", "compartment": "c"},
+                f"c{(i + 1) % num_compounds}": {
+                    "stoichiometry": "2",
+                    "compartment": "c",
+                },
+            },
+            "products": {
+                f"c{(i + 2) % num_compounds}": {
+                    "stoichiometry": "1",
+                    "compartment": "c",
+                }
+            },
+        }
+        for i in range(num_reactions)
+    }
+    return {
+        "compartments": {"c": {"id": "c"}},
+        "compounds": compounds,
+        "reactions": reactions,
+    }
+
+
+def measure(document: dict, repeats: int) -> float:
+    """Return the best time in seconds to parse the document."""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ComponentsModel.parse_obj(document)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--compounds", type=int, default=20000)
+    parser.add_argument("--reactions", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--no-gc", action="store_true")
+    args = parser.parse_args()
+    document = make_document(args.compounds, args.reactions)
+    if args.no_gc:
+        gc.disable()
+    with regular_validation():
+        regular = measure(document, args.repeats)
+    fast = measure(document, args.repeats)
+    assert ComponentsModel.parse_obj(document) == ComponentsModel(**document)
+    print(f"regular: {regular:.2f} s")
+    print(f"fast path: {fast:.2f} s ({regular / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+
+
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Compare query plans of the builders' join paths with and without FK indexes.
+
+Usage::
+
+    python benchmarks/query_plans.py --compounds 20000 --reactions 10000
+
+A synthetic database is populated and every query is explained and timed twice:
+once without the foreign key indexes ("before") and once with the full schema
+("after"). Pass a PostgreSQL URL with ``--url`` to benchmark a server; the
+tables are created and dropped again.
+
+"""
+
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, text
+
+from cobra_component_models.orm import Base
+
+
+# The indexes that serve foreign key join paths.
+FK_INDEXES = [
+    "ix_participants_reaction_id",
+    "ix_participants_compartment_id",
+    "ix_participants_compound_id_reaction_id",
+    "ix_compound_names_namespace_id",
+    "ix_compound_annotations_namespace_id",
+    "ix_compound_annotations_biology_qualifier_id",
+    "ix_reaction_names_namespace_id",
+    "ix_reaction_annotations_namespace_id",
+    "ix_reaction_annotations_biology_qualifier_id",
+]
+
+QUERIES = {
+    "reactions of a compound": (
+        "SELECT DISTINCT reaction_id FROM participants WHERE compound_id = :id"
+    ),
+    "participants of reactions": (
+        "SELECT * FROM participants WHERE reaction_id IN (:id, :id + 1, :id + 2)"
+    ),
+    "names of compounds": (
+        "SELECT * FROM compound_names WHERE compound_id IN (:id, :id + 1, :id + 2)"
+    ),
+    "annotation in a namespace": (
+        "SELECT compound_id FROM compound_annotations WHERE namespace_id = 2 "
+        "AND compound_id < :id"
+    ),
+}
+
+
+def populate(connection, num_compounds: int, num_reactions: int) -> None:
+    """Insert synthetic components with names, annotation, and participants."""
+    now = datetime.now(timezone.utc)
+    tables = Base.metadata.tables
+    connection.execute(
+        tables["namespaces"].insert(),
+        [
+            {
+                "id": i,
+                "miriam_id": f"MIR:{i:08d}",
+                "prefix": f"ns{i}",
+                "pattern": ".*",
+                "embedded_prefix": False,
+                "created_on": now,
+            }
+            for i in range(1, 11)
+        ],
+    )
+    connection.execute(
+        tables["biology_qualifiers"].insert(),
+        [{"id": 1, "qualifier": "is", "created_on": now}],
+    )
+    connection.execute(
+        tables["compartments"].insert(),
+        [{"id": i, "created_on": now} for i in range(1, 4)],
+    )
+    connection.execute(
+        tables["compounds"].insert(),
+        [{"id": i, "created_on": now} for i in range(1, num_compounds + 1)],
+    )
+    connection.execute(
+        tables["compound_names"].insert(),
+        [
+            {
+                "compound_id": i,
+                "namespace_id": 1 + i % 10,
+                "name": f"compound {i}",
+                "is_preferred": False,
+                "created_on": now,
+            }
+            for i in range(1, num_compounds + 1)
+        ],
+    )
+    connection.execute(
+        tables["compound_annotations"].insert(),
+        [
+            {
+                "compound_id": i,
+                "namespace_id": 1 + i % 10,
+                "biology_qualifier_id": 1,
+                "identifier": f"ID:{i}",
+                "is_deprecated": False,
+                "created_on": now,
+            }
+            for i in range(1, num_compounds + 1)
+        ],
+    )
+    connection.execute(
+        tables["reactions"].insert(),
+        [{"id": i, "created_on": now} for i in range(1, num_reactions + 1)],
+    )
+    rng = random.Random(42)
+    connection.execute(
+        tables["participants"].insert(),
+        [
+            {
+                "reaction_id": i,
+                "compound_id": compound_id,
+                "compartment_id": 1 + j % 3,
+                "stoichiometry": "1",
+                "is_product": j % 2 == 1,
+                "created_on": now,
+            }
+            for i in range(1, num_reactions + 1)
+            for j, compound_id in enumerate(rng.sample(range(1, num_compounds + 1), 4))
+        ],
+    )
+
+
+def explain(connection, query: str, parameters: dict) -> str:
+    """Return the database's plan of a query."""
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {query}"), parameters)
+        return "\n".join(f"    {row[-1]}" for row in rows)
+    rows = connection.execute(text(f"EXPLAIN {query}"), parameters)
+    return "\n".join(f"    {row[0]}" for row in rows)
+
+
+def measure(connection, query: str, parameters: dict, repeats: int) -> float:
+    """Return the mean execution time of a query in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        connection.execute(text(query), parameters).fetchall()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def report(connection, label: str, num_compounds: int, repeats: int) -> None:
+    """Explain and time all queries."""
+    parameters = {"id": num_compounds // 2}
+    print(f"=== {label} ===")
+    for name, query in QUERIES.items():
+        duration = measure(connection, query, parameters, repeats)
+        print(f"{name}: {duration:.3f} ms")
+        print(explain(connection, query, parameters))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--compounds", type=int, default=20000)
+    parser.add_argument("--reactions", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=100)
+    args = parser.parse_args()
+    engine = create_engine(args.url)
+    Base.metadata.create_all(engine)
+    try:
+        with engine.begin() as connection:
+            populate(connection, args.compounds, args.reactions)
+        with engine.begin() as connection:
+            for index in FK_INDEXES:
+                connection.execute(text(f"DROP INDEX {index}"))
+            connection.execute(text("ANALYZE"))
+            report(connection, "before", args.compounds, args.repeats)
+        for index in Base.metadata.tables["participants"].indexes.union(
+            *(
+                Base.metadata.tables[name].indexes
+                for name in (
+                    "compound_names",
+                    "compound_annotations",
+                    "reaction_names",
+                    "reaction_annotations",
+                )
+            )
+        ):
+            if index.name in FK_INDEXES:
+                index.create(engine)
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+            report(connection, "after", args.compounds, args.repeats)
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
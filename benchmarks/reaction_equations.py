@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Measure the throughput of parsing and rendering reaction equations.
+
+Usage::
+
+    python benchmarks/reaction_equations.py --equations 200000
+
+Synthetic equations with three to five participants, as typical for text-based
+reaction databases, are parsed into participant models and rendered again.
+
+"""
+
+
+import argparse
+import time
+
+from cobra_component_models.io import ReactionModel, parse_equations, render_equations
+
+
+def make_equations(num_equations: int) -> list:
+    """Create equations with varying coefficients and compartments."""
+    return [
+        f"{i % 3 + 1} " * bool(i % 3)
+        + f"cpd{i}[c] + cpd{i + 1}[c] <=> cpd{i + 2}[e] + "
+        f"0.5 cpd{i + 3}[c]" + (" + h+[c]" if i % 2 else "")
+        for i in range(num_equations)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--equations", type=int, default=200000)
+    args = parser.parse_args()
+    equations = make_equations(args.equations)
+    start = time.perf_counter()
+    parsed = list(parse_equations(equations))
+    parse_time = time.perf_counter() - start
+    reactions = [
+        ReactionModel.construct(id=str(i), reactants=reactants, products=products)
+        for i, (reactants, products) in enumerate(parsed)
+    ]
+    start = time.perf_counter()
+    rendered = list(render_equations(reactions))
+    render_time = time.perf_counter() - start
+    assert rendered == equations
+    print(f"parse: {args.equations / parse_time * 60:,.0f} equations per minute")
+    print(f"render: {args.equations / render_time * 60:,.0f} equations per minute")
+
+
+if __name__ == "__main__":
+    main()
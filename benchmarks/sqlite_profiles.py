@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Compare the import throughput of SQLite profiles on scaled-up test data.
+
+Usage::
+
+    python benchmarks/sqlite_profiles.py --copies 2000 --batch-size 100
+
+The test compounds and reactions are replicated under new identifiers and loaded
+through the builders into a fresh database file per profile, committing after
+every batch.
+
+"""
+
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import toml
+from sqlalchemy.orm import Session
+
+from cobra_component_models.builder import CompoundBuilder, ReactionBuilder
+from cobra_component_models.engine import SQLITE_PROFILES, make_engine
+from cobra_component_models.io import CompoundModel, ReactionModel
+from cobra_component_models.orm import Base, BiologyQualifier, Namespace
+
+
+DATA = Path(__file__).parents[1] / "tests" / "test_integration" / "data"
+STRUCTURES = ("inchi", "inchikey", "smiles")
+
+
+def load(
+    path: Path, profile: Optional[str], copies: int, batch_size: int, data: dict
+) -> float:
+    """Load copies of the test data and return the duration in seconds."""
+    engine = make_engine(f"sqlite:///{path}", profile=profile)
+    Base.metadata.create_all(engine)
+    session = Session(bind=engine)
+    BiologyQualifier.load(session)
+    for obj in data["namespaces"].values():
+        session.add(Namespace(**obj))
+    session.commit()
+    kwargs = {
+        "biology_qualifiers": BiologyQualifier.get_map(session),
+        "namespaces": Namespace.get_map(session),
+    }
+    compound_builder = CompoundBuilder(**kwargs)
+    reaction_builder = ReactionBuilder(id2compartment={"c": None}, **kwargs)
+    start = time.perf_counter()
+    for copy in range(copies):
+        id2compound = {
+            id: compound_builder.build_orm(CompoundModel.parse_obj(obj))
+            for id, obj in data["compounds"].items()
+        }
+        reaction_builder.id2compound = id2compound
+        session.add_all(id2compound.values())
+        session.add_all(
+            reaction_builder.build_orm(ReactionModel.parse_obj(obj))
+            for obj in data["reactions"].values()
+        )
+        if (copy + 1) % batch_size == 0:
+            session.commit()
+    session.commit()
+    duration = time.perf_counter() - start
+    session.close()
+    engine.dispose()
+    return duration
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--copies", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    data = {}
+    for name in ("namespaces", "compounds", "reactions"):
+        with (DATA / f"{name}.toml").open() as handle:
+            data[name] = toml.load(handle)
+    # Structures are unique per compound, thus they cannot be replicated.
+    for obj in data["compounds"].values():
+        for key in STRUCTURES:
+            obj.get("annotation", {}).pop(key, None)
+    num_components = args.copies * (len(data["compounds"]) + len(data["reactions"]))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for profile in [None] + sorted(SQLITE_PROFILES):
+            duration = load(
+                Path(tmpdir) / f"{profile}.db",
+                profile,
+                args.copies,
+                args.batch_size,
+                data,
+            )
+            print(
+                f"{profile or 'default'}: {duration:.2f} s "
+                f"({num_components / duration:.0f} components/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
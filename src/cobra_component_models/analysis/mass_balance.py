@@ -0,0 +1,169 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a vectorized mass and charge balance check of reactions."""
+
+
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from ..chemistry import parse_stoichiometry
+from ..orm import Compound, CompoundElement, Participant
+
+
+class MassBalance(NamedTuple):
+    """
+    Define the mass and charge balance of reactions.
+
+    Attributes
+    ----------
+    reaction_ids : numpy.ndarray
+        The primary keys of the checked reactions in ascending order.
+    elements : list of str
+        The element symbols in the order of the columns of `element_imbalance`.
+    element_imbalance : numpy.ndarray
+        A matrix with one row per reaction and one column per element. Each entry
+        is the number of atoms produced minus the number consumed. Rows of reactions
+        with participants of unknown formula are undefined (NaN).
+    charge_imbalance : numpy.ndarray
+        The charge of the products minus the charge of the reactants per reaction or
+        NaN if any participant's charge or stoichiometry is unknown.
+
+    """
+
+    reaction_ids: np.ndarray
+    elements: List[str]
+    element_imbalance: np.ndarray
+    charge_imbalance: np.ndarray
+
+    def is_mass_balanced(self, tolerance: float = 1e-6) -> np.ndarray:
+        """Return a boolean mask of reactions that are balanced in every element."""
+        with np.errstate(invalid="ignore"):
+            return np.all(np.abs(self.element_imbalance) <= tolerance, axis=1)
+
+    def is_charge_balanced(self, tolerance: float = 1e-6) -> np.ndarray:
+        """Return a boolean mask of reactions that are balanced in charge."""
+        with np.errstate(invalid="ignore"):
+            return np.abs(self.charge_imbalance) <= tolerance
+
+    def is_checkable(self) -> np.ndarray:
+        """Return a boolean mask of reactions whose elements are all known."""
+        return ~np.any(np.isnan(self.element_imbalance), axis=1)
+
+
+def check_mass_balance(
+    session, reaction_ids: Optional[Iterable[int]] = None
+) -> MassBalance:
+    """
+    Check the mass and charge balance of reactions in the database.
+
+    Instead of looping over reactions in Python, all participants and element
+    counts are selected at once. The element imbalance is then the product of the
+    transposed, signed stoichiometric matrix with the compound-by-element count
+    matrix, computed as a single vectorized scatter-add over the participants,
+    i.e., a sparse matrix product.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    reaction_ids : iterable of int, optional
+        Restrict the check to reactions with these primary keys (default all).
+
+    Returns
+    -------
+    MassBalance
+        The element and charge imbalance of every reaction with participants.
+
+    Notes
+    -----
+    Element counts are derived from compounds' chemical formulae when they are
+    built. Use
+    :func:`cobra_component_models.chemistry.update_formula_attributes`
+    to derive them for compounds that were stored otherwise.
+
+    """
+    query = select(
+        [
+            Participant.reaction_id,
+            Participant.compound_id,
+            Participant.stoichiometry,
+            Participant.is_product,
+        ]
+    )
+    if reaction_ids is not None:
+        query = query.where(Participant.reaction_id.in_(list(reaction_ids)))
+    participants = session.execute(query).fetchall()
+    if not participants:
+        return MassBalance(
+            reaction_ids=np.empty(0, dtype=int),
+            elements=[],
+            element_imbalance=np.empty((0, 0)),
+            charge_imbalance=np.empty(0),
+        )
+    reaction_column, compound_column, stoichiometry, is_product = zip(*participants)
+    reactions, reaction_index = np.unique(reaction_column, return_inverse=True)
+    compounds, compound_index = np.unique(compound_column, return_inverse=True)
+    coefficients = np.array([parse_stoichiometry(s) for s in stoichiometry])
+    coefficients[~np.array(is_product, dtype=bool)] *= -1
+    compound_ids = compounds.tolist()
+
+    # Build the dense compound-by-element count matrix.
+    element_rows = []
+    charges = np.full(len(compounds), np.nan)
+    for start in range(0, len(compound_ids), 500):
+        chunk = compound_ids[start : start + 500]
+        element_rows.extend(
+            session.execute(
+                select(
+                    [
+                        CompoundElement.compound_id,
+                        CompoundElement.element,
+                        CompoundElement.count,
+                    ]
+                ).where(CompoundElement.compound_id.in_(chunk))
+            )
+        )
+        for compound_id, charge in session.execute(
+            select([Compound.id, Compound.charge]).where(Compound.id.in_(chunk))
+        ):
+            if charge is not None:
+                charges[np.searchsorted(compounds, compound_id)] = charge
+    elements = sorted({element for _, element, _ in element_rows})
+    counts = np.zeros((len(compounds), len(elements)))
+    # Compounds without any element counts have an unknown formula.
+    counts[:, :] = np.nan
+    if element_rows:
+        rows, element_column, values = zip(*element_rows)
+        row_index = np.searchsorted(compounds, rows)
+        counts[row_index, :] = 0.0
+        counts[row_index, np.searchsorted(elements, element_column)] = values
+
+    element_imbalance = np.zeros((len(reactions), len(elements)))
+    np.add.at(
+        element_imbalance,
+        reaction_index,
+        coefficients[:, np.newaxis] * counts[compound_index],
+    )
+    charge_imbalance = np.zeros(len(reactions))
+    np.add.at(charge_imbalance, reaction_index, coefficients * charges[compound_index])
+    return MassBalance(
+        reaction_ids=reactions,
+        elements=elements,
+        element_imbalance=element_imbalance,
+        charge_imbalance=charge_imbalance,
+    )
@@ -0,0 +1,209 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide an export of the bipartite compound-reaction network as CSR arrays."""
+
+
+from typing import Dict, Iterable, NamedTuple, Optional, Set
+
+import numpy as np
+from sqlalchemy import select
+
+from ..chemistry import parse_stoichiometry
+from ..orm import CompoundAnnotation, Namespace, Participant
+
+
+class Adjacency(NamedTuple):
+    """
+    Define one direction of a bipartite graph in compressed sparse row format.
+
+    The neighbours of row ``i`` are ``indices[indptr[i]:indptr[i + 1]]`` with the
+    corresponding ``weights``. The arrays are compatible with
+    ``scipy.sparse.csr_matrix((weights, indices, indptr))``.
+
+    Attributes
+    ----------
+    indptr : numpy.ndarray
+        The offsets of each row's neighbours with one more entry than rows.
+    indices : numpy.ndarray
+        The column indices of the neighbours in ascending order per row.
+    weights : numpy.ndarray
+        The signed stoichiometry of each edge, negative for reactants. It is NaN
+        where the stoichiometry is not numeric.
+
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    def neighbors(self, row: int) -> np.ndarray:
+        """Return the column indices adjacent to the given row."""
+        return self.indices[self.indptr[row] : self.indptr[row + 1]]
+
+    def edge_weights(self, row: int) -> np.ndarray:
+        """Return the weights of the edges of the given row."""
+        return self.weights[self.indptr[row] : self.indptr[row + 1]]
+
+    def degrees(self) -> np.ndarray:
+        """Return the number of edges of every row."""
+        return np.diff(self.indptr)
+
+
+class MetabolicNetwork(NamedTuple):
+    """
+    Define the bipartite compound-reaction network of a database.
+
+    Attributes
+    ----------
+    compound_ids : numpy.ndarray
+        The primary keys of the participating compounds in ascending order. Row
+        ``i`` of `compound_reactions` refers to ``compound_ids[i]``.
+    reaction_ids : numpy.ndarray
+        The primary keys of the reactions in ascending order. Row ``j`` of
+        `reaction_compounds` refers to ``reaction_ids[j]``.
+    compound_reactions : Adjacency
+        The reactions in which each compound participates as indices into
+        `reaction_ids`.
+    reaction_compounds : Adjacency
+        The compounds participating in each reaction as indices into
+        `compound_ids`. This is the transpose of `compound_reactions`.
+
+    """
+
+    compound_ids: np.ndarray
+    reaction_ids: np.ndarray
+    compound_reactions: Adjacency
+    reaction_compounds: Adjacency
+
+
+def build_network(
+    session,
+    currency_metabolites: Optional[Dict[str, Iterable[str]]] = None,
+    reaction_ids: Optional[Iterable[int]] = None,
+) -> MetabolicNetwork:
+    """
+    Build the compound-reaction network directly from the participants table.
+
+    The participants are selected in a single query and the adjacency indexes
+    are constructed by sorting and counting with NumPy. Each participant becomes
+    one edge, thus a compound that occurs in several compartments of a reaction,
+    e.g., in transport reactions, has one edge per compartment.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    currency_metabolites : dict, optional
+        A mapping from namespace prefixes to annotation identifiers, for example,
+        ``{"chebi": ["CHEBI:15377"]}``. Compounds with any of these annotations are
+        left out of the network (default none).
+    reaction_ids : iterable of int, optional
+        Restrict the network to reactions with these primary keys (default all).
+
+    Returns
+    -------
+    MetabolicNetwork
+        The adjacency indexes in both directions. Reactions whose participants
+        are all excluded are left out.
+
+    """
+    query = select(
+        [
+            Participant.compound_id,
+            Participant.reaction_id,
+            Participant.stoichiometry,
+            Participant.is_product,
+        ]
+    )
+    if reaction_ids is not None:
+        query = query.where(Participant.reaction_id.in_(list(reaction_ids)))
+    if currency_metabolites:
+        excluded = currency_compound_ids(session, currency_metabolites)
+        if excluded:
+            query = query.where(Participant.compound_id.notin_(sorted(excluded)))
+    participants = session.execute(query).fetchall()
+    if not participants:
+        empty = Adjacency(
+            indptr=np.zeros(1, dtype=np.int64),
+            indices=np.empty(0, dtype=np.int64),
+            weights=np.empty(0),
+        )
+        return MetabolicNetwork(
+            compound_ids=np.empty(0, dtype=np.int64),
+            reaction_ids=np.empty(0, dtype=np.int64),
+            compound_reactions=empty,
+            reaction_compounds=empty,
+        )
+    compound_column, reaction_column, stoichiometry, is_product = zip(*participants)
+    compounds, compound_index = np.unique(compound_column, return_inverse=True)
+    reactions, reaction_index = np.unique(reaction_column, return_inverse=True)
+    weights = np.array([parse_stoichiometry(s) for s in stoichiometry])
+    weights[~np.array(is_product, dtype=bool)] *= -1
+    return MetabolicNetwork(
+        compound_ids=compounds,
+        reaction_ids=reactions,
+        compound_reactions=_compress(
+            compound_index, reaction_index, weights, len(compounds)
+        ),
+        reaction_compounds=_compress(
+            reaction_index, compound_index, weights, len(reactions)
+        ),
+    )
+
+
+def currency_compound_ids(
+    session, currency_metabolites: Dict[str, Iterable[str]]
+) -> Set[int]:
+    """
+    Return the primary keys of compounds with any of the given annotations.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    currency_metabolites : dict
+        A mapping from namespace prefixes to annotation identifiers.
+
+    Returns
+    -------
+    set of int
+        The primary keys of the matching compounds.
+
+    """
+    result = set()
+    for prefix, identifiers in currency_metabolites.items():
+        query = (
+            select([CompoundAnnotation.compound_id])
+            .select_from(CompoundAnnotation.__table__.join(Namespace.__table__))
+            .where(Namespace.prefix == prefix)
+            .where(CompoundAnnotation.identifier.in_(list(identifiers)))
+        )
+        result.update(compound_id for compound_id, in session.execute(query))
+    return result
+
+
+def _compress(
+    rows: np.ndarray, columns: np.ndarray, weights: np.ndarray, num_rows: int
+) -> Adjacency:
+    """Sort edges by row and column and compress the rows into offsets."""
+    order = np.lexsort((columns, rows))
+    indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_rows), out=indptr[1:])
+    return Adjacency(
+        indptr=indptr,
+        indices=columns[order].astype(np.int64),
+        weights=weights[order],
+    )
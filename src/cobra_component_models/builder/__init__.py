@@ -20,3 +20,4 @@ from .abstract_builder import AbstractBuilder
 from .compartment_builder import CompartmentBuilder
 from .compound_builder import CompoundBuilder
 from .reaction_builder import ReactionBuilder
+from .serialization_cache import CacheStatistics, SerializationCache
@@ -27,6 +27,7 @@ from ..orm import (
     BiologyQualifier,
     Namespace,
 )
+from ..record import AnnotationRecord, NameRecord
 
 
 class AbstractBuilder(ABC):
@@ -91,6 +92,31 @@ class AbstractBuilder(ABC):
             )
         return obj
 
+    def build_record_names(
+        self, names: List[AbstractComponentName]
+    ) -> Dict[str, List[NameRecord]]:
+        """Build name records from ORM names."""
+        obj = {}
+        for name in names:
+            obj.setdefault(name.namespace.prefix, []).append(
+                NameRecord(name.name, name.is_preferred)
+            )
+        return obj
+
+    def build_record_annotation(
+        self,
+        annotation: List[AbstractComponentAnnotation],
+    ) -> Dict[str, List[AnnotationRecord]]:
+        """Build annotation records from ORM annotation."""
+        obj = {}
+        for ann in annotation:
+            obj.setdefault(ann.namespace.prefix, []).append(
+                AnnotationRecord(
+                    ann.biology_qualifier.qualifier, ann.identifier, ann.is_deprecated
+                )
+            )
+        return obj
+
     @abstractmethod
     def build_orm(self, data_model: AbstractBaseModel) -> AbstractComponent:
         """Build an ORM model from an IO model."""
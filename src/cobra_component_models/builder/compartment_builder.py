@@ -16,8 +16,11 @@
 """Provide a compartment builder."""
 
 
+from typing import Union
+
 from ..io import CompartmentModel
 from ..orm import Compartment, CompartmentAnnotation, CompartmentName
+from ..record import CompartmentRecord
 from .abstract_builder import AbstractBuilder
 
 
@@ -61,14 +64,39 @@ class CompartmentBuilder(AbstractBuilder):
             annotation=annotation,
         )
 
-    def build_orm(self, data_model: CompartmentModel) -> Compartment:
+    def build_record(self, orm_model: Compartment) -> CompartmentRecord:
+        """
+        Build a compartment record from an ORM compartment model.
+
+        Parameters
+        ----------
+        orm_model : cobra_component_models.orm.Compartment
+            The compartment ORM model instance to be serialized.
+
+        Returns
+        -------
+        cobra_component_models.record.CompartmentRecord
+            A corresponding compartment record without validation.
+
+        """
+        return CompartmentRecord(
+            id=str(orm_model.id),
+            names=self.build_record_names(orm_model.names),
+            annotation=self.build_record_annotation(orm_model.annotation),
+            notes=orm_model.notes,
+        )
+
+    def build_orm(
+        self, data_model: Union[CompartmentModel, CompartmentRecord]
+    ) -> Compartment:
         """
         Build an ORM compartment model from an IO compartment model.
 
         Parameters
         ----------
         data_model : cobra_component_models.io.CompartmentModel
-            The pydantic compartment data model instance to be deserialized.
+            The pydantic compartment data model instance to be deserialized. A
+            compartment record is accepted as well.
 
         Returns
         -------
@@ -16,11 +16,20 @@
 """Provide a compound builder."""
 
 
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ..chemistry import set_formula_attributes
+from ..helpers import insert_ignoring_conflicts
 from ..io import AnnotationModel, CompoundModel
 from ..orm import Compound, CompoundAnnotation, CompoundName
+from ..record import AnnotationRecord, CompoundRecord
 from .abstract_builder import AbstractBuilder
 
 
+# The annotation that is stored in compound columns rather than as annotation.
+STRUCTURE_COLUMNS = {"inchi": "inchi", "inchikey": "inchi_key", "smiles": "smiles"}
+
+
 class CompoundBuilder(AbstractBuilder):
     """Define a compound builder."""
 
@@ -76,19 +85,52 @@ class CompoundBuilder(AbstractBuilder):
             annotation=annotation,
         )
 
-    def build_orm(self, data_model: CompoundModel) -> Compound:
+    def build_record(self, orm_model: Compound) -> CompoundRecord:
+        """
+        Build a compound record from an ORM compound model.
+
+        Parameters
+        ----------
+        orm_model : cobra_component_models.orm.Compound
+            The compound ORM model instance to be serialized.
+
+        Returns
+        -------
+        cobra_component_models.record.CompoundRecord
+            A corresponding compound record without validation.
+
+        """
+        annotation = self.build_record_annotation(orm_model.annotation)
+        if orm_model.inchi:
+            annotation["inchi"] = [AnnotationRecord("is", orm_model.inchi)]
+        if orm_model.inchi_key:
+            annotation["inchikey"] = [AnnotationRecord("is", orm_model.inchi_key)]
+        if orm_model.smiles:
+            annotation["smiles"] = [AnnotationRecord("is", orm_model.smiles)]
+        return CompoundRecord(
+            id=str(orm_model.id),
+            names=self.build_record_names(orm_model.names),
+            annotation=annotation,
+            notes=orm_model.notes,
+            charge=orm_model.charge,
+            chemical_formula=orm_model.chemical_formula,
+        )
+
+    def build_orm(self, data_model: Union[CompoundModel, CompoundRecord]) -> Compound:
         """
         Build an ORM compound model from an IO compound model.
 
         Parameters
         ----------
         data_model : cobra_component_models.io.CompoundModel
-            The pydantic compound data model instance to be deserialized.
+            The pydantic compound data model instance to be deserialized. A compound
+            record is accepted as well.
 
         Returns
         -------
         cobra_component_models.orm.Compound
-            A corresponding compound ORM model.
+            A corresponding compound ORM model. Its element counts and masses are
+            derived from the chemical formula.
 
         """
         compound = Compound(
@@ -112,8 +154,260 @@ class CompoundBuilder(AbstractBuilder):
             # We expect a single element in the list of annotation.
             (smiles,) = annotation.pop("smiles")
             compound.smiles = smiles.identifier
+        set_formula_attributes(compound)
         compound.names.extend(self.build_orm_names(data_model.names, CompoundName))
         compound.annotation.extend(
             self.build_orm_annotation(annotation, CompoundAnnotation)
         )
         return compound
+
+    def upsert(
+        self,
+        session,
+        data_models: Iterable[CompoundModel],
+        *,
+        match_on: str = "inchikey",
+        qualifiers: Optional[Iterable[str]] = None,
+        chunk_size: int = 500,
+    ) -> List[Compound]:
+        """
+        Insert new compounds or merge them into existing ones.
+
+        Incoming compounds are matched in bulk against existing ones by their InChI,
+        InChIKey, or by any shared identifier in an annotation namespace. Unmatched
+        compounds are created as with `build_orm`. The names and annotation of
+        matched compounds are merged with set semantics, i.e., existing entries are
+        kept and only new ones are added, and missing charge, chemical formula,
+        InChI, InChIKey, SMILES, and notes are filled in. Compounds that match each
+        other within the data are merged, too, such that repeated imports are
+        idempotent. Unmatched compounds whose InChI or InChIKey exists already are
+        merged into the compound with that structure, since structures are unique.
+
+        Parameters
+        ----------
+        session : sqlalchemy.orm.Session
+            A SQLAlchemy session giving access to a database.
+        data_models : iterable of cobra_component_models.io.CompoundModel
+            The pydantic compound data models to be inserted or merged.
+        match_on : str, optional
+            Either 'inchikey', 'inchi', or the prefix of an annotation namespace
+            (default 'inchikey').
+        qualifiers : iterable of str, optional
+            The biology qualifiers of annotation by which compounds are matched,
+            e.g., 'is' (default any qualifier).
+        chunk_size : int, optional
+            The number of compounds that are matched per query (default 500).
+
+        Returns
+        -------
+        list of cobra_component_models.orm.Compound
+            The new or matched compound ORM model for each data model in the given
+            order. The new compounds are added to the session and everything is
+            flushed.
+
+        Raises
+        ------
+        ValueError
+            If a compound is matched with one compound while its InChI or InChIKey
+            belongs to another one. Nothing of the chunk is changed then.
+
+        """
+        if qualifiers is not None:
+            qualifiers = set(qualifiers)
+        result = []
+        chunk = []
+        for data_model in data_models:
+            chunk.append(data_model)
+            if len(chunk) >= chunk_size:
+                result.extend(self._upsert_chunk(session, chunk, match_on, qualifiers))
+                chunk = []
+        if chunk:
+            result.extend(self._upsert_chunk(session, chunk, match_on, qualifiers))
+        return result
+
+    def _upsert_chunk(
+        self,
+        session,
+        data_models: List[CompoundModel],
+        match_on: str,
+        qualifiers: Optional[Set[str]],
+    ) -> List[Compound]:
+        """Insert or merge a chunk of compounds."""
+        keys = [
+            [
+                ann.identifier
+                for ann in model.annotation.get(match_on, [])
+                if qualifiers is None or ann.biology_qualifier in qualifiers
+            ]
+            for model in data_models
+        ]
+        all_keys = sorted({key for model_keys in keys for key in model_keys})
+        if match_on in ("inchi", "inchikey"):
+            column = getattr(Compound, STRUCTURE_COLUMNS[match_on])
+            key2compound = {
+                getattr(cmpd, STRUCTURE_COLUMNS[match_on]): cmpd
+                for cmpd in session.query(Compound).filter(column.in_(all_keys))
+            }
+        else:
+            namespace = self.namespaces[match_on]
+            query = (
+                session.query(CompoundAnnotation.identifier, Compound)
+                .join(Compound, CompoundAnnotation.compound_id == Compound.id)
+                .filter(
+                    CompoundAnnotation.namespace_id == namespace.id,
+                    CompoundAnnotation.identifier.in_(all_keys),
+                )
+            )
+            if qualifiers is not None:
+                query = query.filter(
+                    CompoundAnnotation.biology_qualifier_id.in_(
+                        [self.biology_qualifiers[q].id for q in sorted(qualifiers)]
+                    )
+                )
+            key2compound = {
+                identifier: cmpd
+                for identifier, cmpd in query.order_by(Compound.id.desc())
+            }
+        # Plan the target of each data model, either an existing compound or the
+        # position of the data model from which a new compound is built, such that
+        # conflicts are detected before anything is changed.
+        key2target: Dict[str, Union[Compound, int]] = dict(key2compound)
+        structure2target = self._select_structures(session, data_models)
+        targets: List[Union[Compound, int]] = []
+        conflicts = []
+        for index, (model, model_keys) in enumerate(zip(data_models, keys)):
+            structures = self._structures(model)
+            target = next((key2target[k] for k in model_keys if k in key2target), None)
+            if target is None:
+                # Compounds with a known structure are merged, too, since the
+                # structure columns are unique.
+                target = next(
+                    (structure2target[s] for s in structures if s in structure2target),
+                    index,
+                )
+            conflicts.extend(
+                f"{model.id} ({value})"
+                for (column, value) in structures
+                if structure2target.get((column, value), target) is not target
+            )
+            for key in model_keys:
+                key2target.setdefault(key, target)
+            for structure in structures:
+                structure2target.setdefault(structure, target)
+            targets.append(target)
+        if conflicts:
+            raise ValueError(
+                f"The structures of {len(conflicts)} compound(s) belong to other "
+                f"compounds than the ones they are matched with on '{match_on}': "
+                f"{', '.join(conflicts)}."
+            )
+        result = []
+        merged: List[Tuple[Compound, CompoundModel]] = []
+        for index, (model, target) in enumerate(zip(data_models, targets)):
+            if target == index:
+                compound = self.build_orm(model)
+                session.add(compound)
+            else:
+                compound = result[target] if isinstance(target, int) else target
+                self._merge_attributes(compound, model)
+                merged.append((compound, model))
+            result.append(compound)
+        session.flush()
+        self._merge_children(session, merged)
+        return result
+
+    @staticmethod
+    def _structures(data_model: CompoundModel) -> List[Tuple[str, str]]:
+        """Return the unique structure columns and values of a data model."""
+        return [
+            (STRUCTURE_COLUMNS[prefix], ann.identifier)
+            for prefix in ("inchi", "inchikey")
+            for ann in data_model.annotation.get(prefix, [])[:1]
+        ]
+
+    def _select_structures(
+        self, session, data_models: List[CompoundModel]
+    ) -> Dict[Tuple[str, str], Compound]:
+        """Select the existing compounds that have the structures of data models."""
+        result = {}
+        for prefix in ("inchi", "inchikey"):
+            column = STRUCTURE_COLUMNS[prefix]
+            values = sorted(
+                {
+                    value
+                    for model in data_models
+                    for key, value in self._structures(model)
+                    if key == column
+                }
+            )
+            if not values:
+                continue
+            for compound in session.query(Compound).filter(
+                getattr(Compound, column).in_(values)
+            ):
+                result[column, getattr(compound, column)] = compound
+        return result
+
+    @staticmethod
+    def _merge_attributes(compound: Compound, data_model: CompoundModel) -> None:
+        """Fill in attributes that are missing from an existing compound."""
+        if compound.charge is None:
+            compound.charge = data_model.charge
+        if compound.chemical_formula is None and data_model.chemical_formula:
+            compound.chemical_formula = data_model.chemical_formula
+            set_formula_attributes(compound)
+        if compound.notes is None:
+            compound.notes = data_model.notes
+        for prefix, column in STRUCTURE_COLUMNS.items():
+            if getattr(compound, column) is None and data_model.annotation.get(prefix):
+                (structure,) = data_model.annotation[prefix]
+                setattr(compound, column, structure.identifier)
+
+    def _merge_children(
+        self, session, merged: List[Tuple[Compound, CompoundModel]]
+    ) -> None:
+        """Add the names and annotation of data models to existing compounds."""
+        names: List[Dict] = []
+        annotation: List[Dict] = []
+        for compound, data_model in merged:
+            for prefix, name_models in data_model.names.items():
+                namespace_id = self.namespaces[prefix].id
+                names.extend(
+                    {
+                        "compound_id": compound.id,
+                        "namespace_id": namespace_id,
+                        "name": name.name,
+                        "is_preferred": name.is_preferred,
+                    }
+                    for name in name_models
+                )
+            for prefix, annotation_models in data_model.annotation.items():
+                if prefix in STRUCTURE_COLUMNS:
+                    continue
+                namespace_id = self.namespaces[prefix].id
+                annotation.extend(
+                    {
+                        "compound_id": compound.id,
+                        "namespace_id": namespace_id,
+                        "identifier": ann.identifier,
+                        "biology_qualifier_id": self.biology_qualifiers[
+                            ann.biology_qualifier
+                        ].id,
+                        "is_deprecated": ann.is_deprecated,
+                    }
+                    for ann in annotation_models
+                )
+        insert_ignoring_conflicts(
+            session,
+            CompoundName.__table__,
+            names,
+            ("compound_id", "namespace_id", "name"),
+        )
+        insert_ignoring_conflicts(
+            session,
+            CompoundAnnotation.__table__,
+            annotation,
+            ("compound_id", "namespace_id", "identifier"),
+        )
+        for compound, _ in merged:
+            session.expire(compound, ["names", "annotation"])
@@ -16,17 +16,22 @@
 """Provide a reaction builder."""
 
 
-from typing import Dict, List, Optional, Tuple
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type, Union
 
 from ..io import ParticipantModel, ReactionModel
 from ..orm import (
+    Base,
     Compartment,
+    CompartmentAnnotation,
     Compound,
+    CompoundAnnotation,
     Participant,
     Reaction,
     ReactionAnnotation,
     ReactionName,
 )
+from ..record import ParticipantRecord, ReactionRecord
 from .abstract_builder import AbstractBuilder
 
 
@@ -126,14 +131,46 @@ class ReactionBuilder(AbstractBuilder):
                 )
         return reactants, products
 
-    def build_orm(self, data_model: ReactionModel) -> Reaction:
+    def build_record(self, orm_model: Reaction) -> ReactionRecord:
+        """
+        Build a reaction record from an ORM reaction model.
+
+        Parameters
+        ----------
+        orm_model : cobra_component_models.orm.Reaction
+            The reaction ORM model instance to be serialized.
+
+        Returns
+        -------
+        cobra_component_models.record.ReactionRecord
+            A corresponding reaction record without validation.
+
+        """
+        reactants = {}
+        products = {}
+        for part in orm_model.participants:
+            side = products if part.is_product else reactants
+            side[self.compound2id[part.compound]] = ParticipantRecord(
+                part.stoichiometry, self.compartment2id[part.compartment]
+            )
+        return ReactionRecord(
+            id=str(orm_model.id),
+            names=self.build_record_names(orm_model.names),
+            annotation=self.build_record_annotation(orm_model.annotation),
+            reactants=reactants,
+            products=products,
+            notes=orm_model.notes,
+        )
+
+    def build_orm(self, data_model: Union[ReactionModel, ReactionRecord]) -> Reaction:
         """
         Build an ORM reaction model from an IO reaction model.
 
         Parameters
         ----------
         data_model : cobra_component_models.io.ReactionModel
-            The pydantic reaction data model instance to be deserialized.
+            The pydantic reaction data model instance to be deserialized. A reaction
+            record is accepted as well.
 
         Returns
         -------
@@ -179,3 +216,119 @@ class ReactionBuilder(AbstractBuilder):
                 )
             )
         return participants
+
+    def resolve_participants(
+        self,
+        session,
+        data_models: Iterable[ReactionModel],
+        *,
+        compound_namespace: Optional[str] = None,
+        compartment_namespace: Optional[str] = None,
+        chunk_size: int = 500,
+    ) -> None:
+        """
+        Resolve the compounds and compartments referenced by a batch of reactions.
+
+        Rather than preloading all compounds and compartments into the `id2compound`
+        and `id2compartment` maps, the batch of reactions is inspected first and only
+        the referenced identifiers that are not yet known are fetched from the
+        database in chunked queries.
+
+        Parameters
+        ----------
+        session : sqlalchemy.orm.Session
+            A SQLAlchemy session giving access to a database.
+        data_models : iterable of cobra_component_models.io.ReactionModel
+            The reactions that are about to be deserialized.
+        compound_namespace : str, optional
+            The prefix of the namespace in which the compound identifiers are
+            annotated (default interpret identifiers as primary keys).
+        compartment_namespace : str, optional
+            The prefix of the namespace in which the compartment identifiers are
+            annotated (default interpret identifiers as primary keys).
+        chunk_size : int, optional
+            The number of identifiers resolved per query (default 500).
+
+        Raises
+        ------
+        ValueError
+            If any of the referenced compounds or compartments cannot be found. The
+            message lists all of the missing identifiers.
+
+        """
+        compound_ids = set()
+        compartment_ids = set()
+        for data_model in data_models:
+            for compound_id, part in chain(
+                data_model.reactants.items(), data_model.products.items()
+            ):
+                compound_ids.add(compound_id)
+                compartment_ids.add(part.compartment)
+        missing_compounds = self._resolve(
+            session,
+            compound_ids.difference(self.id2compound),
+            self.id2compound,
+            Compound,
+            CompoundAnnotation,
+            "compound_id",
+            compound_namespace,
+            chunk_size,
+        )
+        missing_compartments = self._resolve(
+            session,
+            compartment_ids.difference(self.id2compartment),
+            self.id2compartment,
+            Compartment,
+            CompartmentAnnotation,
+            "compartment_id",
+            compartment_namespace,
+            chunk_size,
+        )
+        if missing_compounds or missing_compartments:
+            raise ValueError(
+                f"The reactions refer to {len(missing_compounds)} unknown compound(s) "
+                f"and {len(missing_compartments)} unknown compartment(s). "
+                f"Compounds: {', '.join(sorted(missing_compounds))}. "
+                f"Compartments: {', '.join(sorted(missing_compartments))}."
+            )
+
+    def _resolve(
+        self,
+        session,
+        identifiers: Set[str],
+        mapping: Dict[str, Base],
+        cls: Type[Base],
+        annotation_cls: Type[Base],
+        foreign_key: str,
+        prefix: Optional[str],
+        chunk_size: int,
+    ) -> Set[str]:
+        """Add the database instances of the identifiers to the given mapping."""
+        if prefix is None:
+            keys = {int(i): i for i in identifiers if i.isdigit()}
+            ordered = sorted(keys)
+            for start in range(0, len(ordered), chunk_size):
+                query = session.query(cls).filter(
+                    cls.id.in_(ordered[start : start + chunk_size])
+                )
+                for obj in query:
+                    mapping[keys[obj.id]] = obj
+        else:
+            namespace = self.namespaces[prefix]
+            ordered = sorted(identifiers)
+            for start in range(0, len(ordered), chunk_size):
+                query = (
+                    session.query(annotation_cls.identifier, cls)
+                    .join(cls, getattr(annotation_cls, foreign_key) == cls.id)
+                    .filter(
+                        annotation_cls.namespace_id == namespace.id,
+                        annotation_cls.identifier.in_(
+                            ordered[start : start + chunk_size]
+                        ),
+                    )
+                    # Identifiers shared by several components resolve to the oldest.
+                    .order_by(cls.id.desc())
+                )
+                for identifier, obj in query:
+                    mapping[identifier] = obj
+        return identifiers.difference(mapping)
@@ -0,0 +1,204 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a bounded cache of serialized components."""
+
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event
+
+from ..orm import AbstractComponent, Compartment, Compound, Reaction
+from ..orm.component_timestamps import CHILDREN
+from .abstract_builder import AbstractBuilder
+
+
+class CacheStatistics(NamedTuple):
+    """Define the usage statistics of a serialization cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    maxsize: int
+
+
+class SerializationCache:
+    """
+    Define a bounded cache of serialized components in front of a builder.
+
+    The cache stores the final JSON bytes of components keyed by their type,
+    primary key, and update time. Since ORM changes of names, annotation, and
+    participants update the time of their component, too, an entry serialized
+    before such a change never matches the component afterwards. When the cache
+    is full, the least recently used entry is evicted. While the cache is
+    listening, SQLAlchemy ORM events on the components and their names,
+    annotation, and participants evict the affected entries such that cached JSON
+    never outlives a flushed change. A serialization that overlaps with any
+    invalidation is returned but not stored, since it may reflect the state before
+    the change.
+
+    Bulk statements, i.e., SQLAlchemy Core statements and ``Query.update`` or
+    ``Query.delete``, do not emit ORM events and thus bypass the invalidation.
+    Call `invalidate` or `clear` after such statements.
+
+    Examples
+    --------
+    >>> cache = SerializationCache(builder, maxsize=10000)
+    >>> cache.listen()
+    >>> cache.get_json(compound)
+    b'{"id": "1", ...}'
+
+    """
+
+    def __init__(self, builder: AbstractBuilder, maxsize: int = 1024, **kwargs):
+        """
+        Initialize a serialization cache.
+
+        Parameters
+        ----------
+        builder : cobra_component_models.builder.AbstractBuilder
+            The builder used to create the IO models of cache misses.
+        maxsize : int, optional
+            The maximum number of cached components (default 1024).
+
+        Other Parameters
+        ----------------
+        kwargs
+            Passed on to the IO model's `json` method.
+
+        """
+        if maxsize < 1:
+            raise ValueError("The cache size must be a positive integer.")
+        super().__init__()
+        self.builder = builder
+        self.maxsize = maxsize
+        self.json_kwargs = kwargs
+        self._entries: Dict[
+            Tuple[str, int], Tuple[Optional[object], bytes]
+        ] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        # Counts every invalidation in order to detect concurrent ones.
+        self._generation = 0
+        self._is_listening = False
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        """Return the usage statistics of the cache."""
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def get_json(self, orm_model: AbstractComponent) -> bytes:
+        """
+        Return the serialized IO model of a component from the cache.
+
+        Parameters
+        ----------
+        orm_model : cobra_component_models.orm.AbstractComponent
+            A persisted component ORM model instance.
+
+        Returns
+        -------
+        bytes
+            The UTF-8 encoded JSON of the component's IO model.
+
+        """
+        key = (type(orm_model).__name__, orm_model.id)
+        updated_on = orm_model.updated_on
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == updated_on:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            generation = self._generation
+        # The expensive serialization happens outside of the lock.
+        result = (
+            self.builder.build_io(orm_model).json(**self.json_kwargs).encode("utf-8")
+        )
+        with self._lock:
+            if generation != self._generation:
+                return result
+            self._entries[key] = (updated_on, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return result
+
+    def invalidate(self, type_name: str, id: int) -> None:
+        """Remove the entry of the component with the given type and primary key."""
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop((type_name, id), None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset the statistics."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._invalidations = 0
+
+    def listen(self) -> None:
+        """Register SQLAlchemy ORM event listeners that invalidate entries."""
+        if self._is_listening:
+            return
+        for cls in (Compartment, Compound, Reaction):
+            event.listen(cls, "after_update", self._on_component_change)
+            event.listen(cls, "after_delete", self._on_component_change)
+        for cls in CHILDREN:
+            for identifier in ("after_insert", "after_update", "after_delete"):
+                event.listen(cls, identifier, self._on_child_change)
+        self._is_listening = True
+
+    def close(self) -> None:
+        """Remove the SQLAlchemy ORM event listeners again."""
+        if not self._is_listening:
+            return
+        for cls in (Compartment, Compound, Reaction):
+            event.remove(cls, "after_update", self._on_component_change)
+            event.remove(cls, "after_delete", self._on_component_change)
+        for cls in CHILDREN:
+            for identifier in ("after_insert", "after_update", "after_delete"):
+                event.remove(cls, identifier, self._on_child_change)
+        self._is_listening = False
+
+    def _on_component_change(self, mapper, connection, target) -> None:
+        """Invalidate the entry of a changed component."""
+        self.invalidate(type(target).__name__, target.id)
+
+    def _on_child_change(self, mapper, connection, target) -> None:
+        """Invalidate the entry of the component that a changed child belongs to."""
+        parent, foreign_key = CHILDREN[type(target)]
+        self.invalidate(parent.__name__, getattr(target, foreign_key))
@@ -0,0 +1,96 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide the derivation of compound attributes from their chemical formula."""
+
+
+from sqlalchemy import exists
+
+from ..orm import Compound, CompoundElement
+from .formula import average_mass, monoisotopic_mass, parse_formula
+
+
+def set_formula_attributes(compound: Compound) -> bool:
+    """
+    Set a compound's element counts and masses from its chemical formula.
+
+    Parameters
+    ----------
+    compound : cobra_component_models.orm.Compound
+        A compound ORM model instance whose `elements`, `mass`, and
+        `monoisotopic_mass` are replaced.
+
+    Returns
+    -------
+    bool
+        Whether the chemical formula could be parsed. Masses remain undefined if
+        the formula contains generic groups or unknown elements.
+
+    """
+    compound.elements = []
+    compound.mass = None
+    compound.monoisotopic_mass = None
+    if not compound.chemical_formula:
+        return False
+    try:
+        counts = parse_formula(compound.chemical_formula)
+    except ValueError:
+        return False
+    compound.elements = [
+        CompoundElement(element=element, count=count)
+        for element, count in counts.items()
+    ]
+    compound.mass = average_mass(counts)
+    compound.monoisotopic_mass = monoisotopic_mass(counts)
+    return True
+
+
+def update_formula_attributes(session, chunk_size: int = 500) -> int:
+    """
+    Derive the element counts and masses of all compounds that lack them.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    chunk_size : int, optional
+        The number of compounds updated per flush (default 500).
+
+    Returns
+    -------
+    int
+        The number of compounds whose formula could be parsed.
+
+    """
+    num_parsed = 0
+    last = 0
+    while True:
+        compounds = (
+            session.query(Compound)
+            .filter(
+                Compound.id > last,
+                Compound.chemical_formula.isnot(None),
+                ~exists().where(CompoundElement.compound_id == Compound.id),
+            )
+            .order_by(Compound.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not compounds:
+            return num_parsed
+        for compound in compounds:
+            num_parsed += set_formula_attributes(compound)
+        last = compounds[-1].id
+        session.flush()
@@ -0,0 +1,166 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a parser of chemical formulae and mass computations."""
+
+
+import re
+from importlib.resources import open_text
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from .. import data
+
+
+def _load_element_masses() -> Dict[str, Tuple[float, float]]:
+    """Load the monoisotopic and average masses of chemical elements."""
+    result = {}
+    with open_text(data, "elements.tsv") as handle:
+        for line in handle:
+            if not line.strip() or line.startswith("#"):
+                continue
+            symbol, monoisotopic, average = line.split("\t")
+            result[symbol] = (float(monoisotopic), float(average))
+    return result
+
+
+# A mapping from element symbols to their monoisotopic and average mass.
+ELEMENT_MASSES: Dict[str, Tuple[float, float]] = _load_element_masses()
+
+# Tokens are element symbols, including generic groups such as R, with an optional
+# count, opening and closing parentheses with an optional multiplier, and
+# separators of adducts such as hydrates with an optional multiplier.
+_TOKEN_PATTERN: Pattern = re.compile(
+    r"(?P<element>[A-Z][a-z]*)(?P<count>\d*)"
+    r"|(?P<open>[(\[])"
+    r"|(?P<close>[)\]])(?P<multiplier>\d*)"
+    r"|(?P<adduct>[.·*])(?P<adduct_count>\d*)"
+)
+
+
+def parse_formula(formula: str) -> Dict[str, int]:
+    """
+    Parse a chemical formula into element counts.
+
+    Parameters
+    ----------
+    formula : str
+        A chemical formula, for example, 'C2H6O', 'Ca(OH)2', or 'CuSO4.5H2O'.
+
+    Returns
+    -------
+    dict
+        A mapping from element symbols to their number of atoms. Elements are
+        ordered by their first appearance.
+
+    Raises
+    ------
+    ValueError
+        If the formula is malformed.
+
+    """
+    stack: List[Dict[str, int]] = [{}]
+    # The multiplier of the current adduct, e.g., 5 for the water in CuSO4.5H2O.
+    adduct: Optional[Tuple[Dict[str, int], int]] = None
+    position = 0
+    length = len(formula)
+    while position < length:
+        match = _TOKEN_PATTERN.match(formula, position)
+        if match is None:
+            raise ValueError(
+                f"Unexpected character '{formula[position]}' at position {position} "
+                f"of the chemical formula '{formula}'."
+            )
+        position = match.end()
+        if match.group("element") is not None:
+            count = int(match.group("count") or 1)
+            current = stack[-1]
+            current[match.group("element")] = (
+                current.get(match.group("element"), 0) + count
+            )
+        elif match.group("open") is not None:
+            stack.append({})
+        elif match.group("close") is not None:
+            if len(stack) == 1:
+                raise ValueError(
+                    f"Unbalanced closing parenthesis at position {position - 1} of "
+                    f"the chemical formula '{formula}'."
+                )
+            group = stack.pop()
+            _add_counts(stack[-1], group, int(match.group("multiplier") or 1))
+        else:
+            if len(stack) > 1:
+                raise ValueError(
+                    f"Unbalanced opening parenthesis in the chemical formula "
+                    f"'{formula}'."
+                )
+            if adduct is not None:
+                _add_counts(adduct[0], stack[-1], adduct[1])
+                stack[-1] = adduct[0]
+            adduct = (stack[-1], int(match.group("adduct_count") or 1))
+            stack[-1] = {}
+    if len(stack) > 1:
+        raise ValueError(
+            f"Unbalanced opening parenthesis in the chemical formula '{formula}'."
+        )
+    if adduct is not None:
+        _add_counts(adduct[0], stack[-1], adduct[1])
+        return adduct[0]
+    return stack[0]
+
+
+def _add_counts(total: Dict[str, int], counts: Dict[str, int], factor: int) -> None:
+    """Add the element counts multiplied by a factor to the total in place."""
+    for element, count in counts.items():
+        total[element] = total.get(element, 0) + factor * count
+
+
+def format_formula(counts: Dict[str, int]) -> str:
+    """
+    Format element counts as a chemical formula in Hill notation.
+
+    Carbon comes first followed by hydrogen and all other elements in alphabetical
+    order. Without carbon, all elements are ordered alphabetically.
+
+    """
+    if "C" in counts:
+        order = ["C", "H"] + sorted(e for e in counts if e not in ("C", "H"))
+    else:
+        order = sorted(counts)
+    return "".join(
+        f"{element}{counts[element] if counts[element] != 1 else ''}"
+        for element in order
+        if counts.get(element)
+    )
+
+
+def monoisotopic_mass(counts: Dict[str, int]) -> Optional[float]:
+    """Return the monoisotopic mass or ``None`` if an element is unknown."""
+    return _mass(counts, 0)
+
+
+def average_mass(counts: Dict[str, int]) -> Optional[float]:
+    """Return the average mass or ``None`` if an element is unknown."""
+    return _mass(counts, 1)
+
+
+def _mass(counts: Dict[str, int], index: int) -> Optional[float]:
+    """Sum the masses of elements weighted by their counts."""
+    total = 0.0
+    for element, count in counts.items():
+        try:
+            total += ELEMENT_MASSES[element][index] * count
+        except KeyError:
+            return None
+    return total
@@ -0,0 +1,43 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a conversion of reaction participants' stoichiometry to numbers."""
+
+
+import math
+
+
+def parse_stoichiometry(stoichiometry: str) -> float:
+    """
+    Convert a stoichiometry to a number.
+
+    Stoichiometries are stored as strings since they may be symbolic, e.g., 'n' or
+    '2n' in polymerization reactions.
+
+    Parameters
+    ----------
+    stoichiometry : str
+        The stoichiometry of a reaction participant.
+
+    Returns
+    -------
+    float
+        The numeric stoichiometry or NaN if it is not numeric.
+
+    """
+    try:
+        return float(stoichiometry)
+    except ValueError:
+        return math.nan
@@ -0,0 +1,335 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a command line interface for loading, exporting, and inspecting."""
+
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .engine import SQLITE_PROFILES, make_engine
+from .orm import Base, BiologyQualifier, Namespace
+from .pipeline import (
+    IngestionProgress,
+    IngestionScheduler,
+    ShardInfo,
+    export_shards,
+    import_shards,
+    verify_shards,
+)
+from .pipeline.sharding import MANIFEST
+from .query import CoreExporter
+from .query import stats as compute_stats
+
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line interface.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments (default ``sys.argv[1:]``).
+
+    Returns
+    -------
+    int
+        The exit status.
+
+    """
+    args = _make_parser().parse_args(argv)
+    logging.basicConfig(
+        level=args.log_level.upper(), format="%(levelname)s - %(name)s - %(message)s"
+    )
+    return args.func(args)
+
+
+def init_db(args: argparse.Namespace) -> int:
+    """Create the tables, biology qualifiers, and optionally namespaces."""
+    engine = make_engine(args.url)
+    try:
+        Base.metadata.create_all(engine)
+        session = Session(bind=engine)
+        try:
+            BiologyQualifier.load(session)
+            if args.namespaces is not None:
+                num = _load_namespaces(session, args.namespaces)
+                logger.info("Added %d namespace(s).", num)
+            session.commit()
+        finally:
+            session.close()
+    finally:
+        engine.dispose()
+    return 0
+
+
+def load(args: argparse.Namespace) -> int:
+    """Load component files or a sharded dump into the database."""
+    engine = make_engine(args.url, _profile(args.url, args.profile))
+    try:
+        if len(args.paths) == 1 and (args.paths[0] / MANIFEST).is_file():
+            counts = import_shards(
+                engine,
+                args.paths[0],
+                max_workers=args.workers or 1,
+                chunk_size=args.chunk_size,
+                progress=_report_shard if args.progress else None,
+            )
+            counts = {f"{kind}s": num for kind, num in counts.items()}
+        else:
+            session = Session(bind=engine)
+            try:
+                counts = IngestionScheduler(
+                    session,
+                    max_workers=args.workers,
+                    max_pending=args.max_pending,
+                    chunk_size=args.chunk_size,
+                    progress=_report_section if args.progress else None,
+                ).run(args.paths)
+            finally:
+                session.close()
+    finally:
+        engine.dispose()
+    _print_json(counts)
+    return 0
+
+
+def export(args: argparse.Namespace) -> int:
+    """Export the database to a JSON file or a sharded dump."""
+    engine = make_engine(args.url, _profile(args.url, args.profile))
+    try:
+        if args.shard_size is not None:
+            shards = export_shards(
+                # Worker processes need to connect on their own.
+                args.url if args.workers > 1 else engine,
+                args.output,
+                shard_size=args.shard_size,
+                chunk_size=args.chunk_size,
+                max_workers=args.workers,
+                progress=_report_shard if args.progress else None,
+                profile=_profile(args.url, args.profile),
+            )
+            counts: Dict[str, int] = {}
+            for shard in shards:
+                counts[f"{shard.kind}s"] = counts.get(f"{shard.kind}s", 0) + shard.count
+        else:
+            session = Session(bind=engine)
+            try:
+                with args.output.open("w") as handle:
+                    counts = CoreExporter(
+                        session, chunk_size=args.chunk_size
+                    ).write_json(handle)
+            finally:
+                session.close()
+    finally:
+        engine.dispose()
+    _print_json(counts)
+    return 0
+
+
+def stats(args: argparse.Namespace) -> int:
+    """Print table sizes, namespace counts, data quality problems, and indexes."""
+    engine = make_engine(args.url)
+    try:
+        session = Session(bind=engine)
+        try:
+            result = compute_stats(session)
+        finally:
+            session.close()
+    finally:
+        engine.dispose()
+    obj = result._asdict()
+    obj["indexes"] = [index._asdict() for index in result.indexes]
+    _print_json(obj)
+    return 0
+
+
+def verify(args: argparse.Namespace) -> int:
+    """Verify the shards of a dump against the checksums of its manifest."""
+    invalid = verify_shards(args.directory)
+    for shard in invalid:
+        logger.error("Shard '%s' is missing or corrupt.", shard.path)
+    return 1 if invalid else 0
+
+
+def _make_parser() -> argparse.ArgumentParser:
+    """Define the command line arguments of all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="cobra-component-models",
+        description="Load, export, and inspect databases of COBRA components.",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="warning",
+        choices=["debug", "info", "warning", "error"],
+        help="The level of log messages to show (default %(default)s).",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    subparsers.required = True
+
+    init_parser = subparsers.add_parser(
+        "init-db", help="Create the tables and load biology qualifiers."
+    )
+    init_parser.add_argument("url", help="The database URL.")
+    init_parser.add_argument(
+        "--namespaces",
+        type=Path,
+        help="A JSON file with namespace definitions keyed by their prefix.",
+    )
+    init_parser.set_defaults(func=init_db)
+
+    load_parser = subparsers.add_parser(
+        "load", help="Load component JSON files or a sharded dump directory."
+    )
+    load_parser.add_argument("url", help="The database URL.")
+    load_parser.add_argument("paths", nargs="+", type=Path, metavar="PATH")
+    # Component files are parsed in processes, whereas shards are imported in
+    # threads sharing the engine, which rarely pays off for SQLite.
+    _add_workers(
+        load_parser, "the number of CPUs for component files and 1 for a sharded dump"
+    )
+    load_parser.add_argument(
+        "--max-pending",
+        type=int,
+        help="The maximum number of files parsed ahead of the writer.",
+    )
+    _add_chunk_size(load_parser, "inserted or resolved")
+    _add_profile(load_parser, "bulk_load")
+    _add_progress(load_parser)
+    load_parser.set_defaults(func=load)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export the components to a JSON file or a sharded dump."
+    )
+    export_parser.add_argument("url", help="The database URL.")
+    export_parser.add_argument(
+        "output", type=Path, help="The JSON file or, with shards, the directory."
+    )
+    export_parser.add_argument(
+        "--shard-size",
+        type=int,
+        help="Write shards with at most this many components into a directory.",
+    )
+    _add_chunk_size(export_parser, "selected")
+    _add_workers(export_parser, "1; only shards are exported concurrently", default=1)
+    _add_profile(export_parser, "read_mostly")
+    _add_progress(export_parser)
+    export_parser.set_defaults(func=export)
+
+    stats_parser = subparsers.add_parser(
+        "stats", help="Show table sizes, data quality problems, and indexes."
+    )
+    stats_parser.add_argument("url", help="The database URL.")
+    stats_parser.set_defaults(func=stats)
+
+    verify_parser = subparsers.add_parser(
+        "verify", help="Verify a sharded dump against its manifest."
+    )
+    verify_parser.add_argument("directory", type=Path)
+    verify_parser.set_defaults(func=verify)
+    return parser
+
+
+def _add_workers(
+    parser: argparse.ArgumentParser, default_help: str, default: Optional[int] = None
+) -> None:
+    """Add an option for the number of workers with a description of its default."""
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default,
+        help=f"The number of parallel workers (default {default_help}).",
+    )
+
+
+def _add_chunk_size(parser: argparse.ArgumentParser, action: str) -> None:
+    """Add an option for the number of components processed at once."""
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help=f"The number of components {action} at once (default %(default)s).",
+    )
+
+
+def _add_profile(parser: argparse.ArgumentParser, default: str) -> None:
+    """Add an option for the SQLite profile."""
+    parser.add_argument(
+        "--profile",
+        default=default,
+        choices=sorted(SQLITE_PROFILES) + ["none"],
+        help="The SQLite profile; ignored for other databases (default "
+        "%(default)s).",
+    )
+
+
+def _add_progress(parser: argparse.ArgumentParser) -> None:
+    """Add an option for progress reporting."""
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Report each written file section or shard on standard error.",
+    )
+
+
+def _profile(url: str, profile: str) -> Optional[str]:
+    """Return the SQLite profile to apply to a database URL if any."""
+    if profile == "none" or not url.startswith("sqlite"):
+        return None
+    return profile
+
+
+def _load_namespaces(session, path: Path) -> int:
+    """Add the namespaces of a JSON file unless their prefix exists already."""
+    with path.open() as handle:
+        obj = json.load(handle)
+    existing = Namespace.get_map(session)
+    namespaces = [
+        Namespace(**data) for data in obj.values() if data["prefix"] not in existing
+    ]
+    session.add_all(namespaces)
+    return len(namespaces)
+
+
+def _report_section(progress: IngestionProgress) -> None:
+    """Print the progress of an ingestion."""
+    print(
+        f"[{progress.num_done}/{progress.num_total}] {progress.path}: "
+        f"{progress.num_components} {progress.section}",
+        file=sys.stderr,
+    )
+
+
+def _report_shard(shard: ShardInfo) -> None:
+    """Print a finished shard."""
+    print(f"{shard.path}: {shard.count} {shard.kind}s", file=sys.stderr)
+
+
+def _print_json(obj: dict) -> None:
+    """Print a result as JSON to standard output."""
+    print(json.dumps(obj, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
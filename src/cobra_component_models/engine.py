@@ -0,0 +1,125 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide an engine factory with tuned SQLite settings."""
+
+
+from typing import Dict, Optional, Union
+
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# SQLite ignores foreign key constraints, including their ON DELETE rules, unless
+# they are enabled on each connection. Both profiles enforce them.
+SQLITE_PROFILES: Dict[str, Dict[str, Union[int, str]]] = {
+    # Bulk imports into a database that can be recreated in case of a crash. The
+    # write-ahead log avoids copying pages to a rollback journal and no
+    # synchronization with the disk takes place until checkpoints.
+    "bulk_load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+    # Concurrent readers with occasional writes. The write-ahead log lets readers
+    # proceed during writes and memory mapping avoids copying pages on reads. Synced
+    # at checkpoints, the database remains consistent after a power loss.
+    "read_mostly": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
+
+
+def apply_sqlite_profile(engine: Engine, profile: str) -> None:
+    """
+    Set the PRAGMAs of a SQLite profile on every new connection of an engine.
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine
+        An engine connected to a SQLite database.
+    profile : str
+        One of the keys of `SQLITE_PROFILES`, i.e., 'bulk_load' or 'read_mostly'.
+
+    Raises
+    ------
+    ValueError
+        If the profile is unknown or the engine does not use SQLite.
+
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLite profile '{profile}'. Please choose one of "
+            f"{', '.join(sorted(SQLITE_PROFILES))}."
+        )
+    if engine.dialect.name != "sqlite":
+        raise ValueError(
+            f"SQLite profiles cannot be applied to a '{engine.dialect.name}' "
+            f"database."
+        )
+    pragmas = SQLITE_PROFILES[profile]
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def make_engine(url: str, profile: Optional[str] = None, **kwargs) -> Engine:
+    """
+    Create an engine and optionally apply a SQLite profile to it.
+
+    Parameters
+    ----------
+    url : str
+        A database URL, e.g., 'sqlite:///components.db'.
+    profile : str, optional
+        A SQLite profile name, either 'bulk_load' or 'read_mostly' (default none).
+
+    Other Parameters
+    ----------------
+    kwargs
+        Passed on to `sqlalchemy.create_engine`.
+
+    Returns
+    -------
+    sqlalchemy.engine.Engine
+        A new database engine.
+
+    Notes
+    -----
+    The 'bulk_load' profile turns off synchronization with the disk. A crash of
+    the operating system or a power loss during an import may corrupt the
+    database. Use it for databases that can be recreated from their sources and
+    reopen them with 'read_mostly' afterwards.
+
+    """
+    engine = sqlalchemy.create_engine(url, **kwargs)
+    if profile is not None:
+        apply_sqlite_profile(engine, profile)
+    return engine
@@ -16,9 +16,120 @@
 """Define general helper functions."""
 
 
+from typing import Dict, List, Sequence
+
 from depinfo import print_dependencies
+from sqlalchemy import Table, and_, func, or_, select
+from sqlalchemy.dialects import postgresql
+
+from .orm import BiologyQualifier, Compartment, Compound, Namespace, Reaction
 
 
 def show_versions():
     """Print dependency information."""
     print_dependencies("cobra-component-models")
+
+
+def insert_ignoring_conflicts(
+    session, table: Table, rows: List[Dict], unique_columns: Sequence[str]
+) -> None:
+    """
+    Insert rows into a table skipping those that violate a unique constraint.
+
+    On PostgreSQL and SQLite, the database itself skips conflicting rows using
+    ``INSERT ... ON CONFLICT DO NOTHING`` and ``INSERT OR IGNORE``, respectively. On
+    other databases, existing rows are selected first and filtered out in Python.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    table : sqlalchemy.Table
+        The table to insert into.
+    rows : list of dict
+        The rows to be inserted given as mappings from column names to values.
+    unique_columns : sequence of str
+        The names of the columns that form the unique constraint.
+
+    """
+    # Remove duplicates within the rows themselves since not every database
+    # tolerates them in a single statement.
+    unique = {}
+    for row in rows:
+        unique.setdefault(tuple(row[c] for c in unique_columns), row)
+    if not unique:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(table).on_conflict_do_nothing(
+            index_elements=list(unique_columns)
+        )
+    elif dialect == "sqlite":
+        statement = table.insert().prefix_with("OR IGNORE")
+    else:
+        columns = [table.c[c] for c in unique_columns]
+        existing = set(
+            tuple(row)
+            for row in session.execute(
+                select(columns).where(
+                    or_(
+                        *(
+                            and_(*(col == value for col, value in zip(columns, key)))
+                            for key in unique
+                        )
+                    )
+                )
+            )
+        )
+        for key in existing:
+            unique.pop(key, None)
+        if not unique:
+            return
+        statement = table.insert()
+    session.execute(statement, list(unique.values()))
+
+
+def reset_sequences(session) -> None:
+    """
+    Advance the primary key sequences of the component tables past their rows.
+
+    Inserting rows with explicit primary keys does not advance PostgreSQL's
+    sequences such that the next insert without a primary key would collide.
+    Other databases derive the next primary key from the existing rows.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    for cls in (Compartment, Compound, Reaction):
+        table = cls.__table__
+        max_id = session.execute(select([func.max(table.c.id)])).scalar()
+        if max_id is not None:
+            session.execute(
+                select(
+                    [func.setval(func.pg_get_serial_sequence(table.name, "id"), max_id)]
+                )
+            )
+
+
+def expunge_components(session) -> None:
+    """
+    Release every instance from a session except namespaces and biology qualifiers.
+
+    Batch writers call this after each commit such that the session does not
+    accumulate the instances of all batches, while the builders keep using the
+    namespaces and biology qualifiers.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+
+    """
+    for instance in list(session.identity_map.values()):
+        if not isinstance(instance, (Namespace, BiologyQualifier)):
+            session.expunge(instance)
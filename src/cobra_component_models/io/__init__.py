@@ -16,6 +16,7 @@
 """Provide pydantic classes for (de-)serialization of components."""
 
 
+from .interning import intern_keys, intern_str, set_interning
 from .annotation_model import AnnotationModel
 from .name_model import NameModel
 from .abstract_base_model import AbstractBaseModel
@@ -23,3 +24,12 @@ from .compartment_model import CompartmentModel
 from .compound_model import CompoundModel
 from .reaction_model import ParticipantModel, ReactionModel
 from .components_model import ComponentsModel
+from .reaction_equation import (
+    parse_equation,
+    parse_equations,
+    render_equation,
+    render_equations,
+)
+from .metanetx import iter_chem_prop, iter_chem_xref, iter_reac_prop
+from .sbml_writer import SBMLWriter, make_sid
+from .sbml_reader import MiriamIndex, SBMLDocument, read_sbml
@@ -19,9 +19,11 @@
 from abc import ABC
 from typing import Dict, List, Optional
 
-from pydantic import Field
+from pydantic import Field, validator
 
 from .annotation_model import AnnotationModel
+from .fast_path import list_of, mapping_of, optional, plain_str
+from .interning import intern_keys
 from .io_base import IOBase
 from .name_model import NameModel
 from .type import NotesType
@@ -35,3 +37,18 @@ class AbstractBaseModel(IOBase, ABC):
     notes: Optional[NotesType] = None
     names: Dict[str, List[NameModel]] = {}
     annotation: Dict[str, List[AnnotationModel]] = {}
+
+    __plain_fields__ = {
+        "id": optional(plain_str),
+        "sbo_term": optional(plain_str),
+        "notes": optional(plain_str),
+        "names": mapping_of(list_of(NameModel.construct_plain), intern_keys=True),
+        "annotation": mapping_of(
+            list_of(AnnotationModel.construct_plain), intern_keys=True
+        ),
+    }
+
+    @validator("names", "annotation")
+    def intern_prefixes(cls, value: dict) -> dict:
+        """Share the namespace prefixes between all models."""
+        return intern_keys(value)
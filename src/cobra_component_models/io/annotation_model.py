@@ -21,6 +21,8 @@ from importlib.resources import open_text
 from pydantic import Field, validator
 
 from .. import data
+from .fast_path import NotPlainError, plain_bool, plain_str
+from .interning import intern_str
 from .io_base import IOBase
 
 
@@ -29,6 +31,13 @@ with open_text(data, "biology_qualifiers.txt") as handler:
     BIOLOGY_QUALIFIERS = frozenset(line.strip() for line in handler.readlines())
 
 
+def plain_biology_qualifier(value: object) -> str:
+    """Accept known biology qualifiers that are exact strings."""
+    if type(value) is not str or value not in BIOLOGY_QUALIFIERS:
+        raise NotPlainError()
+    return intern_str(value)
+
+
 class AnnotationModel(IOBase):
     """
     Define a component annotation model.
@@ -42,6 +51,12 @@ class AnnotationModel(IOBase):
     identifier: str
     is_deprecated: bool = Field(False, alias="isDeprecated")
 
+    __plain_fields__ = {
+        "biology_qualifier": plain_biology_qualifier,
+        "identifier": plain_str,
+        "is_deprecated": plain_bool,
+    }
+
     @validator("biology_qualifier")
     def biology_qualifier_must_be_known(cls, qualifier: str):
         """Validate and transform the given biology qualifier."""
@@ -50,4 +65,4 @@ class AnnotationModel(IOBase):
                 "The qualifier must be one of the valid biology qualifiers defined "
                 "at https://co.mbine.org/standards/qualifiers."
             )
-        return qualifier
+        return intern_str(qualifier)
@@ -17,9 +17,12 @@
 
 
 from .abstract_base_model import AbstractBaseModel
+from .fast_path import plain_str
 
 
 class CompartmentModel(AbstractBaseModel):
     """Define a pydantic compartment data model."""
 
     id: str
+
+    __plain_fields__ = {**AbstractBaseModel.__plain_fields__, "id": plain_str}
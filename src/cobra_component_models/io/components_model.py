@@ -20,6 +20,7 @@ from typing import Dict, Optional
 
 from .compartment_model import CompartmentModel
 from .compound_model import CompoundModel
+from .fast_path import mapping_of, optional
 from .io_base import IOBase
 from .reaction_model import ReactionModel
 
@@ -30,3 +31,9 @@ class ComponentsModel(IOBase):
     reactions: Optional[Dict[str, ReactionModel]] = {}
     compartments: Optional[Dict[str, CompartmentModel]] = {}
     compounds: Optional[Dict[str, CompoundModel]] = {}
+
+    __plain_fields__ = {
+        "reactions": optional(mapping_of(ReactionModel.construct_plain)),
+        "compartments": optional(mapping_of(CompartmentModel.construct_plain)),
+        "compounds": optional(mapping_of(CompoundModel.construct_plain)),
+    }
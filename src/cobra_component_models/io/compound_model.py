@@ -21,6 +21,7 @@ from typing import Optional
 from pydantic import Field
 
 from .abstract_base_model import AbstractBaseModel
+from .fast_path import optional, plain_float, plain_str
 
 
 class CompoundModel(AbstractBaseModel):
@@ -29,3 +30,10 @@ class CompoundModel(AbstractBaseModel):
     id: str
     charge: Optional[float] = Field(None)
     chemical_formula: Optional[str] = Field(None, alias="chemicalFormula")
+
+    __plain_fields__ = {
+        **AbstractBaseModel.__plain_fields__,
+        "id": plain_str,
+        "charge": optional(plain_float),
+        "chemical_formula": optional(plain_str),
+    }
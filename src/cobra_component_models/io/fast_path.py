@@ -0,0 +1,108 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Provide checks for a validation fast path of plain JSON-like data.
+
+Most data passed to the IO models comes from JSON documents and already has
+exactly the expected types. For such data, pydantic's validation returns the very
+same values while spending most of its time in generic type dispatch. The checks
+defined here instead only accept values that need no coercion at all and raise a
+`NotPlainError` otherwise, upon which the models fall back to regular validation.
+The fallback ensures that coercion and error messages remain unchanged.
+
+"""
+
+
+from typing import Any, Callable, Dict, List
+
+from .interning import intern_str
+
+
+Check = Callable[[Any], Any]
+
+
+class NotPlainError(Exception):
+    """Signal that a value requires regular pydantic validation."""
+
+    pass
+
+
+def plain_str(value: Any) -> str:
+    """Accept exact strings."""
+    if type(value) is not str:
+        raise NotPlainError()
+    return value
+
+
+def interned_str(value: Any) -> str:
+    """Accept exact strings and intern them."""
+    if type(value) is not str:
+        raise NotPlainError()
+    return intern_str(value)
+
+
+def plain_bool(value: Any) -> bool:
+    """Accept exact booleans."""
+    if type(value) is not bool:
+        raise NotPlainError()
+    return value
+
+
+def plain_float(value: Any) -> float:
+    """Accept floats and convert integers like pydantic does."""
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    raise NotPlainError()
+
+
+def optional(check: Check) -> Check:
+    """Return a check that additionally accepts None."""
+
+    def check_optional(value: Any) -> Any:
+        if value is None:
+            return None
+        return check(value)
+
+    return check_optional
+
+
+def list_of(check: Check) -> Check:
+    """Return a check of lists whose items pass the given check."""
+
+    def check_list(value: Any) -> List[Any]:
+        if type(value) is not list:
+            raise NotPlainError()
+        return [check(item) for item in value]
+
+    return check_list
+
+
+def mapping_of(check: Check, intern_keys: bool = False) -> Check:
+    """Return a check of dictionaries with string keys and checked values."""
+
+    def check_mapping(value: Any) -> Dict[str, Any]:
+        if type(value) is not dict:
+            raise NotPlainError()
+        result = {}
+        for key, item in value.items():
+            if type(key) is not str:
+                raise NotPlainError()
+            result[intern_str(key) if intern_keys else key] = check(item)
+        return result
+
+    return check_mapping
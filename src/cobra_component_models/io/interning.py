@@ -0,0 +1,58 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Provide interning of strings that recur throughout large IO models.
+
+Namespace prefixes, biology qualifiers, and compartment identifiers come from
+small vocabularies but occur in nearly every annotation, name, and participant.
+Interning them lets all models share one string object per distinct value
+instead of each holding its own copy. All IO models intern through the helpers
+of this module, such that `set_interning` turns interning off everywhere, e.g.,
+in order to measure its effect.
+
+"""
+
+
+import sys
+from typing import Dict, Optional, TypeVar
+
+
+ValueType = TypeVar("ValueType")
+
+
+_is_enabled = True
+
+
+def set_interning(enabled: bool) -> bool:
+    """Enable or disable interning and return the previous setting."""
+    global _is_enabled
+    previous = _is_enabled
+    _is_enabled = enabled
+    return previous
+
+
+def intern_str(value: Optional[str]) -> Optional[str]:
+    """Return the interned version of a string or None."""
+    if value is None or not _is_enabled:
+        return value
+    return sys.intern(value)
+
+
+def intern_keys(mapping: Dict[str, ValueType]) -> Dict[str, ValueType]:
+    """Return a dictionary with interned keys, e.g., namespace prefixes."""
+    if not _is_enabled:
+        return dict(mapping)
+    return {sys.intern(key): value for key, value in mapping.items()}
@@ -17,8 +17,12 @@
 
 
 from abc import ABC
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, NamedTuple, Tuple, Type
 
 from pydantic import BaseModel
+from pydantic.fields import ModelField
+
+from .fast_path import NotPlainError
 
 
 class IOBase(BaseModel, ABC):
@@ -28,3 +32,99 @@ class IOBase(BaseModel, ABC):
         """Configure the superclass."""
 
         allow_population_by_field_name = True
+
+    # A mapping from field names to checks of plain values. Subclasses that define
+    # it take the validation fast path for data that passes all checks.
+    __plain_fields__: ClassVar[Dict[str, Callable[[Any], Any]]] = {}
+
+    @classmethod
+    def construct_plain(cls, value: Any) -> "IOBase":
+        """
+        Construct a model from plain data without running pydantic validation.
+
+        Parameters
+        ----------
+        value : object
+            Input data, typically loaded from JSON.
+
+        Returns
+        -------
+        IOBase
+            A model instance equal to the one created by regular validation.
+
+        Raises
+        ------
+        NotPlainError
+            If the data contains unknown keys, misses required fields, or any
+            value needs to be coerced or validated.
+
+        """
+        if type(value) is not dict or not cls.__plain_fields__:
+            raise NotPlainError()
+        spec = _PLAIN_SPECS.get(cls) or _compile_plain_spec(cls)
+        values = {}
+        for key, item in value.items():
+            try:
+                name, check = spec.checks[key]
+            except KeyError:
+                raise NotPlainError() from None
+            if name in values:
+                raise NotPlainError()
+            values[name] = check(item)
+        if not spec.required.issubset(values):
+            raise NotPlainError()
+        # Fields are stored in their definition order like pydantic does.
+        fields = {
+            name: values[name] if name in values else field.get_default()
+            for name, field in spec.fields
+        }
+        model = cls.__new__(cls)
+        object.__setattr__(model, "__dict__", fields)
+        object.__setattr__(model, "__fields_set__", set(values))
+        if cls.__private_attributes__:
+            model._init_private_attributes()
+        return model
+
+    @classmethod
+    def validate(cls, value: Any) -> "IOBase":
+        """Validate nested data taking the fast path where possible."""
+        try:
+            return cls.construct_plain(value)
+        except NotPlainError:
+            return super().validate(value)
+
+    @classmethod
+    def parse_obj(cls, obj: Any) -> "IOBase":
+        """Parse data taking the fast path where possible."""
+        try:
+            return cls.construct_plain(obj)
+        except NotPlainError:
+            return super().parse_obj(obj)
+
+
+class _PlainSpec(NamedTuple):
+    """Define the precompiled fast path of a model class."""
+
+    checks: Dict[str, Tuple[str, Callable[[Any], Any]]]
+    required: FrozenSet[str]
+    fields: Tuple[Tuple[str, ModelField], ...]
+
+
+_PLAIN_SPECS: Dict[type, _PlainSpec] = {}
+
+
+def _compile_plain_spec(cls: Type[IOBase]) -> _PlainSpec:
+    """Map field names and aliases to checks and collect the required fields."""
+    checks = {}
+    for name, field in cls.__fields__.items():
+        if name in cls.__plain_fields__:
+            checks[name] = checks[field.alias] = (name, cls.__plain_fields__[name])
+    spec = _PlainSpec(
+        checks=checks,
+        required=frozenset(
+            name for name, field in cls.__fields__.items() if field.required
+        ),
+        fields=tuple(cls.__fields__.items()),
+    )
+    _PLAIN_SPECS[cls] = spec
+    return spec
@@ -0,0 +1,227 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Provide streaming readers of MetaNetX tables.
+
+MetaNetX distributes its reconciled namespace as large tab-separated tables. The
+readers here turn one row at a time into IO models, such that the tables can be
+loaded without converting them to JSON first. Columns are located by the header,
+which is the last comment line before the data, so that the readers work with
+releases that differ in column order.
+
+"""
+
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, TypeVar
+
+from .compound_model import CompoundModel
+from .reaction_equation import parse_equation
+from .reaction_model import ReactionModel
+
+
+Item = TypeVar("Item")
+
+
+# Column names of different MetaNetX releases that hold the same data.
+COLUMN_ALIASES: Dict[str, tuple] = {
+    "id": ("ID", "MNX_ID"),
+    "name": ("name", "Description"),
+    "reference": ("reference", "Source"),
+    "formula": ("formula", "Formula"),
+    "charge": ("charge", "Charge"),
+    "inchi": ("InChI",),
+    "inchikey": ("InChIKey",),
+    "smiles": ("SMILES",),
+    "source": ("source", "XREF"),
+    "description": ("description", "Description"),
+    "equation": ("mnx_equation", "Equation"),
+    "classifs": ("classifs", "EC"),
+}
+# MetaNetX writes compartments as 'MNXM1@MNXD1'.
+_LOCATION = re.compile(r"@(\S+)")
+
+
+def iter_rows(handle: TextIO) -> Iterator[Dict[str, str]]:
+    """
+    Generate the rows of a MetaNetX table as mappings from canonical column names.
+
+    Parameters
+    ----------
+    handle : io.TextIOBase
+        An open MetaNetX table.
+
+    Yields
+    ------
+    dict
+        The non-empty values of a row keyed by the canonical names of
+        `COLUMN_ALIASES`. Unknown columns are ignored.
+
+    Raises
+    ------
+    ValueError
+        If the table has no header or lacks an identifier column.
+
+    """
+    header: Optional[str] = None
+    columns: Optional[List[Optional[str]]] = None
+    for line in handle:
+        if line.startswith("#"):
+            header = line
+            continue
+        line = line.rstrip("\n")
+        if not line:
+            continue
+        if columns is None:
+            columns = _parse_header(header)
+        yield {
+            name: value
+            for name, value in zip(columns, line.split("\t"))
+            if name is not None and value
+        }
+
+
+def iter_chem_prop(handle: TextIO) -> Iterator[CompoundModel]:
+    """
+    Generate compound models from a MetaNetX ``chem_prop.tsv`` table.
+
+    Compounds are annotated with their MetaNetX identifier in the
+    'metanetx.chemical' namespace, their reference identifier, and their
+    structure. Their name is the preferred name in the 'metanetx.chemical'
+    namespace.
+
+    """
+    for row in iter_rows(handle):
+        id = row["id"]
+        names = {}
+        if "name" in row:
+            names["metanetx.chemical"] = [{"name": row["name"], "isPreferred": True}]
+        annotation = _annotation("metanetx.chemical", id, row.get("reference"))
+        for key in ("inchi", "inchikey", "smiles"):
+            if key in row:
+                annotation[key] = [{"biologyQualifier": "is", "identifier": row[key]}]
+        yield CompoundModel.parse_obj(
+            {
+                "id": id,
+                "names": names,
+                "annotation": annotation,
+                "chemicalFormula": row.get("formula"),
+                "charge": float(row["charge"]) if "charge" in row else None,
+            }
+        )
+
+
+def iter_chem_xref(handle: TextIO) -> Iterator[CompoundModel]:
+    """
+    Generate partial compound models from a MetaNetX ``chem_xref.tsv`` table.
+
+    Each row becomes a compound model with the MetaNetX identifier and the cross-
+    reference as annotation. The description's names, separated by '||', are
+    added as names in the cross-reference's namespace. The models are meant to be
+    merged into existing compounds, e.g., by
+    `cobra_component_models.builder.CompoundBuilder.upsert`.
+
+    """
+    for row in iter_rows(handle):
+        if "source" not in row or ":" not in row["source"]:
+            continue
+        prefix, identifier = row["source"].split(":", 1)
+        names = {}
+        if "description" in row:
+            names[prefix] = [
+                {"name": name} for name in row["description"].split("||") if name
+            ]
+        yield CompoundModel.parse_obj(
+            {
+                "id": row["id"],
+                "names": names,
+                "annotation": _annotation(
+                    "metanetx.chemical", row["id"], row["source"]
+                ),
+            }
+        )
+
+
+def iter_reac_prop(handle: TextIO) -> Iterator[ReactionModel]:
+    """
+    Generate reaction models from a MetaNetX ``reac_prop.tsv`` table.
+
+    Participants refer to compounds and compartments by their MetaNetX
+    identifiers. Reactions are annotated with their MetaNetX identifier in the
+    'metanetx.reaction' namespace, their reference identifier, and their EC
+    numbers in the 'ec-code' namespace.
+
+    Raises
+    ------
+    ValueError
+        If an equation cannot be parsed.
+
+    """
+    for row in iter_rows(handle):
+        id = row["id"]
+        reactants, products = parse_equation(
+            _LOCATION.sub(r"[\1]", row.get("equation", "="))
+        )
+        annotation = _annotation("metanetx.reaction", id, row.get("reference"))
+        for code in row.get("classifs", "").split(";"):
+            if code:
+                annotation.setdefault("ec-code", []).append(
+                    {"biologyQualifier": "is", "identifier": code}
+                )
+        yield ReactionModel.parse_obj({"id": id, "annotation": annotation}).copy(
+            update={"reactants": reactants, "products": products}
+        )
+
+
+def iter_batches(items: Iterable[Item], size: int) -> Iterator[List[Item]]:
+    """Generate lists of at most `size` consecutive items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _parse_header(header: Optional[str]) -> List[Optional[str]]:
+    """Map the columns of a header line onto canonical column names."""
+    if header is None:
+        raise ValueError("The MetaNetX table has no header line.")
+    alias2name = {
+        alias: name for name, aliases in COLUMN_ALIASES.items() for alias in aliases
+    }
+    columns = [alias2name.get(c.strip()) for c in header.lstrip("#").split("\t")]
+    # 'Description' means names in cross-reference tables and in old property
+    # tables alike, but the canonical name differs.
+    if "source" not in columns:
+        columns = ["name" if c == "description" else c for c in columns]
+    if "id" not in columns:
+        raise ValueError(f"The MetaNetX table header '{header.strip()}' lacks an ID.")
+    return columns
+
+
+def _annotation(prefix: str, id: str, reference: Optional[str]) -> Dict[str, list]:
+    """Return the annotation with the MetaNetX identifier and a reference."""
+    annotation = {prefix: [{"biologyQualifier": "is", "identifier": id}]}
+    if reference and ":" in reference:
+        source, identifier = reference.split(":", 1)
+        if source != prefix:
+            annotation.setdefault(source, []).append(
+                {"biologyQualifier": "is", "identifier": identifier}
+            )
+    return annotation
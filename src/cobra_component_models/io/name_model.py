@@ -18,6 +18,7 @@
 
 from pydantic import Field
 
+from .fast_path import plain_bool, plain_str
 from .io_base import IOBase
 
 
@@ -32,3 +33,5 @@ class NameModel(IOBase):
 
     name: str
     is_preferred: bool = Field(False, alias="isPreferred")
+
+    __plain_fields__ = {"name": plain_str, "is_preferred": plain_bool}
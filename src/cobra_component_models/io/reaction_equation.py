@@ -0,0 +1,205 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide parsing and rendering of reaction equation strings."""
+
+
+import re
+from typing import Dict, Iterable, Iterator, Tuple
+
+from .reaction_model import ParticipantModel, ReactionModel
+
+
+Participants = Dict[str, ParticipantModel]
+
+
+FORWARD_ARROWS = ("<=>", "<->", "-->", "->", "=>", "=")
+# Arrows pointing to the left swap the sides.
+BACKWARD_ARROWS = ("<--", "<-", "<=")
+_ARROWS = frozenset(FORWARD_ARROWS + BACKWARD_ARROWS)
+# An optional compartment for all participants, e.g., '[c]: a <=> b'.
+_COMPARTMENT_PREFIX = re.compile(r"^\s*\[([^\[\]\s]+)\]\s*:\s*")
+_COEFFICIENT = re.compile(r"(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$")
+
+
+def parse_equation(equation: str) -> Tuple[Participants, Participants]:
+    """
+    Parse a reaction equation into reactants and products.
+
+    Terms consist of an optional stoichiometric coefficient, a compound identifier,
+    and a compartment identifier in brackets, for example,
+    ``2 h2o[c] <=> 2 h2[c] + o2[c]``. A compartment for all terms can instead be
+    given as a prefix, for example, ``[c]: 2 h2o <=> 2 h2 + o2``. Either side may
+    be empty. Arrows and plus signs must be separated from the terms by
+    whitespace, since they may occur in compound identifiers, e.g., 'fe2+'. Thus,
+    ``a[c]<=>b[c]`` is rejected.
+
+    Parameters
+    ----------
+    equation : str
+        The reaction equation.
+
+    Returns
+    -------
+    tuple
+        Pairs of dictionaries mapping compound identifiers to reactant and product
+        data models, respectively.
+
+    Raises
+    ------
+    ValueError
+        If the equation has no or more than one arrow, a malformed term, a term
+        without compartment, or a compound that occurs twice on one side.
+
+    """
+    compartment = None
+    match = _COMPARTMENT_PREFIX.match(equation)
+    text = equation if match is None else equation[match.end() :]
+    if match is not None:
+        compartment = match.group(1)
+    # Arrows and plus signs must be separate tokens, such that they may occur in
+    # compound identifiers, e.g., 'fe2+'.
+    sides = ({}, {})
+    side = 0
+    arrow = None
+    term = []
+    for token in text.split():
+        if token in _ARROWS:
+            if arrow is not None:
+                raise ValueError(
+                    f"Expected exactly one reaction arrow in the equation "
+                    f"'{equation}'."
+                )
+            if term or sides[0]:
+                _add_term(sides[0], term, compartment, equation)
+            arrow = token
+            side = 1
+            term = []
+        elif token == "+":
+            _add_term(sides[side], term, compartment, equation)
+            term = []
+        else:
+            term.append(token)
+    if arrow is None:
+        raise ValueError(
+            f"Expected exactly one reaction arrow in the equation '{equation}'."
+        )
+    if term or sides[1]:
+        _add_term(sides[1], term, compartment, equation)
+    if arrow in BACKWARD_ARROWS:
+        return sides[1], sides[0]
+    return sides
+
+
+def parse_equations(
+    equations: Iterable[str],
+) -> Iterator[Tuple[Participants, Participants]]:
+    """
+    Parse many reaction equations lazily.
+
+    Parameters
+    ----------
+    equations : iterable of str
+        The reaction equations.
+
+    Yields
+    ------
+    tuple
+        Pairs of reactant and product dictionaries as returned by
+        `parse_equation`.
+
+    """
+    for equation in equations:
+        yield parse_equation(equation)
+
+
+def render_equation(reaction: ReactionModel, arrow: str = "<=>") -> str:
+    """
+    Render the reactants and products of a reaction as an equation.
+
+    Coefficients of one are omitted. The result can be parsed again with
+    `parse_equation`.
+
+    Parameters
+    ----------
+    reaction : cobra_component_models.io.ReactionModel
+        The pydantic reaction data model.
+    arrow : str, optional
+        The arrow between reactants and products (default '<=>').
+
+    Returns
+    -------
+    str
+        The reaction equation.
+
+    """
+    left = _render_side(reaction.reactants)
+    right = _render_side(reaction.products)
+    return f"{left} {arrow} {right}".strip()
+
+
+def render_equations(
+    reactions: Iterable[ReactionModel], arrow: str = "<=>"
+) -> Iterator[str]:
+    """Render many reactions as equations lazily; see `render_equation`."""
+    for reaction in reactions:
+        yield render_equation(reaction, arrow)
+
+
+def _add_term(
+    participants: Participants, term: list, compartment: str, equation: str
+) -> None:
+    """Parse the tokens of one term and add the participant to its side."""
+    if len(term) == 2 and _COEFFICIENT.match(term[0]):
+        coefficient, token = term
+    elif len(term) == 1:
+        coefficient, token = "1", term[0]
+    else:
+        raise ValueError(
+            f"Malformed term '{' '.join(term)}' in the equation '{equation}'."
+        )
+    compound = token
+    if token.endswith("]"):
+        index = token.rfind("[")
+        compound = token[:index]
+        compartment = token[index + 1 : -1]
+    if not compound or "[" in compound or "]" in compound or compartment == "":
+        raise ValueError(
+            f"Malformed term '{' '.join(term)}' in the equation '{equation}'."
+        )
+    if compartment is None:
+        raise ValueError(
+            f"The term '{' '.join(term)}' in the equation '{equation}' lacks a "
+            f"compartment."
+        )
+    if compound in participants:
+        raise ValueError(
+            f"The compound '{compound}' occurs twice on one side of the "
+            f"equation '{equation}'."
+        )
+    # The tokenizer guarantees plain strings that need no validation.
+    participants[compound] = ParticipantModel.construct_plain(
+        {"stoichiometry": coefficient, "compartment": compartment}
+    )
+
+
+def _render_side(participants: Participants) -> str:
+    """Render the participants on one side of an equation."""
+    return " + ".join(
+        f"{part.stoichiometry} {compound}[{part.compartment}]"
+        if part.stoichiometry != "1"
+        else f"{compound}[{part.compartment}]"
+        for compound, part in participants.items()
+    )
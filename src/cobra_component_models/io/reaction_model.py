@@ -18,7 +18,11 @@
 
 from typing import Dict
 
+from pydantic import validator
+
 from .abstract_base_model import AbstractBaseModel
+from .fast_path import interned_str, mapping_of, plain_str
+from .interning import intern_str
 from .io_base import IOBase
 
 
@@ -28,6 +32,13 @@ class ParticipantModel(IOBase):
     stoichiometry: str
     compartment: str
 
+    __plain_fields__ = {"stoichiometry": plain_str, "compartment": interned_str}
+
+    @validator("compartment")
+    def intern_compartment(cls, compartment: str) -> str:
+        """Share the compartment identifiers between all participants."""
+        return intern_str(compartment)
+
 
 class ReactionModel(AbstractBaseModel):
     """Define a pydantic reaction data model."""
@@ -35,3 +46,10 @@ class ReactionModel(AbstractBaseModel):
     id: str
     reactants: Dict[str, ParticipantModel] = {}
     products: Dict[str, ParticipantModel] = {}
+
+    __plain_fields__ = {
+        **AbstractBaseModel.__plain_fields__,
+        "id": plain_str,
+        "reactants": mapping_of(ParticipantModel.construct_plain),
+        "products": mapping_of(ParticipantModel.construct_plain),
+    }
@@ -0,0 +1,334 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide an incremental reader of SBML documents into IO models."""
+
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import unquote
+from xml.etree.ElementTree import Element, iterparse
+
+from .annotation_model import BIOLOGY_QUALIFIERS
+from .compartment_model import CompartmentModel
+from .compound_model import CompoundModel
+from .reaction_model import ReactionModel
+from .sbml_writer import BQBIOL_NS, BQMODEL_NS, RDF_NS
+
+
+IDENTIFIERS_ORG_ROOTS = ("https://identifiers.org/", "http://identifiers.org/")
+MIRIAM_URN_ROOT = "urn:miriam:"
+_LIST_TAGS = ("listOfCompartments", "listOfSpecies", "listOfReactions")
+
+
+class MiriamIndex:
+    """
+    Define an index that maps MIRIAM URIs onto namespace prefixes.
+
+    The index is computed once from the known namespaces and resolves URIs of the
+    forms ``https://identifiers.org/chebi/CHEBI:15377``,
+    ``https://identifiers.org/CHEBI:15377``, and ``urn:miriam:chebi:CHEBI%3A15377``
+    with a dictionary lookup each.
+
+    """
+
+    def __init__(self, namespaces: Dict[str, bool], **kwargs):
+        """
+        Initialize a MIRIAM index.
+
+        Parameters
+        ----------
+        namespaces : dict
+            A mapping from namespace prefixes to whether their identifiers have an
+            embedded prefix, e.g., 'CHEBI:15377'.
+
+        Other Parameters
+        ----------------
+        kwargs
+            Passed on to super class init method.
+
+        """
+        super().__init__(**kwargs)
+        self.namespaces = dict(namespaces)
+        self._lower = {prefix.lower(): prefix for prefix in namespaces}
+
+    def resolve(self, uri: str) -> Optional[Tuple[str, str]]:
+        """
+        Return the namespace prefix and identifier of a MIRIAM URI.
+
+        Parameters
+        ----------
+        uri : str
+            A MIRIAM URI.
+
+        Returns
+        -------
+        tuple or None
+            A pair of prefix and identifier or None if the URI's namespace is
+            unknown.
+
+        """
+        if uri.startswith(MIRIAM_URN_ROOT):
+            prefix, _, identifier = unquote(uri[len(MIRIAM_URN_ROOT) :]).partition(":")
+            prefix = self._lower.get(prefix.lower())
+            return None if prefix is None or not identifier else (prefix, identifier)
+        for root in IDENTIFIERS_ORG_ROOTS:
+            if uri.startswith(root):
+                break
+        else:
+            return None
+        remainder = uri[len(root) :]
+        if "/" in remainder:
+            prefix, _, identifier = remainder.partition("/")
+            prefix = self._lower.get(prefix.lower())
+            return None if prefix is None or not identifier else (prefix, identifier)
+        # Compact identifiers keep an embedded prefix as part of the identifier.
+        embedded, _, identifier = remainder.partition(":")
+        prefix = self._lower.get(embedded.lower())
+        if prefix is None or not identifier:
+            return None
+        if self.namespaces[prefix] or embedded != prefix:
+            return prefix, remainder
+        return prefix, identifier
+
+
+class SBMLDocument(NamedTuple):
+    """
+    Define the components read from an SBML document.
+
+    Attributes
+    ----------
+    model_id : str
+        The identifier of the SBML model.
+    compartments : dict
+        Compartment models by their SBML identifier without a leading 'C_'.
+    compounds : dict
+        Compound models by their identifier, i.e., the species' identifier without
+        a leading 'M_' and a trailing compartment identifier.
+    reactions : dict
+        Reaction models by their SBML identifier without a leading 'R_'.
+        Participants refer to compound and compartment identifiers.
+
+    """
+
+    model_id: str
+    compartments: Dict[str, CompartmentModel]
+    compounds: Dict[str, CompoundModel]
+    reactions: Dict[str, ReactionModel]
+
+
+def read_sbml(
+    source: Union[str, Path],
+    index: MiriamIndex,
+    name_prefix: Optional[str] = None,
+) -> SBMLDocument:
+    """
+    Read the compartments, species, and reactions of an SBML document.
+
+    The document is parsed incrementally and each element is cleared and removed
+    from its list once it has been turned into an IO model, such that only the
+    models are kept in memory. Species become compounds; a species in several
+    compartments yields a single compound described by its first occurrence.
+    Annotation whose namespace is not in the index is skipped.
+
+    Parameters
+    ----------
+    source : str or pathlib.Path
+        The path of the SBML document.
+    index : MiriamIndex
+        The index of known namespaces.
+    name_prefix : str, optional
+        The namespace prefix under which the names of components are stored
+        (default omit names).
+
+    Returns
+    -------
+    SBMLDocument
+        The IO models of the document's components.
+
+    Raises
+    ------
+    ValueError
+        If a reaction refers to an unknown species.
+
+    """
+    model_id = ""
+    compartments = {}
+    compounds = {}
+    reactions = {}
+    # Map species identifiers to their compound and compartment.
+    locations: Dict[str, Tuple[str, str]] = {}
+    # The list of components whose elements are being parsed.
+    parent: Optional[Element] = None
+    for event, element in iterparse(str(source), events=("start", "end")):
+        tag = _local_name(element.tag)
+        if event == "start":
+            if tag == "model":
+                model_id = element.get("id", "")
+            elif tag in _LIST_TAGS:
+                parent = element
+            continue
+        if tag == "compartment":
+            compartment = _make_model(
+                CompartmentModel,
+                element,
+                _strip(element.get("id"), "C_"),
+                index,
+                name_prefix,
+            )
+            compartments[compartment.id] = compartment
+        elif tag == "species":
+            compartment_id = _strip(element.get("compartment"), "C_")
+            compound_id = _compound_id(element.get("id"), compartment_id)
+            locations[element.get("id")] = (compound_id, compartment_id)
+            if compound_id not in compounds:
+                compounds[compound_id] = _make_model(
+                    CompoundModel,
+                    element,
+                    compound_id,
+                    index,
+                    name_prefix,
+                    charge=_charge(element),
+                    chemicalFormula=_attribute(element, "chemicalFormula"),
+                )
+        elif tag == "reaction":
+            reaction = _make_model(
+                ReactionModel,
+                element,
+                _strip(element.get("id"), "R_"),
+                index,
+                name_prefix,
+                reactants=_participants(element, "listOfReactants", locations),
+                products=_participants(element, "listOfProducts", locations),
+            )
+            reactions[reaction.id] = reaction
+        elif tag in _LIST_TAGS:
+            parent = None
+        else:
+            continue
+        element.clear()
+        if parent is not None:
+            parent.remove(element)
+    return SBMLDocument(model_id, compartments, compounds, reactions)
+
+
+def _local_name(tag: str) -> str:
+    """Return an element tag without its namespace."""
+    return tag.rpartition("}")[2]
+
+
+def _attribute(element: Element, name: str) -> Optional[str]:
+    """Return an attribute in any namespace, e.g., of an SBML package."""
+    if name in element.attrib:
+        return element.attrib[name]
+    for key, value in element.attrib.items():
+        if _local_name(key) == name:
+            return value
+    return None
+
+
+def _charge(element: Element) -> Optional[float]:
+    """Return the charge of a species from the fbc package or SBML Level 2."""
+    charge = _attribute(element, "charge")
+    return None if charge is None else float(charge)
+
+
+def _strip(sid: str, prefix: str) -> str:
+    """Remove a conventional prefix, e.g., 'R_', from an SBML identifier."""
+    if sid.startswith(prefix) and len(sid) > len(prefix):
+        return sid[len(prefix) :]
+    return sid
+
+
+def _compound_id(species_id: str, compartment_id: str) -> str:
+    """Remove the conventional 'M_' prefix and compartment suffix of a species."""
+    compound_id = _strip(species_id, "M_")
+    suffix = f"_{compartment_id}"
+    if compound_id.endswith(suffix) and len(compound_id) > len(suffix):
+        compound_id = compound_id[: -len(suffix)]
+    return compound_id
+
+
+def _make_model(
+    cls,
+    element: Element,
+    id: str,
+    index: MiriamIndex,
+    name_prefix: Optional[str],
+    **fields,
+):
+    """Create an IO model with the SBase content of an element."""
+    obj = {"id": id, "annotation": {}, "names": {}, **fields}
+    if element.get("sboTerm"):
+        obj["sboTerm"] = element.get("sboTerm")
+    if name_prefix is not None and element.get("name"):
+        obj["names"][name_prefix] = [{"name": element.get("name"), "isPreferred": True}]
+    for child in element:
+        tag = _local_name(child.tag)
+        if tag == "notes":
+            notes = " ".join("".join(child.itertext()).split())
+            if notes:
+                obj["notes"] = notes
+        elif tag == "annotation":
+            obj["annotation"] = _annotation(child, index)
+    return cls.parse_obj(obj)
+
+
+def _annotation(element: Element, index: MiriamIndex) -> Dict[str, List[dict]]:
+    """Collect the MIRIAM annotation of an annotation element by namespace."""
+    result: Dict[str, List[dict]] = {}
+    for rdf in element.iterfind(f"{{{RDF_NS}}}RDF"):
+        for description in rdf.iterfind(f"{{{RDF_NS}}}Description"):
+            for qualifier_element in description:
+                namespace, _, qualifier = qualifier_element.tag[1:].partition("}")
+                if namespace == BQMODEL_NS:
+                    qualifier = f"bqm_{qualifier}"
+                elif namespace != BQBIOL_NS:
+                    continue
+                if qualifier not in BIOLOGY_QUALIFIERS:
+                    continue
+                for item in qualifier_element.iter(f"{{{RDF_NS}}}li"):
+                    resolved = index.resolve(item.get(f"{{{RDF_NS}}}resource", ""))
+                    if resolved is None:
+                        continue
+                    prefix, identifier = resolved
+                    result.setdefault(prefix, []).append(
+                        {"biologyQualifier": qualifier, "identifier": identifier}
+                    )
+    return result
+
+
+def _participants(
+    element: Element, tag: str, locations: Dict[str, Tuple[str, str]]
+) -> Dict[str, dict]:
+    """Collect the participants of one side of a reaction."""
+    result = {}
+    for child in element:
+        if _local_name(child.tag) != tag:
+            continue
+        for reference in child:
+            species_id = reference.get("species")
+            try:
+                compound_id, compartment_id = locations[species_id]
+            except KeyError:
+                raise ValueError(
+                    f"The reaction '{element.get('id')}' refers to the unknown "
+                    f"species '{species_id}'."
+                ) from None
+            result[compound_id] = {
+                "stoichiometry": reference.get("stoichiometry", "1"),
+                "compartment": compartment_id,
+            }
+    return result
@@ -0,0 +1,346 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a streaming writer of SBML Level 3 documents."""
+
+
+import re
+from itertools import count
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+from xml.sax.saxutils import XMLGenerator
+
+from .abstract_base_model import AbstractBaseModel
+from .compartment_model import CompartmentModel
+from .compound_model import CompoundModel
+from .reaction_model import ParticipantModel, ReactionModel
+
+
+SBML_NS = "http://www.sbml.org/sbml/level3/version1/core"
+FBC_NS = "http://www.sbml.org/sbml/level3/version1/fbc/version2"
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+BQBIOL_NS = "http://biomodels.net/biology-qualifiers/"
+BQMODEL_NS = "http://biomodels.net/model-qualifiers/"
+IDENTIFIERS_ORG = "https://identifiers.org/"
+# Structure annotation that is not expressed as a MIRIAM URI.
+UNRESOLVABLE_PREFIXES = frozenset(["smiles"])
+
+_INVALID_SID_CHARACTERS = re.compile(r"[^A-Za-z0-9_]")
+# The order in which the lists of an SBML model must appear.
+_SECTIONS = ("listOfCompartments", "listOfSpecies", "listOfReactions")
+
+
+def make_sid(prefix: str, *parts: str) -> str:
+    """
+    Return a valid SBML identifier (SId) made from a prefix and parts.
+
+    Characters that are not allowed in an SId are replaced by underscores. The
+    prefix, e.g., 'M' for species, guarantees that the identifier starts with a
+    letter even for numeric component identifiers. Different parts may result in
+    the same identifier, e.g., 'a-b' and 'a_b'. The `SBMLWriter` resolves such
+    collisions.
+
+    """
+    return "_".join([prefix] + [_INVALID_SID_CHARACTERS.sub("_", p) for p in parts])
+
+
+class SBMLWriter:
+    """
+    Define a writer of SBML Level 3 Version 1 documents with incremental output.
+
+    Each element is written to the file as soon as it is passed to the writer, such
+    that arbitrarily many components can be written in bounded memory. Names,
+    notes, SBO terms, and annotation as MIRIAM RDF are written for all
+    components; charges and chemical formulae of species use the flux balance
+    constraints (fbc) package. Compartments, species, and reactions must be
+    written in this order.
+
+    Identifiers are made with `make_sid`. When two components result in the same
+    identifier, the later one receives a numeric suffix. The writer thus remembers
+    all written identifiers, and the suffixed ones with their components.
+
+    Examples
+    --------
+    >>> with SBMLWriter(handle, model_id="components") as writer:
+    ...     for compartment in compartments:
+    ...         writer.write_compartment(compartment)
+    ...     for compound in compounds:
+    ...         writer.write_species(compound, "c")
+    ...     for reaction in reactions:
+    ...         writer.write_reaction(reaction)
+
+    """
+
+    def __init__(self, handle: TextIO, model_id: str = "components", **kwargs):
+        """
+        Initialize an SBML writer.
+
+        Parameters
+        ----------
+        handle : io.TextIOBase
+            A text file opened for writing.
+        model_id : str, optional
+            The identifier of the SBML model (default 'components').
+
+        Other Parameters
+        ----------------
+        kwargs
+            Passed on to super class init method.
+
+        """
+        super().__init__(**kwargs)
+        self.model_id = model_id
+        self._xml = XMLGenerator(handle, encoding="utf-8", short_empty_elements=True)
+        self._section: Optional[int] = None
+        self._sids: Set[str] = set()
+        # Map the keys of compartments and species that received a suffix to their
+        # identifiers.
+        self._renamed: Dict[Tuple[str, ...], str] = {}
+        self._compartments: Set[str] = set()
+
+    def __enter__(self) -> "SBMLWriter":
+        """Start the document."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Finish the document unless an error occurred."""
+        if exc_type is None:
+            self.end()
+
+    def start(self) -> None:
+        """Write the XML declaration and open the SBML model."""
+        self._xml.startDocument()
+        self._xml.startElement(
+            "sbml",
+            {
+                "xmlns": SBML_NS,
+                "xmlns:fbc": FBC_NS,
+                "level": "3",
+                "version": "1",
+                "fbc:required": "false",
+            },
+        )
+        self._xml.startElement(
+            "model", {"id": make_sid("model", self.model_id), "fbc:strict": "false"}
+        )
+
+    def end(self) -> None:
+        """Close all open elements and the document."""
+        self._enter_section(len(_SECTIONS))
+        self._xml.endElement("model")
+        self._xml.endElement("sbml")
+        self._xml.endDocument()
+
+    def write_compartment(self, compartment: CompartmentModel) -> str:
+        """
+        Write a compartment and return its SBML identifier.
+
+        Raises
+        ------
+        ValueError
+            If species or reactions were written already.
+
+        """
+        self._enter_section(0)
+        sid = self._register(("C", compartment.id))
+        self._compartments.add(compartment.id)
+        self._start_sbase("compartment", sid, compartment, {"constant": "true"})
+        self._xml.endElement("compartment")
+        return sid
+
+    def write_species(self, compound: CompoundModel, compartment_id: str) -> str:
+        """
+        Write a compound located in a compartment as species.
+
+        Parameters
+        ----------
+        compound : cobra_component_models.io.CompoundModel
+            The pydantic compound data model.
+        compartment_id : str
+            The component identifier of the compartment of the species.
+
+        Returns
+        -------
+        str
+            The SBML identifier of the species.
+
+        Raises
+        ------
+        ValueError
+            If reactions were written already or the compartment was not written.
+
+        """
+        self._enter_section(1)
+        if compartment_id not in self._compartments:
+            raise ValueError(
+                f"The compartment '{compartment_id}' of the species of compound "
+                f"'{compound.id}' was not written."
+            )
+        sid = self._register(("M", compound.id, compartment_id))
+        attributes = {
+            "compartment": self._sid(("C", compartment_id)),
+            "hasOnlySubstanceUnits": "false",
+            "boundaryCondition": "false",
+            "constant": "false",
+        }
+        # The fbc package only allows integer charges.
+        if compound.charge is not None and float(compound.charge).is_integer():
+            attributes["fbc:charge"] = str(int(compound.charge))
+        if compound.chemical_formula:
+            attributes["fbc:chemicalFormula"] = compound.chemical_formula
+        self._start_sbase("species", sid, compound, attributes)
+        self._xml.endElement("species")
+        return sid
+
+    def write_reaction(self, reaction: ReactionModel) -> str:
+        """
+        Write a reaction and return its SBML identifier.
+
+        Participants refer to the species made from the compound and compartment
+        identifiers as in `write_species`.
+
+        """
+        self._enter_section(2)
+        sid = self._register(("R", reaction.id))
+        self._start_sbase(
+            "reaction", sid, reaction, {"reversible": "true", "fast": "false"}
+        )
+        self._write_participants("listOfReactants", reaction.reactants)
+        self._write_participants("listOfProducts", reaction.products)
+        self._xml.endElement("reaction")
+        return sid
+
+    def _sid(self, key: Tuple[str, ...]) -> str:
+        """Return the identifier of a written compartment or species."""
+        return self._renamed.get(key) or make_sid(*key)
+
+    def _register(self, key: Tuple[str, ...]) -> str:
+        """Return a new unique identifier made from a prefix and parts."""
+        sid = make_sid(*key)
+        if sid in self._sids:
+            sid = next(
+                f"{sid}_{index}"
+                for index in count(2)
+                if f"{sid}_{index}" not in self._sids
+            )
+            self._renamed[key] = sid
+        self._sids.add(sid)
+        return sid
+
+    def _enter_section(self, index: int) -> None:
+        """Close the current list of elements and open the one at `index`."""
+        if self._section == index:
+            return
+        if self._section is not None and self._section > index:
+            raise ValueError(
+                f"Elements of {_SECTIONS[index]} must be written before "
+                f"{_SECTIONS[self._section]}."
+            )
+        if self._section is not None:
+            self._xml.endElement(_SECTIONS[self._section])
+        self._section = index
+        if index < len(_SECTIONS):
+            self._xml.startElement(_SECTIONS[index], {})
+
+    def _start_sbase(
+        self, tag: str, sid: str, model: AbstractBaseModel, attributes: Dict[str, str]
+    ) -> None:
+        """Open an element with the SBase attributes, notes, and annotation."""
+        attributes = {"id": sid, "metaid": f"meta_{sid}", **attributes}
+        name = _preferred_name(model)
+        if name is not None:
+            attributes["name"] = name
+        if model.sbo_term:
+            attributes["sboTerm"] = model.sbo_term
+        self._xml.startElement(tag, attributes)
+        if model.notes:
+            self._xml.startElement("notes", {})
+            self._xml.startElement("body", {"xmlns": XHTML_NS})
+            self._xml.startElement("p", {})
+            self._xml.characters(model.notes)
+            self._xml.endElement("p")
+            self._xml.endElement("body")
+            self._xml.endElement("notes")
+        self._write_annotation(attributes["metaid"], model)
+
+    def _write_annotation(self, metaid: str, model: AbstractBaseModel) -> None:
+        """Write the annotation as MIRIAM RDF grouped by biology qualifier."""
+        qualifier2uris: Dict[str, List[str]] = {}
+        for prefix, annotation in model.annotation.items():
+            if prefix in UNRESOLVABLE_PREFIXES:
+                continue
+            for ann in annotation:
+                qualifier2uris.setdefault(ann.biology_qualifier, []).append(
+                    f"{IDENTIFIERS_ORG}{prefix}/{ann.identifier}"
+                )
+        if not qualifier2uris:
+            return
+        self._xml.startElement("annotation", {})
+        self._xml.startElement(
+            "rdf:RDF",
+            {
+                "xmlns:rdf": RDF_NS,
+                "xmlns:bqbiol": BQBIOL_NS,
+                "xmlns:bqmodel": BQMODEL_NS,
+            },
+        )
+        self._xml.startElement("rdf:Description", {"rdf:about": f"#{metaid}"})
+        for qualifier, uris in qualifier2uris.items():
+            if qualifier.startswith("bqm_"):
+                tag = f"bqmodel:{qualifier[4:]}"
+            else:
+                tag = f"bqbiol:{qualifier}"
+            self._xml.startElement(tag, {})
+            self._xml.startElement("rdf:Bag", {})
+            for uri in uris:
+                self._xml.startElement("rdf:li", {"rdf:resource": uri})
+                self._xml.endElement("rdf:li")
+            self._xml.endElement("rdf:Bag")
+            self._xml.endElement(tag)
+        self._xml.endElement("rdf:Description")
+        self._xml.endElement("rdf:RDF")
+        self._xml.endElement("annotation")
+
+    def _write_participants(
+        self, tag: str, participants: Dict[str, ParticipantModel]
+    ) -> None:
+        """Write the species references of one side of a reaction."""
+        if not participants:
+            return
+        self._xml.startElement(tag, {})
+        for compound_id, part in participants.items():
+            self._xml.startElement(
+                "speciesReference",
+                {
+                    "species": self._sid(("M", compound_id, part.compartment)),
+                    "stoichiometry": part.stoichiometry,
+                    "constant": "true",
+                },
+            )
+            self._xml.endElement("speciesReference")
+        self._xml.endElement(tag)
+
+
+def _preferred_name(model: AbstractBaseModel) -> Optional[str]:
+    """Return the first preferred name or else the first name of a component."""
+    first = None
+    for names in model.names.values():
+        for name in names:
+            if name.is_preferred:
+                return name.name
+            if first is None:
+                first = name.name
+    return first
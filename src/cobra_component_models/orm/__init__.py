@@ -24,11 +24,13 @@ from .compartment_name import CompartmentName
 from .compartment import Compartment
 from .compound_annotation import CompoundAnnotation
 from .compound_name import CompoundName
+from .compound_element import CompoundElement
 from .compound import Compound
 from .reaction_annotation import ReactionAnnotation
 from .reaction_name import ReactionName
 from .participant import Participant
 from .reaction import Reaction
+from .component_timestamps import touch_components
 from .abstract_component import (
     AbstractComponentAnnotation,
     AbstractComponentName,
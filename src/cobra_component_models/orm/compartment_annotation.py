@@ -35,7 +35,9 @@ class CompartmentAnnotation(AnnotationMixin, Base):
 
     __tablename__ = "compartment_annotations"
 
-    compartment_id: int = Column(Integer, ForeignKey("compartments.id"), nullable=False)
+    compartment_id: int = Column(
+        Integer, ForeignKey("compartments.id", ondelete="CASCADE"), nullable=False
+    )
 
     __table_args__ = (UniqueConstraint("compartment_id", "namespace_id", "identifier"),)
 
@@ -35,7 +35,9 @@ class CompartmentName(NameMixin, Base):
 
     __tablename__ = "compartment_names"
 
-    compartment_id: int = Column(Integer, ForeignKey("compartments.id"), nullable=False)
+    compartment_id: int = Column(
+        Integer, ForeignKey("compartments.id", ondelete="CASCADE"), nullable=False
+    )
 
     __table_args__ = (UniqueConstraint("compartment_id", "namespace_id", "name"),)
 
@@ -0,0 +1,81 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018-2019, Moritz E. Beber.
+# Copyright (c) 2018-2019, Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2018-2019, Novo Nordisk Foundation Center for Biosustainability,
+#     Technical University of Denmark.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+
+
+"""Update the timestamp of components whenever their children change."""
+
+
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .compartment import Compartment
+from .compartment_annotation import CompartmentAnnotation
+from .compartment_name import CompartmentName
+from .compound import Compound
+from .compound_annotation import CompoundAnnotation
+from .compound_name import CompoundName
+from .mixin.timestamp_mixin import timezone_aware_now
+from .participant import Participant
+from .reaction import Reaction
+from .reaction_annotation import ReactionAnnotation
+from .reaction_name import ReactionName
+
+
+# Map the classes of component children to their parent and foreign key.
+CHILDREN = {
+    CompartmentName: (Compartment, "compartment_id"),
+    CompartmentAnnotation: (Compartment, "compartment_id"),
+    CompoundName: (Compound, "compound_id"),
+    CompoundAnnotation: (Compound, "compound_id"),
+    ReactionName: (Reaction, "reaction_id"),
+    ReactionAnnotation: (Reaction, "reaction_id"),
+    Participant: (Reaction, "reaction_id"),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def touch_components(session: Session, flush_context, instances) -> None:
+    """
+    Set the update time of persisted components whose children change.
+
+    A component's ``updated_on`` column thus changes with its names, annotation,
+    or participants, too, and can serve as the version of its serialization.
+    Children that are added to a component's collection mark the component
+    itself as modified, otherwise the component is found by the child's foreign
+    key. Bulk statements bypass this event like any other ORM event.
+
+    """
+    now = timezone_aware_now()
+    components = set()
+    with session.no_autoflush:
+        for instance in chain(session.new, session.dirty, session.deleted):
+            if isinstance(instance, (Compartment, Compound, Reaction)):
+                if session.is_modified(instance):
+                    components.add(instance)
+                continue
+            parent = CHILDREN.get(type(instance))
+            if parent is None:
+                continue
+            cls, foreign_key = parent
+            id = getattr(instance, foreign_key)
+            if id is not None:
+                component = session.query(cls).get(id)
+                if component is not None:
+                    components.add(component)
+    for component in components:
+        if component not in session.new and component not in session.deleted:
+            component.updated_on = now
@@ -32,7 +32,7 @@ from typing import List, Optional
 from sqlalchemy import Column, Float, String
 from sqlalchemy.orm import relationship
 
-from . import CompoundAnnotation, CompoundName
+from . import CompoundAnnotation, CompoundElement, CompoundName
 from .base import Base
 
 
@@ -48,9 +48,14 @@ class Compound(Base):
     chemical_formula : str, optional
     charge : float, optional
     mass : float, optional
+        The average mass derived from the chemical formula.
+    monoisotopic_mass : float, optional
+        The monoisotopic mass derived from the chemical formula.
     notes : str, optional
     names : list of cobra_component_models.orm.CompoundName, optional
     annotation : list of cobra_component_models.orm.CompoundAnnotation, optional
+    elements : list of cobra_component_models.orm.CompoundElement, optional
+        The element counts derived from the chemical formula.
 
     """
 
@@ -63,10 +68,18 @@ class Compound(Base):
     smiles: Optional[str] = Column(String, nullable=True, index=True)
     chemical_formula: Optional[str] = Column(String, nullable=True, index=True)
     charge: Optional[float] = Column(Float, nullable=True)
-    mass: Optional[float] = Column(Float, nullable=True)
+    mass: Optional[float] = Column(Float, nullable=True, index=True)
+    monoisotopic_mass: Optional[float] = Column(Float, nullable=True, index=True)
     notes: Optional[str] = Column(String, nullable=True)
-    names: List[CompoundName] = relationship("CompoundName")
-    annotation: List[CompoundAnnotation] = relationship("CompoundAnnotation")
+    names: List[CompoundName] = relationship(
+        "CompoundName", cascade="all, delete-orphan"
+    )
+    annotation: List[CompoundAnnotation] = relationship(
+        "CompoundAnnotation", cascade="all, delete-orphan"
+    )
+    elements: List[CompoundElement] = relationship(
+        "CompoundElement", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         """Return a string representation of the object."""
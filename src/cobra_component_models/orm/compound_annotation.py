@@ -37,7 +37,9 @@ class CompoundAnnotation(AnnotationMixin, Base):
 
     __tablename__ = "compound_annotations"
 
-    compound_id: int = Column(Integer, ForeignKey("compounds.id"), nullable=False)
+    compound_id: int = Column(
+        Integer, ForeignKey("compounds.id", ondelete="CASCADE"), nullable=False
+    )
 
     __table_args__ = (UniqueConstraint("compound_id", "namespace_id", "identifier"),)
 
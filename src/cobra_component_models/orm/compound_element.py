@@ -0,0 +1,62 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a compound element count ORM model."""
+
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, UniqueConstraint
+
+from .base import Base
+
+
+class CompoundElement(Base):
+    """
+    Define a compound element count ORM model.
+
+    The element counts are derived from a compound's chemical formula. Storing them
+    as rows allows for indexed queries, for example, on all compounds containing
+    at least two phosphorus atoms.
+
+    Attributes
+    ----------
+    compound_id : int
+        The compound containing the element.
+    element : str
+        The element symbol, e.g., 'C'. Generic groups such as 'R' are included.
+    count : int
+        The number of atoms of the element in the compound.
+
+    """
+
+    __tablename__ = "compound_elements"
+
+    compound_id: int = Column(
+        Integer, ForeignKey("compounds.id", ondelete="CASCADE"), nullable=False
+    )
+    element: str = Column(String(3), nullable=False)
+    count: int = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("compound_id", "element"),
+        Index("ix_compound_elements_element_count", "element", "count"),
+    )
+
+    def __repr__(self):
+        """Return a string representation of the object."""
+        return (
+            f"{type(self).__name__}(compound={self.compound_id}, "
+            f"element={self.element}, "
+            f"count={self.count})"
+        )
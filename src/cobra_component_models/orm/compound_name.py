@@ -35,7 +35,9 @@ class CompoundName(NameMixin, Base):
 
     __tablename__ = "compound_names"
 
-    compound_id: int = Column(Integer, ForeignKey("compounds.id"), nullable=False)
+    compound_id: int = Column(
+        Integer, ForeignKey("compounds.id", ondelete="CASCADE"), nullable=False
+    )
 
     __table_args__ = (UniqueConstraint("compound_id", "namespace_id", "name"),)
 
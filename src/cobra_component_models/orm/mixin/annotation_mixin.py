@@ -55,7 +55,7 @@ class AnnotationMixin:
     @declared_attr
     def namespace_id(cls):
         """Defer the namespace id field instantiation."""
-        return Column(Integer, ForeignKey("namespaces.id"), nullable=False)
+        return Column(Integer, ForeignKey("namespaces.id"), nullable=False, index=True)
 
     @declared_attr
     def namespace(cls):
@@ -65,7 +65,9 @@ class AnnotationMixin:
     @declared_attr
     def biology_qualifier_id(cls):
         """Defer the biology qualifier id field instantiation."""
-        return Column(Integer, ForeignKey("biology_qualifiers.id"), nullable=False)
+        return Column(
+            Integer, ForeignKey("biology_qualifiers.id"), nullable=False, index=True
+        )
 
     @declared_attr
     def biology_qualifier(cls):
@@ -49,7 +49,7 @@ class NameMixin:
         """Defer the namespace id field instantiation."""
         # Some names do not come from a specific namespace, e.g.,
         # some compartment names are simply invented without source.
-        return Column(Integer, ForeignKey("namespaces.id"), nullable=True)
+        return Column(Integer, ForeignKey("namespaces.id"), nullable=True, index=True)
 
     @declared_attr
     def namespace(cls):
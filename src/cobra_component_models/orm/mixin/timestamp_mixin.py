@@ -43,8 +43,8 @@ class TimestampMixin:
     """
 
     created_on: datetime = Column(
-        DateTime(timezone=True), nullable=False, default=timezone_aware_now
+        DateTime(timezone=True), nullable=False, default=timezone_aware_now, index=True
     )
     updated_on: datetime = Column(
-        DateTime(timezone=True), nullable=True, onupdate=timezone_aware_now
+        DateTime(timezone=True), nullable=True, onupdate=timezone_aware_now, index=True
     )
@@ -18,7 +18,7 @@
 
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -38,16 +38,32 @@ class Participant(Base):
 
     __tablename__ = "participants"
 
-    reaction_id: int = Column(Integer, ForeignKey("reactions.id"), nullable=False)
-    compound_id: int = Column(Integer, ForeignKey("compounds.id"), nullable=False)
+    reaction_id: int = Column(
+        Integer,
+        ForeignKey("reactions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    compound_id: int = Column(
+        Integer, ForeignKey("compounds.id", ondelete="RESTRICT"), nullable=False
+    )
     compound: Compound = relationship("Compound")
     stoichiometry: str = Column(String, nullable=False)
     is_product: bool = Column(Boolean, nullable=False)
     compartment_id: Optional[int] = Column(
-        Integer, ForeignKey("compartments.id"), nullable=True
+        Integer,
+        ForeignKey("compartments.id", ondelete="RESTRICT"),
+        nullable=True,
+        index=True,
     )
     compartment: Compartment = relationship("Compartment")
 
+    # The composite index serves lookups by compound as well as the reverse lookup
+    # of the reactions that a compound participates in.
+    __table_args__ = (
+        Index("ix_participants_compound_id_reaction_id", "compound_id", "reaction_id"),
+    )
+
     def __repr__(self):
         """Return a string representation of the object."""
         return (
@@ -35,7 +35,9 @@ class ReactionAnnotation(AnnotationMixin, Base):
 
     __tablename__ = "reaction_annotations"
 
-    reaction_id: int = Column(Integer, ForeignKey("reactions.id"), nullable=False)
+    reaction_id: int = Column(
+        Integer, ForeignKey("reactions.id", ondelete="CASCADE"), nullable=False
+    )
 
     __table_args__ = (UniqueConstraint("reaction_id", "namespace_id", "identifier"),)
 
@@ -0,0 +1,458 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a scheduler that ingests many component files in parallel."""
+
+
+import json
+import logging
+import pickle
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import chain, count
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from pydantic import ValidationError
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import MANYTOONE, ONETOMANY
+
+from ..builder import CompartmentBuilder, CompoundBuilder, ReactionBuilder
+from ..helpers import expunge_components, reset_sequences
+from ..io import AbstractBaseModel, CompartmentModel, CompoundModel, ReactionModel
+from ..orm import (
+    Base,
+    BiologyQualifier,
+    Compartment,
+    Compound,
+    Namespace,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# The order in which the kinds of component are written since later kinds refer to
+# earlier ones.
+SECTIONS: Tuple[Tuple[str, type], ...] = (
+    ("compartments", CompartmentModel),
+    ("compounds", CompoundModel),
+    ("reactions", ReactionModel),
+)
+
+
+class IngestionProgress(NamedTuple):
+    """
+    Define the progress of an ingestion after writing one section of a file.
+
+    Attributes
+    ----------
+    section : str
+        One of 'compartments', 'compounds', or 'reactions'.
+    path : pathlib.Path
+        The file whose section was written.
+    num_components : int
+        The number of components written from that section.
+    num_done : int
+        The number of sections written so far.
+    num_total : int
+        The total number of sections, i.e., three per file.
+
+    """
+
+    section: str
+    path: Path
+    num_components: int
+    num_done: int
+    num_total: int
+
+
+class ParsedFile(NamedTuple):
+    """
+    Define the identifiers that a parsed file provides and refers to.
+
+    Attributes
+    ----------
+    compartments : set of str
+        The identifiers of the file's compartments.
+    compounds : set of str
+        The identifiers of the file's compounds.
+    compartment_references : set of str
+        The identifiers of the compartments in which reaction participants are
+        located.
+    compound_references : set of str
+        The identifiers of the compounds that participate in reactions.
+
+    """
+
+    compartments: Set[str]
+    compounds: Set[str]
+    compartment_references: Set[str]
+    compound_references: Set[str]
+
+
+def parse_file(path: Path, directory: Path, index: int) -> ParsedFile:
+    """
+    Parse and validate a JSON components file and store its sections.
+
+    This function runs in the worker processes. The file is parsed once and each
+    validated section is pickled to its own file in the given directory such that
+    the writer only ever loads one section at a time.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        A JSON file that follows the `ComponentsModel` schema.
+    directory : pathlib.Path
+        The directory in which the validated sections are stored.
+    index : int
+        The position of the file among all ingested files.
+
+    Returns
+    -------
+    ParsedFile
+        The identifiers that the file provides and refers to.
+
+    Raises
+    ------
+    ValueError
+        If any component of the file is invalid.
+
+    """
+    with Path(path).open() as handle:
+        obj = json.load(handle)
+    ids = {}
+    references = (set(), set())
+    for section, model in SECTIONS:
+        try:
+            models = {
+                id: model.parse_obj(data)
+                for id, data in (obj.pop(section, None) or {}).items()
+            }
+        except ValidationError as error:
+            # Pydantic errors cannot necessarily be pickled to the parent process.
+            raise ValueError(f"Invalid {section} in '{path}':\n{error}") from None
+        with _section_path(directory, index, section).open("wb") as handle:
+            pickle.dump(models, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        ids[section] = set(models)
+        if section == "reactions":
+            for reaction in models.values():
+                for compound_id, part in chain(
+                    reaction.reactants.items(), reaction.products.items()
+                ):
+                    references[0].add(part.compartment)
+                    references[1].add(compound_id)
+    return ParsedFile(ids["compartments"], ids["compounds"], *references)
+
+
+def _section_path(directory: Path, index: int, section: str) -> Path:
+    """Return the path of a stored section."""
+    return Path(directory) / f"{index}-{section}.pickle"
+
+
+class IngestionScheduler:
+    """
+    Define a scheduler that ingests many component files in parallel.
+
+    Parsing and validation of the files run in a pool of worker processes, each
+    file being parsed once, while the calling process is the single writer to the
+    database. All compartments are written first, followed by all compounds, and
+    finally all reactions, since reactions refer to compartments and compounds by
+    their identifiers. Within each kind, files are written in the given order.
+    Component identifiers are shared across files; the first occurrence of an
+    identifier wins and later duplicates are skipped with a warning.
+
+    At most `max_pending` files are submitted to the pool at a time. Validated
+    sections wait on disk rather than in memory until the writer reaches them.
+    Nothing is written before all files are parsed and every compartment and
+    compound that reactions refer to is known, either from the files or from
+    previous runs of the scheduler.
+
+    The writer bypasses the ORM's unit of work. It assigns primary keys itself and
+    inserts the components and their children with bulk statements. It must thus
+    be the only writer to the database while it runs. Identifiers are registered
+    with the primary keys of their components only, such that the written
+    components need not be kept in memory.
+
+    """
+
+    def __init__(
+        self,
+        session,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        chunk_size: int = 500,
+        progress: Optional[Callable[[IngestionProgress], None]] = None,
+        executor: Optional[Executor] = None,
+        **kwargs,
+    ):
+        """
+        Initialize an ingestion scheduler.
+
+        Parameters
+        ----------
+        session : sqlalchemy.orm.Session
+            A SQLAlchemy session giving access to a database that already contains
+            the namespaces and biology qualifiers.
+        max_workers : int, optional
+            The number of worker processes (default the number of CPUs).
+        max_pending : int, optional
+            The maximum number of files that are submitted to the pool at a time
+            (default twice the number of workers, or 4 if that is not given).
+        chunk_size : int, optional
+            The number of components built and inserted at once, and of referenced
+            components loaded per query (default 500).
+        progress : callable, optional
+            Called with an `IngestionProgress` after each written section.
+        executor : concurrent.futures.Executor, optional
+            Use an existing executor instead of creating a process pool. It is not
+            shut down by the scheduler.
+
+        Other Parameters
+        ----------------
+        kwargs
+            Passed on to super class init method.
+
+        """
+        super().__init__(**kwargs)
+        self.session = session
+        self.max_workers = max_workers
+        if max_pending is None:
+            max_pending = 2 * (max_workers or 2)
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.executor = executor
+        # Map the identifiers of written components to their primary keys.
+        self.id2compartment: Dict[str, int] = {}
+        self.id2compound: Dict[str, int] = {}
+        self.id2reaction: Dict[str, int] = {}
+
+    def run(self, paths: Iterable[Path]) -> Dict[str, int]:
+        """
+        Ingest the components of all given files.
+
+        Parameters
+        ----------
+        paths : iterable of pathlib.Path
+            JSON files that follow the `ComponentsModel` schema.
+
+        Returns
+        -------
+        dict
+            The number of written components per section.
+
+        Raises
+        ------
+        ValueError
+            If any component is invalid or reactions refer to unknown compartments
+            or compounds. The message lists all of the missing identifiers.
+
+        """
+        paths = [Path(p) for p in paths]
+        with TemporaryDirectory(prefix="ingestion-") as directory:
+            if self.executor is not None:
+                return self._run(self.executor, paths, Path(directory))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                return self._run(executor, paths, Path(directory))
+
+    def _run(self, executor: Executor, paths: list, directory: Path) -> Dict[str, int]:
+        """Parse the files in the pool and write their sections in order."""
+        kwargs = {
+            "biology_qualifiers": BiologyQualifier.get_map(self.session),
+            "namespaces": Namespace.get_map(self.session),
+        }
+        parsed: List[ParsedFile] = []
+        pending: Deque[Future] = deque()
+        for index in range(len(paths)):
+            if len(pending) >= self.max_pending:
+                parsed.append(pending.popleft().result())
+            pending.append(executor.submit(parse_file, paths[index], directory, index))
+        while pending:
+            parsed.append(pending.popleft().result())
+        self._check_references(parsed)
+        counts = {section: 0 for section, _ in SECTIONS}
+        steps = count(1)
+        for section, _ in SECTIONS:
+            for index in range(len(paths)):
+                counts[section] += self._write(
+                    kwargs, section, paths, directory, index, steps
+                )
+        reset_sequences(self.session)
+        self.session.commit()
+        return counts
+
+    def _write(
+        self,
+        kwargs: dict,
+        section: str,
+        paths: List[Path],
+        directory: Path,
+        index: int,
+        steps: Iterator[int],
+    ) -> int:
+        """Build the ORM instances of one parsed section and insert them in bulk."""
+        stored = _section_path(directory, index, section)
+        with stored.open("rb") as handle:
+            models: Dict[str, AbstractBaseModel] = pickle.load(handle)
+        stored.unlink()
+        path = paths[index]
+        registry = getattr(self, f"id2{section[:-1]}")
+        unique = {}
+        for id, model in models.items():
+            if id in registry:
+                logger.warning(
+                    "Skipping duplicate %s '%s' in '%s'.", section[:-1], id, path
+                )
+                continue
+            unique[id] = model
+        builder = self._make_builder(section, unique.values(), kwargs)
+        ids = list(unique)
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start : start + self.chunk_size]
+            instances = [builder.build_orm(unique[id]) for id in chunk]
+            for id, instance, primary_key in zip(
+                chunk, instances, count(_next_id(self.session, type(instances[0])))
+            ):
+                instance.id = primary_key
+                registry[id] = primary_key
+            _bulk_insert(self.session, instances)
+        self.session.commit()
+        expunge_components(self.session)
+        num_done = next(steps)
+        num_total = len(SECTIONS) * len(paths)
+        logger.info(
+            "Wrote %d %s from '%s' (%d/%d).",
+            len(unique),
+            section,
+            path,
+            num_done,
+            num_total,
+        )
+        if self.progress is not None:
+            self.progress(
+                IngestionProgress(section, path, len(unique), num_done, num_total)
+            )
+        return len(unique)
+
+    def _check_references(self, parsed: List[ParsedFile]) -> None:
+        """Ensure that all references of reactions can be resolved."""
+        missing_compartments = (
+            set()
+            .union(*(p.compartment_references for p in parsed))
+            .difference(self.id2compartment, *(p.compartments for p in parsed))
+        )
+        missing_compounds = (
+            set()
+            .union(*(p.compound_references for p in parsed))
+            .difference(self.id2compound, *(p.compounds for p in parsed))
+        )
+        if missing_compounds or missing_compartments:
+            raise ValueError(
+                f"The reactions refer to {len(missing_compounds)} unknown compound(s) "
+                f"and {len(missing_compartments)} unknown compartment(s). "
+                f"Compounds: {', '.join(sorted(missing_compounds))}. "
+                f"Compartments: {', '.join(sorted(missing_compartments))}."
+            )
+
+    def _make_builder(self, section: str, models: Iterable, kwargs: dict):
+        """Create the builder of a section loading the referenced components."""
+        if section == "compartments":
+            return CompartmentBuilder(**kwargs)
+        if section == "compounds":
+            return CompoundBuilder(**kwargs)
+        compound_ids = set()
+        compartment_ids = set()
+        for model in models:
+            for compound_id, part in chain(
+                model.reactants.items(), model.products.items()
+            ):
+                compound_ids.add(compound_id)
+                compartment_ids.add(part.compartment)
+        return ReactionBuilder(
+            id2compartment=_load(
+                self.session,
+                Compartment,
+                self.id2compartment,
+                compartment_ids,
+                self.chunk_size,
+            ),
+            id2compound=_load(
+                self.session, Compound, self.id2compound, compound_ids, self.chunk_size
+            ),
+            **kwargs,
+        )
+
+
+def _load(
+    session, cls: type, registry: Dict[str, int], ids: set, chunk_size: int
+) -> Dict[str, Base]:
+    """Load the primary keys of registered components as ORM instances."""
+    keys = {registry[id]: id for id in ids if id in registry}
+    ordered = sorted(keys)
+    result = {}
+    for start in range(0, len(ordered), chunk_size):
+        query = (
+            session.query(cls)
+            .options(load_only("id"))
+            .filter(cls.id.in_(ordered[start : start + chunk_size]))
+        )
+        result.update((keys[instance.id], instance) for instance in query)
+    return result
+
+
+def _next_id(session, cls: type) -> int:
+    """Return the next free primary key of a component table."""
+    return (session.execute(select([func.max(cls.id)])).scalar() or 0) + 1
+
+
+def _bulk_insert(session, instances: List[Base]) -> None:
+    """Insert components and their children with one bulk statement per table."""
+    by_class: Dict[type, List[Base]] = {}
+    for instance in instances:
+        _collect(instance, by_class)
+    for objects in by_class.values():
+        session.bulk_save_objects(objects)
+
+
+def _collect(instance: Base, by_class: Dict[type, List[Base]]) -> None:
+    """Set the foreign keys of an instance and collect it with its children."""
+    mapper = inspect(instance).mapper
+    for relationship in mapper.relationships:
+        if relationship.direction is MANYTOONE:
+            related = getattr(instance, relationship.key)
+            if related is not None:
+                for local, remote in relationship.local_remote_pairs:
+                    setattr(instance, local.key, getattr(related, remote.key))
+    by_class.setdefault(type(instance), []).append(instance)
+    for relationship in mapper.relationships:
+        if relationship.direction is ONETOMANY:
+            for child in getattr(instance, relationship.key):
+                for local, remote in relationship.local_remote_pairs:
+                    setattr(child, remote.key, getattr(instance, local.key))
+                _collect(child, by_class)
@@ -0,0 +1,256 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide loading of MetaNetX tables into a database in bounded memory."""
+
+
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, select
+
+from ..builder import CompartmentBuilder, CompoundBuilder, ReactionBuilder
+from ..builder.compound_builder import STRUCTURE_COLUMNS
+from ..helpers import expunge_components
+from ..io import AbstractBaseModel, CompartmentModel, ReactionModel
+from ..io.metanetx import iter_batches, iter_chem_prop, iter_chem_xref, iter_reac_prop
+from ..orm import (
+    BiologyQualifier,
+    Compartment,
+    CompartmentAnnotation,
+    Namespace,
+    ReactionAnnotation,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# The namespaces whose identifiers link MetaNetX tables with each other.
+REQUIRED_NAMESPACES = ("metanetx.chemical", "metanetx.compartment", "metanetx.reaction")
+
+
+def load_metanetx(
+    session,
+    chem_prop: Optional[Path] = None,
+    chem_xref: Optional[Path] = None,
+    reac_prop: Optional[Path] = None,
+    batch_size: int = 10000,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Load MetaNetX tables into the database in batches of rows.
+
+    Compounds of ``chem_prop.tsv`` and the cross-references of ``chem_xref.tsv``
+    are merged by their 'metanetx.chemical' identifier using
+    `CompoundBuilder.upsert`. Reactions of ``reac_prop.tsv`` that are not in the
+    database yet are added; their compartments are created as needed with a
+    'metanetx.compartment' annotation. Each batch is committed and expunged from
+    the session, such that at most `batch_size` rows are held in memory. Loading
+    the same tables again does not duplicate any components.
+
+    Annotation in namespaces that are not in the database is skipped. Identifiers
+    of namespaces whose pattern requires an embedded prefix, e.g., 'CHEBI:15377',
+    are prefixed accordingly.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database that contains the
+        biology qualifiers and at least the 'metanetx.chemical',
+        'metanetx.compartment', and 'metanetx.reaction' namespaces.
+    chem_prop : pathlib.Path, optional
+        The compound properties table.
+    chem_xref : pathlib.Path, optional
+        The compound cross-references table.
+    reac_prop : pathlib.Path, optional
+        The reaction properties table.
+    batch_size : int, optional
+        The number of rows loaded per transaction (default 10000).
+    progress : callable, optional
+        Called with the table name and the number of rows loaded after each
+        batch.
+
+    Returns
+    -------
+    dict
+        The number of loaded rows per table.
+
+    Raises
+    ------
+    ValueError
+        If a required namespace is missing or reactions refer to unknown
+        compounds.
+
+    """
+    namespaces = Namespace.get_map(session)
+    missing = [prefix for prefix in REQUIRED_NAMESPACES if prefix not in namespaces]
+    if missing:
+        raise ValueError(
+            f"The database lacks the required namespace(s) {', '.join(missing)}."
+        )
+    kwargs = {
+        "biology_qualifiers": BiologyQualifier.get_map(session),
+        "namespaces": namespaces,
+    }
+    counts = {}
+    for table, path, reader in [
+        ("chem_prop", chem_prop, iter_chem_prop),
+        ("chem_xref", chem_xref, iter_chem_xref),
+    ]:
+        if path is None:
+            continue
+        counts[table] = 0
+        builder = CompoundBuilder(**kwargs)
+        with Path(path).open() as handle:
+            for batch in iter_batches(reader(handle), batch_size):
+                builder.upsert(
+                    session,
+                    [_clean_annotation(model, namespaces) for model in batch],
+                    match_on="metanetx.chemical",
+                )
+                counts[table] += _commit(session, table, len(batch), progress)
+    if reac_prop is not None:
+        counts["reac_prop"] = 0
+        with Path(reac_prop).open() as handle:
+            for batch in iter_batches(iter_reac_prop(handle), batch_size):
+                _add_reactions(session, batch, kwargs)
+                counts["reac_prop"] += _commit(
+                    session, "reac_prop", len(batch), progress
+                )
+    return counts
+
+
+def _add_reactions(session, batch: List[ReactionModel], kwargs: dict) -> None:
+    """Add the reactions of a batch that are not in the database yet."""
+    namespaces = kwargs["namespaces"]
+    existing = _select_identifiers(
+        session,
+        ReactionAnnotation,
+        namespaces["metanetx.reaction"],
+        [model.id for model in batch],
+    )
+    batch = [model for model in batch if model.id not in existing]
+    builder = ReactionBuilder(**kwargs)
+    builder.id2compartment.update(_get_compartments(session, batch, kwargs))
+    builder.resolve_participants(
+        session,
+        batch,
+        compound_namespace="metanetx.chemical",
+        compartment_namespace="metanetx.compartment",
+    )
+    session.add_all(
+        builder.build_orm(_clean_annotation(model, namespaces)) for model in batch
+    )
+
+
+def _get_compartments(
+    session, batch: Iterable[ReactionModel], kwargs: dict
+) -> Dict[str, Compartment]:
+    """Return the compartments of a batch of reactions creating missing ones."""
+    identifiers = {
+        part.compartment
+        for model in batch
+        for part in list(model.reactants.values()) + list(model.products.values())
+    }
+    namespace = kwargs["namespaces"]["metanetx.compartment"]
+    query = (
+        session.query(CompartmentAnnotation.identifier, Compartment)
+        .join(Compartment, CompartmentAnnotation.compartment_id == Compartment.id)
+        .filter(
+            CompartmentAnnotation.namespace_id == namespace.id,
+            CompartmentAnnotation.identifier.in_(sorted(identifiers)),
+        )
+    )
+    result = {identifier: compartment for identifier, compartment in query}
+    builder = CompartmentBuilder(**kwargs)
+    for identifier in sorted(identifiers.difference(result)):
+        compartment = builder.build_orm(
+            CompartmentModel.parse_obj(
+                {
+                    "id": identifier,
+                    "annotation": {
+                        "metanetx.compartment": [
+                            {"biologyQualifier": "is", "identifier": identifier}
+                        ]
+                    },
+                }
+            )
+        )
+        session.add(compartment)
+        result[identifier] = compartment
+    return result
+
+
+def _select_identifiers(session, annotation_cls, namespace, identifiers) -> set:
+    """Select which of the identifiers are annotated in the namespace."""
+    query = select([annotation_cls.identifier]).where(
+        and_(
+            annotation_cls.namespace_id == namespace.id,
+            annotation_cls.identifier.in_(sorted(set(identifiers))),
+        )
+    )
+    return {identifier for identifier, in session.execute(query)}
+
+
+def _clean_annotation(
+    model: AbstractBaseModel, namespaces: Dict[str, Namespace]
+) -> AbstractBaseModel:
+    """Drop names and annotation in unknown namespaces and embed prefixes."""
+    annotation = {}
+    for prefix, annotation_models in model.annotation.items():
+        if prefix in STRUCTURE_COLUMNS:
+            annotation[prefix] = annotation_models
+            continue
+        namespace = namespaces.get(prefix)
+        if namespace is None:
+            logger.debug("Skipping annotation in unknown namespace '%s'.", prefix)
+            continue
+        annotation[prefix] = [
+            ann.copy(update={"identifier": _embed_prefix(namespace, ann.identifier)})
+            for ann in annotation_models
+        ]
+    names = {
+        prefix: name_models
+        for prefix, name_models in model.names.items()
+        if prefix in namespaces
+    }
+    return model.copy(update={"annotation": annotation, "names": names})
+
+
+def _embed_prefix(namespace: Namespace, identifier: str) -> str:
+    """Add the embedded prefix to an identifier if its namespace requires it."""
+    if namespace.compiled_pattern.match(identifier) is not None:
+        return identifier
+    embedded = f"{namespace.prefix.upper()}:{identifier}"
+    if namespace.compiled_pattern.match(embedded) is not None:
+        return embedded
+    return identifier
+
+
+def _commit(
+    session,
+    table: str,
+    num_rows: int,
+    progress: Optional[Callable[[str, int], None]],
+) -> int:
+    """Commit a batch, release its instances, and report progress."""
+    session.commit()
+    expunge_components(session)
+    logger.info("Loaded %d rows of %s.", num_rows, table)
+    if progress is not None:
+        progress(table, num_rows)
+    return num_rows
@@ -0,0 +1,431 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a bulk import of SBML documents into the component database."""
+
+
+import logging
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from sqlalchemy import and_, or_
+
+from ..builder import CompartmentBuilder, CompoundBuilder, ReactionBuilder
+from ..builder.compound_builder import STRUCTURE_COLUMNS
+from ..helpers import expunge_components
+from ..io import CompoundModel, MiriamIndex, SBMLDocument, read_sbml
+from ..orm import Base, BiologyQualifier, Compartment, Compound, Namespace, Reaction
+
+
+logger = logging.getLogger(__name__)
+
+
+# Biology qualifiers of annotation that identifies a component rather than, e.g.,
+# a parent class or an EC number that several reactions share.
+IDENTITY_QUALIFIERS = ("is", "bqm_is")
+# Namespaces whose identifiers identify a component, in order of preference.
+COMPARTMENT_MATCH_ON = ("go", "cco", "metanetx.compartment", "bigg.compartment")
+COMPOUND_MATCH_ON = (
+    "inchikey",
+    "inchi",
+    "metanetx.chemical",
+    "chebi",
+    "bigg.metabolite",
+    "kegg.compound",
+    "seed.compound",
+    "hmdb",
+)
+REACTION_MATCH_ON = (
+    "rhea",
+    "metanetx.reaction",
+    "bigg.reaction",
+    "kegg.reaction",
+    "seed.reaction",
+)
+
+
+def make_miriam_index(session) -> MiriamIndex:
+    """Return an index of the database's namespaces and structure identifiers."""
+    namespaces = {
+        prefix: namespace.embedded_prefix
+        for prefix, namespace in Namespace.get_map(session).items()
+    }
+    # InChI and InChIKey annotation is stored as compound structure.
+    for prefix in ("inchi", "inchikey"):
+        namespaces.setdefault(prefix, False)
+    return MiriamIndex(namespaces)
+
+
+def import_sbml(
+    session,
+    paths: Iterable[Path],
+    name_prefix: Optional[str] = None,
+    match_on: Union[str, Sequence[str]] = COMPOUND_MATCH_ON,
+    reaction_match_on: Union[str, Sequence[str]] = REACTION_MATCH_ON,
+    compartment_match_on: Union[str, Sequence[str]] = COMPARTMENT_MATCH_ON,
+    max_workers: int = 1,
+    progress: Optional[Callable[[Path, Dict[str, int]], None]] = None,
+) -> Dict[str, int]:
+    """
+    Import the compartments, species, and reactions of SBML documents.
+
+    Documents are parsed incrementally, in worker processes if requested, while
+    the calling process writes one document per transaction. MIRIAM URIs are
+    mapped onto the database's namespaces with a `MiriamIndex` computed once.
+    Components are matched with existing ones such that repeated imports are
+    idempotent. Only annotation with an identity qualifier, i.e., 'is' or
+    'bqm_is', in one of the given namespaces counts as a match; shared EC numbers
+    or parent classes do not. Compartments and reactions are reused or skipped,
+    respectively, when they share such an identifier with an existing component.
+    Species are merged into existing compounds with `CompoundBuilder.upsert` on
+    the first of the `match_on` namespaces in which they have an identifier.
+    Components without any such annotation are matched by their names in the
+    `name_prefix` namespace and are otherwise always inserted.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database that contains the
+        namespaces and biology qualifiers.
+    paths : iterable of pathlib.Path
+        The SBML documents.
+    name_prefix : str, optional
+        The prefix of the namespace in which the names of components are stored
+        (default omit names).
+    match_on : str or sequence of str, optional
+        The namespaces, including 'inchikey' and 'inchi', by which species are
+        matched with existing compounds in order of preference (default
+        `COMPOUND_MATCH_ON`).
+    reaction_match_on : str or sequence of str, optional
+        The namespaces by which reactions are matched. Reactions with an identifier
+        in these namespaces that exists in the database are skipped (default
+        `REACTION_MATCH_ON`). An empty sequence disables matching by annotation.
+    compartment_match_on : str or sequence of str, optional
+        The namespaces by which compartments are matched (default
+        `COMPARTMENT_MATCH_ON`).
+    max_workers : int, optional
+        The number of worker processes that parse documents (default 1, i.e.,
+        parse in the calling process).
+    progress : callable, optional
+        Called with the path and the counts of each imported document.
+
+    Returns
+    -------
+    dict
+        The number of imported documents, compartments, species, and reactions.
+
+    Raises
+    ------
+    ValueError
+        If the name namespace is unknown.
+
+    """
+    kwargs = {
+        "biology_qualifiers": BiologyQualifier.get_map(session),
+        "namespaces": Namespace.get_map(session),
+    }
+    if name_prefix is not None and name_prefix not in kwargs["namespaces"]:
+        raise ValueError(f"The name namespace '{name_prefix}' is unknown.")
+    match_on = {
+        "compartments": _prefixes(compartment_match_on),
+        "compounds": _prefixes(match_on),
+        "reactions": _prefixes(reaction_match_on),
+    }
+    index = make_miriam_index(session)
+    counts = {"documents": 0, "compartments": 0, "compounds": 0, "reactions": 0}
+    paths = [Path(p) for p in paths]
+    if max_workers <= 1:
+        _import(
+            session,
+            _parse(paths, index, name_prefix),
+            counts,
+            progress,
+            kwargs,
+            match_on,
+            name_prefix,
+        )
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            _import(
+                session,
+                _parse_ahead(executor, paths, index, name_prefix, 2 * max_workers),
+                counts,
+                progress,
+                kwargs,
+                match_on,
+                name_prefix,
+            )
+    return counts
+
+
+def _parse(
+    paths: Iterable[Path], index: MiriamIndex, name_prefix: Optional[str]
+) -> Iterator[Tuple[Path, SBMLDocument]]:
+    """Parse documents one after the other."""
+    for path in paths:
+        yield path, read_sbml(path, index, name_prefix)
+
+
+def _parse_ahead(
+    executor: Executor,
+    paths: List[Path],
+    index: MiriamIndex,
+    name_prefix: Optional[str],
+    max_pending: int,
+) -> Iterator[Tuple[Path, SBMLDocument]]:
+    """Parse documents in a pool keeping at most `max_pending` ahead in order."""
+    pending: Deque[Tuple[Path, Future]] = deque()
+    for path in paths:
+        if len(pending) >= max_pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+        pending.append((path, executor.submit(read_sbml, path, index, name_prefix)))
+    while pending:
+        done, future = pending.popleft()
+        yield done, future.result()
+
+
+def _import(
+    session,
+    documents: Iterable[Tuple[Path, SBMLDocument]],
+    counts: Dict[str, int],
+    progress: Optional[Callable[[Path, Dict[str, int]], None]],
+    kwargs: dict,
+    match_on: Dict[str, List[str]],
+    name_prefix: Optional[str],
+) -> None:
+    """Write each document in its own transaction."""
+    for path, document in documents:
+        try:
+            document_counts = _write(session, document, kwargs, match_on, name_prefix)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        expunge_components(session)
+        logger.info("Imported '%s' with %r.", path, document_counts)
+        counts["documents"] += 1
+        for key, value in document_counts.items():
+            counts[key] += value
+        if progress is not None:
+            progress(path, document_counts)
+
+
+def _write(
+    session,
+    document: SBMLDocument,
+    kwargs: dict,
+    match_on: Dict[str, List[str]],
+    name_prefix: Optional[str],
+) -> Dict[str, int]:
+    """Add the components of one document to the session."""
+    id2compartment = _match_existing(
+        session,
+        Compartment,
+        document.compartments.values(),
+        kwargs,
+        match_on["compartments"],
+        name_prefix,
+    )
+    builder = CompartmentBuilder(**kwargs)
+    for id, model in document.compartments.items():
+        if id not in id2compartment:
+            id2compartment[id] = builder.build_orm(model)
+            session.add(id2compartment[id])
+    id2compound = _upsert_compounds(
+        session, document, kwargs, match_on["compounds"], name_prefix
+    )
+    existing = _match_existing(
+        session,
+        Reaction,
+        document.reactions.values(),
+        kwargs,
+        match_on["reactions"],
+        name_prefix,
+    )
+    reactions = [
+        model for id, model in document.reactions.items() if id not in existing
+    ]
+    builder = ReactionBuilder(
+        id2compartment=id2compartment, id2compound=id2compound, **kwargs
+    )
+    session.add_all([builder.build_orm(model) for model in reactions])
+    return {
+        "compartments": len(id2compartment),
+        "compounds": len(id2compound),
+        "reactions": len(reactions),
+    }
+
+
+def _prefixes(match_on: Union[str, Sequence[str]]) -> List[str]:
+    """Return a single namespace prefix or a sequence of them as a list."""
+    return [match_on] if isinstance(match_on, str) else list(match_on)
+
+
+def _identifiers(model, prefix: str) -> List[str]:
+    """Return the identifiers of a model's identity annotation in a namespace."""
+    return [
+        ann.identifier
+        for ann in model.annotation.get(prefix, [])
+        if ann.biology_qualifier in IDENTITY_QUALIFIERS
+    ]
+
+
+def _upsert_compounds(
+    session,
+    document: SBMLDocument,
+    kwargs: dict,
+    match_on: List[str],
+    name_prefix: Optional[str],
+) -> Dict[str, Compound]:
+    """Merge species into compounds grouped by the namespace they are matched on."""
+    groups: Dict[Optional[str], List[CompoundModel]] = {}
+    for model in document.compounds.values():
+        model = model.copy(update={"annotation": _single_structures(model.annotation)})
+        groups.setdefault(
+            _compound_match_on(model, match_on, kwargs["namespaces"]), []
+        ).append(model)
+    builder = CompoundBuilder(**kwargs)
+    result = {}
+    for prefix, models in groups.items():
+        if prefix is not None:
+            result.update(
+                zip(
+                    (model.id for model in models),
+                    builder.upsert(
+                        session,
+                        models,
+                        match_on=prefix,
+                        qualifiers=IDENTITY_QUALIFIERS,
+                    ),
+                )
+            )
+            continue
+        result.update(
+            _match_existing(session, Compound, models, kwargs, [], name_prefix)
+        )
+        for model in models:
+            if model.id not in result:
+                result[model.id] = builder.build_orm(model)
+                session.add(result[model.id])
+    return {id: result[id] for id in document.compounds}
+
+
+def _compound_match_on(
+    model: CompoundModel, match_on: List[str], namespaces: Dict[str, Namespace]
+) -> Optional[str]:
+    """Return the first namespace in which a compound has identifiers to match."""
+    for prefix in match_on:
+        if not _identifiers(model, prefix):
+            continue
+        if prefix in ("inchi", "inchikey") or (
+            prefix in namespaces and prefix not in STRUCTURE_COLUMNS
+        ):
+            return prefix
+    return None
+
+
+def _match_existing(
+    session,
+    cls: Type[Base],
+    models: Iterable,
+    kwargs: dict,
+    prefixes: List[str],
+    name_prefix: Optional[str],
+) -> Dict[str, Base]:
+    """
+    Map model identifiers onto existing components that share an identifier.
+
+    Models are matched by their identity annotation in the given namespaces.
+    Models without such annotation are matched by their names in the
+    `name_prefix` namespace. The lowest primary key wins.
+
+    """
+    namespaces = kwargs["namespaces"]
+    keys: Dict[Tuple[str, int, str], str] = {}
+    for model in models:
+        annotation = [
+            (namespaces[prefix].id, identifier)
+            for prefix in prefixes
+            if prefix in namespaces
+            for identifier in _identifiers(model, prefix)
+        ]
+        for namespace_id, identifier in annotation:
+            keys.setdefault(("annotation", namespace_id, identifier), model.id)
+        if not annotation and name_prefix is not None:
+            for name in model.names.get(name_prefix, []):
+                keys.setdefault(
+                    ("names", namespaces[name_prefix].id, name.name), model.id
+                )
+    qualifier_ids = [
+        kwargs["biology_qualifiers"][qualifier].id for qualifier in IDENTITY_QUALIFIERS
+    ]
+    result = {}
+    for relationship in ("annotation", "names"):
+        values: Dict[int, List[str]] = {}
+        for kind, namespace_id, value in keys:
+            if kind == relationship:
+                values.setdefault(namespace_id, []).append(value)
+        if not values:
+            continue
+        attribute = getattr(cls, relationship).property.mapper.class_
+        column = (
+            attribute.identifier if relationship == "annotation" else attribute.name
+        )
+        query = (
+            session.query(attribute.namespace_id, column, cls)
+            .select_from(cls)
+            .join(getattr(cls, relationship))
+            .filter(
+                or_(
+                    *(
+                        and_(
+                            attribute.namespace_id == namespace_id,
+                            column.in_(sorted(namespace_values)),
+                        )
+                        for namespace_id, namespace_values in values.items()
+                    )
+                )
+            )
+        )
+        if relationship == "annotation":
+            query = query.filter(attribute.biology_qualifier_id.in_(qualifier_ids))
+        for namespace_id, value, component in query.order_by(cls.id):
+            result.setdefault(keys[relationship, namespace_id, value], component)
+    return result
+
+
+def _single_structures(annotation: dict) -> dict:
+    """Keep only the first structure since compounds store a single one."""
+    return {
+        prefix: annotation_models[:1]
+        if prefix in STRUCTURE_COLUMNS
+        else annotation_models
+        for prefix, annotation_models in annotation.items()
+    }
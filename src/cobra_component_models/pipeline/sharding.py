@@ -0,0 +1,458 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a sharded dump format of components partitioned by primary key ranges."""
+
+
+import hashlib
+import json
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..builder import CompartmentBuilder, CompoundBuilder, ReactionBuilder
+from ..engine import make_engine
+from ..helpers import reset_sequences
+from ..io import ComponentsModel
+from ..orm import BiologyQualifier, Namespace
+from ..query import CoreExporter, get_component_kind
+
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+# Kinds in the order in which they must be imported.
+KINDS = ("compartment", "compound", "reaction")
+
+# Either a database URL, which lets worker processes connect on their own, or an
+# engine or connection to be shared by threads.
+Bind = Union[str, object]
+
+
+class ShardInfo(NamedTuple):
+    """
+    Define the manifest entry of one shard.
+
+    Attributes
+    ----------
+    kind : str
+        One of 'compartment', 'compound', or 'reaction'.
+    path : str
+        The shard's file name relative to the dump directory.
+    first_id : int
+        The smallest primary key in the shard.
+    last_id : int
+        The largest primary key in the shard.
+    count : int
+        The number of components in the shard.
+    sha256 : str
+        The hexadecimal SHA-256 digest of the shard's file.
+
+    """
+
+    kind: str
+    path: str
+    first_id: int
+    last_id: int
+    count: int
+    sha256: str
+
+
+def read_manifest(directory: Path) -> List[ShardInfo]:
+    """
+    Read the shards listed in the manifest of a dump directory.
+
+    Raises
+    ------
+    ValueError
+        If the manifest has an unsupported version.
+
+    """
+    with (Path(directory) / MANIFEST).open() as handle:
+        obj = json.load(handle)
+    if obj.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            f"Unsupported manifest version {obj.get('version')}. Expected "
+            f"{MANIFEST_VERSION}."
+        )
+    return [ShardInfo(**shard) for shard in obj["shards"]]
+
+
+def write_manifest(directory: Path, shards: Iterable[ShardInfo]) -> None:
+    """Write the manifest of a dump directory."""
+    obj = {
+        "version": MANIFEST_VERSION,
+        "shards": [shard._asdict() for shard in shards],
+    }
+    with (Path(directory) / MANIFEST).open("w") as handle:
+        json.dump(obj, handle, indent=2)
+
+
+def export_shards(
+    bind: Bind,
+    directory: Path,
+    shard_size: int = 10000,
+    chunk_size: int = 500,
+    max_workers: int = 1,
+    progress: Optional[Callable[[ShardInfo], None]] = None,
+    profile: Optional[str] = None,
+) -> List[ShardInfo]:
+    """
+    Export all components into shards of consecutive primary keys.
+
+    Each shard is a JSON file following the `ComponentsModel` schema with a single
+    kind of component. Identifiers are primary keys, such that reactions refer to
+    compounds and compartments in other shards. A manifest lists all shards.
+
+    Parameters
+    ----------
+    bind : str or sqlalchemy.engine.Engine or sqlalchemy.engine.Connection
+        A database URL or an engine or connection to export from. With more than
+        one worker, shards are exported in separate processes given a URL, or in
+        threads with a connection each given an engine. Since connections cannot be
+        shared between threads, shards are exported serially given a connection.
+    directory : pathlib.Path
+        The dump directory. It is created if necessary.
+    shard_size : int, optional
+        The maximum number of components per shard (default 10000).
+    chunk_size : int, optional
+        The number of components whose rows are selected at once within a shard
+        (default 500).
+    max_workers : int, optional
+        The number of shards exported concurrently (default 1).
+    progress : callable, optional
+        Called with each `ShardInfo` once the shard is written.
+    profile : str, optional
+        The SQLite profile applied to the engines created from a URL, e.g., by
+        worker processes (default none).
+
+    Returns
+    -------
+    list of ShardInfo
+        The shards in manifest order.
+
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    tasks = []
+    with _connect(bind, profile) as session:
+        for kind in KINDS:
+            for index, (first_id, last_id) in enumerate(
+                _iter_ranges(session, kind, shard_size)
+            ):
+                tasks.append((kind, f"{kind}s-{index:05d}.json", first_id, last_id))
+    shards = _run(
+        _export_shard,
+        [(bind, profile, str(directory), chunk_size, *task) for task in tasks],
+        bind,
+        max_workers,
+        progress,
+    )
+    write_manifest(directory, shards)
+    return shards
+
+
+def import_shards(
+    bind: Bind,
+    directory: Path,
+    max_workers: int = 1,
+    paths: Optional[Iterable[str]] = None,
+    chunk_size: int = 500,
+    progress: Optional[Callable[[ShardInfo], None]] = None,
+    profile: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Import the shards of a dump directory preserving primary keys.
+
+    All shards are verified against their checksums first. The shards of one kind
+    of component may be imported concurrently, each in its own transaction, but
+    all compartments and compounds are imported before any reactions. A shard that
+    failed can thus be imported again alone by passing its path.
+
+    Parameters
+    ----------
+    bind : str or sqlalchemy.engine.Engine or sqlalchemy.engine.Connection
+        A database URL or an engine or connection to import into. The database
+        must already contain the namespaces and biology qualifiers. Concurrency
+        requires a URL or an engine as for `export_shards`.
+    directory : pathlib.Path
+        The dump directory containing the manifest.
+    max_workers : int, optional
+        The number of shards imported concurrently (default 1). SQLite serializes
+        writers; concurrency pays off with database servers.
+    paths : iterable of str, optional
+        Import only the shards with these paths as listed in the manifest (default
+        all).
+    chunk_size : int, optional
+        The number of participants' compounds and compartments resolved per query
+        (default 500).
+    progress : callable, optional
+        Called with each `ShardInfo` once the shard is committed.
+    profile : str, optional
+        The SQLite profile applied to the engines created from a URL as for
+        `export_shards` (default none).
+
+    Returns
+    -------
+    dict
+        The number of imported components per kind.
+
+    Raises
+    ------
+    ValueError
+        If a shard's checksum differs from the manifest or a path is unknown.
+
+    """
+    directory = Path(directory)
+    shards = _select_shards(directory, paths)
+    for shard in shards:
+        if _sha256(directory / shard.path) != shard.sha256:
+            raise ValueError(
+                f"The checksum of shard '{shard.path}' does not match the manifest."
+            )
+    counts = {kind: 0 for kind in KINDS}
+    for kind in KINDS:
+        # Reactions may only be imported once all of their participants exist.
+        kind_shards = [shard for shard in shards if shard.kind == kind]
+        _run(
+            _import_shard,
+            [
+                (bind, profile, str(directory), shard, chunk_size)
+                for shard in kind_shards
+            ],
+            bind,
+            max_workers,
+            progress,
+        )
+        counts[kind] = sum(shard.count for shard in kind_shards)
+    with _connect(bind, profile) as session:
+        reset_sequences(session)
+        session.commit()
+    return counts
+
+
+def verify_shards(
+    directory: Path, paths: Optional[Iterable[str]] = None
+) -> List[ShardInfo]:
+    """
+    Compare the shards of a dump directory with the checksums of the manifest.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The dump directory containing the manifest.
+    paths : iterable of str, optional
+        Verify only the shards with these paths as listed in the manifest (default
+        all).
+
+    Returns
+    -------
+    list of ShardInfo
+        The shards that are missing or whose checksum differs.
+
+    Raises
+    ------
+    ValueError
+        If a path is unknown.
+
+    """
+    directory = Path(directory)
+    return [
+        shard
+        for shard in _select_shards(directory, paths)
+        if not (directory / shard.path).is_file()
+        or _sha256(directory / shard.path) != shard.sha256
+    ]
+
+
+def _select_shards(directory: Path, paths: Optional[Iterable[str]]) -> List[ShardInfo]:
+    """Return the shards of the manifest, optionally restricted to some paths."""
+    shards = read_manifest(directory)
+    if paths is None:
+        return shards
+    paths = set(paths)
+    unknown = paths.difference(shard.path for shard in shards)
+    if unknown:
+        raise ValueError(
+            f"The manifest lists no shard(s) {', '.join(sorted(unknown))}."
+        )
+    return [shard for shard in shards if shard.path in paths]
+
+
+@contextmanager
+def _connect(bind: Bind, profile: Optional[str] = None) -> Iterator[Session]:
+    """Provide a session on a URL, engine, or connection."""
+    engine = make_engine(bind, profile) if isinstance(bind, str) else None
+    session = Session(bind=engine if engine is not None else bind)
+    try:
+        yield session
+    finally:
+        session.close()
+        if engine is not None:
+            engine.dispose()
+
+
+def _run(
+    func: Callable,
+    tasks: list,
+    bind: Bind,
+    max_workers: int,
+    progress: Optional[Callable[[ShardInfo], None]],
+) -> list:
+    """Run shard tasks inline or in a pool and report progress in task order."""
+    if max_workers > 1 and not isinstance(bind, (str, Engine)):
+        # Every worker thread needs its own connection which only a URL or an
+        # engine can provide.
+        logger.warning(
+            "Processing shards serially since a connection cannot be shared "
+            "between workers. Please pass a URL or an engine instead."
+        )
+        max_workers = 1
+    if max_workers <= 1 or len(tasks) <= 1:
+        results = []
+        for task in tasks:
+            results.append(func(*task))
+            _report(results[-1], progress)
+        return results
+    pool: Executor = (
+        ProcessPoolExecutor(max_workers=max_workers)
+        if isinstance(bind, str)
+        else ThreadPoolExecutor(max_workers=max_workers)
+    )
+    with pool:
+        futures = [pool.submit(func, *task) for task in tasks]
+        results = []
+        for future in futures:
+            results.append(future.result())
+            _report(results[-1], progress)
+    return results
+
+
+def _report(shard: ShardInfo, progress: Optional[Callable[[ShardInfo], None]]):
+    """Log and report a finished shard."""
+    logger.info("Finished shard '%s' with %d %ss.", shard.path, shard.count, shard.kind)
+    if progress is not None:
+        progress(shard)
+
+
+def _iter_ranges(session, kind: str, shard_size: int):
+    """Generate the first and last primary keys of consecutive shards."""
+    primary_key = get_component_kind(kind).component.id
+    last = None
+    while True:
+        query = select([primary_key]).order_by(primary_key).limit(shard_size)
+        if last is not None:
+            query = query.where(primary_key > last)
+        ids = [id for id, in session.execute(query)]
+        if not ids:
+            return
+        yield ids[0], ids[-1]
+        last = ids[-1]
+
+
+def _export_shard(
+    bind: Bind,
+    profile: Optional[str],
+    directory: str,
+    chunk_size: int,
+    kind: str,
+    path: str,
+    first_id: int,
+    last_id: int,
+) -> ShardInfo:
+    """Export the components of one primary key range to a shard file."""
+    primary_key = get_component_kind(kind).component.id
+    with _connect(bind, profile) as session:
+        ids = [
+            id
+            for id, in session.execute(
+                select([primary_key]).where(primary_key.between(first_id, last_id))
+            )
+        ]
+        exporter = CoreExporter(session, chunk_size=chunk_size)
+        models = {m.id: m for m in getattr(exporter, f"iter_{kind}s")(ids)}
+    content = ComponentsModel(**{f"{kind}s": models}).json(exclude_defaults=True)
+    content = content.encode("utf-8")
+    (Path(directory) / path).write_bytes(content)
+    return ShardInfo(
+        kind=kind,
+        path=path,
+        first_id=first_id,
+        last_id=last_id,
+        count=len(models),
+        sha256=hashlib.sha256(content).hexdigest(),
+    )
+
+
+def _import_shard(
+    bind: Bind,
+    profile: Optional[str],
+    directory: str,
+    shard: ShardInfo,
+    chunk_size: int,
+) -> ShardInfo:
+    """Import one shard in a single transaction."""
+    components = ComponentsModel.parse_file(Path(directory) / shard.path)
+    models = getattr(components, f"{shard.kind}s")
+    with _connect(bind, profile) as session:
+        kwargs = {
+            "biology_qualifiers": BiologyQualifier.get_map(session),
+            "namespaces": Namespace.get_map(session),
+        }
+        if shard.kind == "compartment":
+            builder = CompartmentBuilder(**kwargs)
+        elif shard.kind == "compound":
+            builder = CompoundBuilder(**kwargs)
+        else:
+            builder = ReactionBuilder(**kwargs)
+            builder.resolve_participants(
+                session, models.values(), chunk_size=chunk_size
+            )
+        try:
+            for id, model in models.items():
+                instance = builder.build_orm(model)
+                instance.id = int(id)
+                session.add(instance)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+    return shard
+
+
+def _sha256(path: Path) -> str:
+    """Return the hexadecimal SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
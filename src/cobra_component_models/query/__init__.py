@@ -0,0 +1,37 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide efficient database queries on components."""
+
+
+from .component_kind import COMPONENT_KINDS, ComponentKind, get_component_kind
+from .core_exporter import CoreExporter
+from .loading import eager_loading_options
+from .pagination import Page, decode_cursor, encode_cursor, paginate
+from .change_feed import Change, iter_changes
+from .compound_clustering import DisjointSet, MergeCluster, cluster_compounds
+from .deletion import delete_components, delete_orphans
+from .reverse_lookup import reactions_for_compounds
+from .snapshot_diff import (
+    ComponentChange,
+    apply_changes,
+    diff_snapshots,
+    iter_snapshot,
+    patch_components,
+    snapshot_key,
+    stable_key,
+)
+from .sbml_export import export_sbml
+from .statistics import DatabaseStatistics, IndexUsage, stats
@@ -0,0 +1,189 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a feed of component changes based on their timestamps."""
+
+
+import heapq
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import func, or_, select, union_all
+
+from ..io import AbstractBaseModel
+from ..orm import Participant
+from .component_kind import ComponentKind, get_component_kind
+from .core_exporter import CoreExporter
+
+
+class Change(NamedTuple):
+    """
+    Define a change of a component.
+
+    Attributes
+    ----------
+    kind : str
+        The kind of the changed component, e.g., 'compound'.
+    timestamp : datetime.datetime
+        The latest moment at which the component or any of its names, annotation,
+        or participants were created or updated.
+    model : cobra_component_models.io.AbstractBaseModel
+        The current state of the component as an IO model.
+
+    """
+
+    kind: str
+    timestamp: datetime
+    model: AbstractBaseModel
+
+    @property
+    def cursor(self) -> Tuple[datetime, str, int]:
+        """Return the position of the change in the feed for resuming it."""
+        return self.timestamp, self.kind, int(self.model.id)
+
+
+def iter_changes(
+    session,
+    since: Union[datetime, Tuple[datetime, str, int], None] = None,
+    kinds: Iterable[str] = ("compartment", "compound", "reaction"),
+    chunk_size: int = 500,
+) -> Iterator[Change]:
+    """
+    Generate the components that changed after a given moment in timestamp order.
+
+    A component counts as changed when its own row or any row of its names,
+    annotation, or (for reactions) participants was created or updated. Finding them
+    uses the indexes on the ``created_on`` and ``updated_on`` columns such that
+    polling for a few recent changes is fast. Since deleted rows leave no trace,
+    deletions are not part of the feed.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    since : datetime.datetime or tuple, optional
+        Only changes strictly after this moment are generated (default all).
+        Alternatively, the `Change.cursor` of the last received change continues
+        the feed without skipping later changes that share its timestamp.
+    kinds : iterable of str, optional
+        The kinds of components to include (default all).
+    chunk_size : int, optional
+        The number of changed components serialized at once (default 500).
+
+    Yields
+    ------
+    Change
+        The kind, timestamp, and current IO model of a changed component.
+
+    """
+    cursor = None
+    if isinstance(since, tuple):
+        cursor = since
+        since = since[0]
+    if since is not None and since.tzinfo is not None:
+        # Timestamps are recorded in UTC.
+        since = since.astimezone(timezone.utc)
+    exporter = CoreExporter(session, chunk_size=chunk_size)
+    streams = [
+        _iter_kind_changes(
+            session,
+            exporter,
+            get_component_kind(kind),
+            since,
+            _after_id(kind, cursor),
+            chunk_size,
+        )
+        for kind in kinds
+    ]
+    yield from heapq.merge(*streams, key=lambda change: change.cursor)
+
+
+def _after_id(kind: str, cursor: Optional[Tuple[datetime, str, int]]) -> Optional[int]:
+    """
+    Return the primary key after which changes at the cursor's moment follow.
+
+    Changes are ordered by timestamp, kind, and primary key. At the cursor's
+    moment, kinds ordered before the cursor's kind were seen completely (None),
+    and kinds ordered after it were not seen at all (0).
+
+    """
+    if cursor is None:
+        return None
+    _, cursor_kind, cursor_id = cursor
+    if kind < cursor_kind:
+        return None
+    if kind == cursor_kind:
+        return cursor_id
+    return 0
+
+
+def _iter_kind_changes(
+    session,
+    exporter: CoreExporter,
+    kind: ComponentKind,
+    since: Optional[datetime],
+    after_id: Optional[int],
+    chunk_size: int,
+) -> Iterator[Change]:
+    """Generate the changes of one kind of component in timestamp order."""
+    tables = [
+        (kind.component, kind.component.id),
+        (kind.name_class, getattr(kind.name_class, kind.foreign_key)),
+        (kind.annotation_class, getattr(kind.annotation_class, kind.foreign_key)),
+    ]
+    if kind.name == "reaction":
+        tables.append((Participant, Participant.reaction_id))
+    selects = []
+    for cls, component_id in tables:
+        query = select(
+            [
+                component_id.label("component_id"),
+                func.coalesce(cls.updated_on, cls.created_on).label("modified"),
+            ]
+        )
+        if since is not None and after_id is None:
+            # Separate conditions on each column allow the use of their indexes.
+            query = query.where(or_(cls.updated_on > since, cls.created_on > since))
+        elif since is not None:
+            query = query.where(or_(cls.updated_on >= since, cls.created_on >= since))
+        selects.append(query)
+    modified = union_all(*selects).alias("modified")
+    timestamp = func.max(modified.c.modified)
+    query = (
+        select([modified.c.component_id, timestamp.label("timestamp")])
+        .group_by(modified.c.component_id)
+        .order_by("timestamp", modified.c.component_id)
+    )
+    if since is not None and after_id is not None:
+        # Components last changed at the cursor's moment follow in key order.
+        query = query.having(or_(timestamp > since, modified.c.component_id > after_id))
+    export = getattr(exporter, f"iter_{kind.name}s")
+    chunk: List[Tuple[int, datetime]] = []
+    for row in session.execute(query):
+        chunk.append((row.component_id, row.timestamp))
+        if len(chunk) >= chunk_size:
+            yield from _export_chunk(kind.name, export, chunk)
+            chunk = []
+    if chunk:
+        yield from _export_chunk(kind.name, export, chunk)
+
+
+def _export_chunk(
+    kind: str, export, chunk: List[Tuple[int, datetime]]
+) -> Iterator[Change]:
+    """Serialize a chunk of changed components preserving their order."""
+    models = {model.id: model for model in export([id for id, _ in chunk])}
+    for id, timestamp in chunk:
+        yield Change(kind=kind, timestamp=timestamp, model=models[str(id)])
@@ -0,0 +1,105 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a registry of the component kinds and their related tables."""
+
+
+from typing import Dict, NamedTuple, Type
+
+from ..orm import (
+    Base,
+    Compartment,
+    CompartmentAnnotation,
+    CompartmentName,
+    Compound,
+    CompoundAnnotation,
+    CompoundName,
+    Reaction,
+    ReactionAnnotation,
+    ReactionName,
+)
+
+
+class ComponentKind(NamedTuple):
+    """
+    Define the ORM classes that together make up one kind of component.
+
+    Attributes
+    ----------
+    name : str
+        The name of the component kind, e.g., 'compound'.
+    component : type
+        The component ORM class.
+    name_class : type
+        The ORM class of the component's names.
+    annotation_class : type
+        The ORM class of the component's annotation.
+    foreign_key : str
+        The name of the column in the name and annotation tables that refers to
+        the component.
+
+    """
+
+    name: str
+    component: Type[Base]
+    name_class: Type[Base]
+    annotation_class: Type[Base]
+    foreign_key: str
+
+
+COMPONENT_KINDS: Dict[str, ComponentKind] = {
+    "compartment": ComponentKind(
+        "compartment",
+        Compartment,
+        CompartmentName,
+        CompartmentAnnotation,
+        "compartment_id",
+    ),
+    "compound": ComponentKind(
+        "compound", Compound, CompoundName, CompoundAnnotation, "compound_id"
+    ),
+    "reaction": ComponentKind(
+        "reaction", Reaction, ReactionName, ReactionAnnotation, "reaction_id"
+    ),
+}
+
+
+def get_component_kind(kind: str) -> ComponentKind:
+    """
+    Return the ORM classes that make up the given kind of component.
+
+    Parameters
+    ----------
+    kind : str
+        One of 'compartment', 'compound', or 'reaction'.
+
+    Returns
+    -------
+    ComponentKind
+        The component, name, and annotation ORM classes of that kind.
+
+    Raises
+    ------
+    ValueError
+        If the kind of component is unknown.
+
+    """
+    try:
+        return COMPONENT_KINDS[kind]
+    except KeyError:
+        raise ValueError(
+            f"Unknown kind of component '{kind}'. Please choose one of "
+            f"{', '.join(sorted(COMPONENT_KINDS))}."
+        ) from None
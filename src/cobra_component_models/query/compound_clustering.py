@@ -0,0 +1,200 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide entity resolution of compounds by their shared annotation."""
+
+
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import select
+
+from ..orm import Compound, CompoundAnnotation, Namespace
+
+
+class DisjointSet:
+    """
+    Define a disjoint-set (union-find) data structure over integers.
+
+    Only elements that take part in a union are stored such that memory grows with
+    the number of linked elements rather than the number of all elements. Union
+    by size and path halving keep the amortized cost of operations nearly
+    constant.
+
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize an empty disjoint-set."""
+        super().__init__(**kwargs)
+        self._parent: Dict[int, int] = {}
+        self._size: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of stored elements."""
+        return len(self._parent)
+
+    def find(self, element: int) -> int:
+        """Return the representative of the set containing the element."""
+        parent = self._parent
+        if element not in parent:
+            return element
+        while parent[element] != element:
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def union(self, first: int, second: int) -> None:
+        """Merge the sets containing the two elements."""
+        for element in (first, second):
+            if element not in self._parent:
+                self._parent[element] = element
+                self._size[element] = 1
+        first = self.find(first)
+        second = self.find(second)
+        if first == second:
+            return
+        if self._size[first] < self._size[second]:
+            first, second = second, first
+        self._parent[second] = first
+        self._size[first] += self._size.pop(second)
+
+    def groups(self) -> List[List[int]]:
+        """Return the sets with more than one element sorted by their elements."""
+        result = {}
+        for element in self._parent:
+            result.setdefault(self.find(element), []).append(element)
+        return sorted((sorted(group) for group in result.values()), key=min)
+
+
+class MergeCluster(NamedTuple):
+    """
+    Define a cluster of compounds that likely describe the same entity.
+
+    Attributes
+    ----------
+    compound_ids : list of int
+        The sorted primary keys of the compounds in the cluster.
+    conflicts : dict
+        A mapping from compound attributes, 'inchi_key' or 'chemical_formula', to
+        their distinct values within the cluster. Only attributes with more than
+        one distinct value are listed. Conflicting clusters deserve a manual review
+        before merging.
+
+    """
+
+    compound_ids: List[int]
+    conflicts: Dict[str, List[str]]
+
+
+def cluster_compounds(
+    session,
+    namespaces: Optional[Iterable[str]] = None,
+    chunk_size: int = 10000,
+) -> Iterator[MergeCluster]:
+    """
+    Find clusters of compounds that are connected by shared annotation.
+
+    Two compounds are connected when they are annotated with the same identifier in
+    the same namespace. Connections are transitive, i.e., the clusters are the
+    connected components of the graph of compounds and identifiers. The annotation
+    rows are streamed sorted by namespace and identifier such that only consecutive
+    rows need to be compared and the memory use is bounded by the number of
+    compounds that share identifiers, not the number of annotation rows.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    namespaces : iterable of str, optional
+        Only consider annotation in the namespaces with these prefixes (default
+        all).
+    chunk_size : int, optional
+        The number of rows fetched from the database at once (default 10000).
+
+    Yields
+    ------
+    MergeCluster
+        A proposed cluster of at least two compounds and its conflicts.
+
+    """
+    query = select(
+        [
+            CompoundAnnotation.namespace_id,
+            CompoundAnnotation.identifier,
+            CompoundAnnotation.compound_id,
+        ]
+    ).order_by(
+        CompoundAnnotation.namespace_id,
+        CompoundAnnotation.identifier,
+        CompoundAnnotation.compound_id,
+    )
+    if namespaces is not None:
+        namespace_ids = select([Namespace.id]).where(
+            Namespace.prefix.in_(list(namespaces))
+        )
+        query = query.where(CompoundAnnotation.namespace_id.in_(namespace_ids))
+    disjoint_set = DisjointSet()
+    result = session.execute(query.execution_options(stream_results=True))
+    previous_key = None
+    first_compound = None
+    while True:
+        rows = result.fetchmany(chunk_size)
+        if not rows:
+            break
+        for namespace_id, identifier, compound_id in rows:
+            key = (namespace_id, identifier)
+            if key == previous_key:
+                disjoint_set.union(first_compound, compound_id)
+            else:
+                previous_key = key
+                first_compound = compound_id
+    # Structural attributes are selected for many clusters at once.
+    batch = []
+    num_compounds = 0
+    for group in disjoint_set.groups():
+        batch.append(group)
+        num_compounds += len(group)
+        if num_compounds >= chunk_size:
+            yield from _build_clusters(session, batch)
+            batch = []
+            num_compounds = 0
+    if batch:
+        yield from _build_clusters(session, batch)
+
+
+def _build_clusters(
+    session, groups: List[List[int]], chunk_size: int = 500
+) -> Iterator[MergeCluster]:
+    """Collect the conflicting structural attributes of clusters of compounds."""
+    compound_ids = [id for group in groups for id in group]
+    attributes = {}
+    for start in range(0, len(compound_ids), chunk_size):
+        query = select(
+            [Compound.id, Compound.inchi_key, Compound.chemical_formula]
+        ).where(Compound.id.in_(compound_ids[start : start + chunk_size]))
+        attributes.update(
+            (id, (inchi_key, formula))
+            for id, inchi_key, formula in session.execute(query)
+        )
+    for group in groups:
+        conflicts = {}
+        for index, attr in enumerate(("inchi_key", "chemical_formula")):
+            distinct = {
+                attributes[id][index]
+                for id in group
+                if attributes[id][index] is not None
+            }
+            if len(distinct) > 1:
+                conflicts[attr] = sorted(distinct)
+        yield MergeCluster(compound_ids=group, conflicts=conflicts)
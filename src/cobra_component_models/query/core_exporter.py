@@ -0,0 +1,402 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide an exporter of components that bypasses the ORM."""
+
+
+import json
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from sqlalchemy import select
+
+from ..io import (
+    AnnotationModel,
+    CompartmentModel,
+    ComponentsModel,
+    CompoundModel,
+    NameModel,
+    ParticipantModel,
+    ReactionModel,
+)
+from ..orm import (
+    BiologyQualifier,
+    Compartment,
+    Compound,
+    Namespace,
+    Participant,
+    Reaction,
+)
+from .component_kind import ComponentKind, get_component_kind
+
+
+logger = logging.getLogger(__name__)
+
+
+class CoreExporter:
+    """
+    Define an exporter of components that bypasses the ORM.
+
+    The exporter selects plain rows with SQLAlchemy Core, groups them by component
+    in Python, and directly constructs the IO models. It thus avoids the overhead
+    of the identity map, attribute instrumentation, and loading unused columns. The
+    resulting models are equivalent to the ones created by the builders'
+    ``build_io`` methods. Reaction participants refer to compounds and compartments
+    by their primary keys, consistent with the identifiers of the exported
+    compounds and compartments. Participants without a compartment cannot be
+    represented by IO models and are skipped with a warning.
+
+    """
+
+    def __init__(self, session, chunk_size: int = 500, **kwargs):
+        """
+        Initialize a core exporter.
+
+        Parameters
+        ----------
+        session : sqlalchemy.orm.Session
+            A SQLAlchemy session giving access to a database.
+        chunk_size : int, optional
+            The number of components whose rows are selected at once (default 500).
+            This bounds the memory use and the number of parameters per query.
+
+        Other Parameters
+        ----------------
+        kwargs
+            Passed on to super class init method.
+
+        """
+        super().__init__(**kwargs)
+        self.session = session
+        self.chunk_size = chunk_size
+        self._prefixes: Optional[Dict[int, str]] = None
+        self._qualifiers: Optional[Dict[int, str]] = None
+
+    @property
+    def prefixes(self) -> Dict[int, str]:
+        """Return a mapping from namespace primary keys to their prefix."""
+        if self._prefixes is None:
+            query = select([Namespace.id, Namespace.prefix])
+            self._prefixes = {id: prefix for id, prefix in self.session.execute(query)}
+        return self._prefixes
+
+    @property
+    def qualifiers(self) -> Dict[int, str]:
+        """Return a mapping from biology qualifier primary keys to their value."""
+        if self._qualifiers is None:
+            query = select([BiologyQualifier.id, BiologyQualifier.qualifier])
+            self._qualifiers = {
+                id: qualifier for id, qualifier in self.session.execute(query)
+            }
+        return self._qualifiers
+
+    def export(self) -> ComponentsModel:
+        """Export all compartments, compounds, and reactions of the database."""
+        return ComponentsModel(
+            compartments={c.id: c for c in self.iter_compartments()},
+            compounds={c.id: c for c in self.iter_compounds()},
+            reactions={r.id: r for r in self.iter_reactions()},
+        )
+
+    def write_json(self, handle: TextIO) -> Dict[str, int]:
+        """
+        Write all components of the database as JSON without holding them at once.
+
+        The output follows the `ComponentsModel` schema and only ever holds one
+        chunk of components in memory.
+
+        Parameters
+        ----------
+        handle : io.TextIOBase
+            A text file opened for writing.
+
+        Returns
+        -------
+        dict
+            The number of written components per section.
+
+        """
+        counts = {}
+        handle.write("{")
+        for index, (section, models) in enumerate(
+            [
+                ("compartments", self.iter_compartments()),
+                ("compounds", self.iter_compounds()),
+                ("reactions", self.iter_reactions()),
+            ]
+        ):
+            handle.write(f"{', ' if index else ''}{json.dumps(section)}: {{")
+            counts[section] = 0
+            for model in models:
+                if counts[section]:
+                    handle.write(", ")
+                handle.write(
+                    f"{json.dumps(model.id)}: {model.json(exclude_defaults=True)}"
+                )
+                counts[section] += 1
+            handle.write("}")
+        handle.write("}\n")
+        return counts
+
+    def iter_compartments(
+        self, ids: Optional[Iterable[int]] = None
+    ) -> Iterator[CompartmentModel]:
+        """
+        Generate IO compartment models in the order of their primary keys.
+
+        Parameters
+        ----------
+        ids : iterable of int, optional
+            Restrict the export to compartments with these primary keys (default
+            all).
+
+        Yields
+        ------
+        cobra_component_models.io.CompartmentModel
+            A pydantic compartment data model.
+
+        """
+        kind = get_component_kind("compartment")
+        for rows in self._iter_chunks(
+            [Compartment.id, Compartment.notes], Compartment.id, ids
+        ):
+            chunk = [row[0] for row in rows]
+            names = self._select_names(kind, chunk)
+            annotation = self._select_annotation(kind, chunk)
+            for id, notes in rows:
+                yield CompartmentModel(
+                    id=str(id),
+                    notes=notes,
+                    names=names.get(id, {}),
+                    annotation=annotation.get(id, {}),
+                )
+
+    def iter_compounds(
+        self, ids: Optional[Iterable[int]] = None
+    ) -> Iterator[CompoundModel]:
+        """
+        Generate IO compound models in the order of their primary keys.
+
+        Parameters
+        ----------
+        ids : iterable of int, optional
+            Restrict the export to compounds with these primary keys (default all).
+
+        Yields
+        ------
+        cobra_component_models.io.CompoundModel
+            A pydantic compound data model.
+
+        """
+        kind = get_component_kind("compound")
+        columns = [
+            Compound.id,
+            Compound.notes,
+            Compound.charge,
+            Compound.chemical_formula,
+            Compound.inchi,
+            Compound.inchi_key,
+            Compound.smiles,
+        ]
+        for rows in self._iter_chunks(columns, Compound.id, ids):
+            chunk = [row[0] for row in rows]
+            names = self._select_names(kind, chunk)
+            annotation = self._select_annotation(kind, chunk)
+            for id, notes, charge, formula, inchi, inchi_key, smiles in rows:
+                obj = annotation.get(id, {})
+                if inchi:
+                    obj["inchi"] = [
+                        AnnotationModel(biology_qualifier="is", identifier=inchi)
+                    ]
+                if inchi_key:
+                    obj["inchikey"] = [
+                        AnnotationModel(biology_qualifier="is", identifier=inchi_key)
+                    ]
+                if smiles:
+                    obj["smiles"] = [
+                        AnnotationModel(biology_qualifier="is", identifier=smiles)
+                    ]
+                yield CompoundModel(
+                    id=str(id),
+                    notes=notes,
+                    charge=charge,
+                    chemical_formula=formula,
+                    names=names.get(id, {}),
+                    annotation=obj,
+                )
+
+    def iter_reactions(
+        self, ids: Optional[Iterable[int]] = None
+    ) -> Iterator[ReactionModel]:
+        """
+        Generate IO reaction models in the order of their primary keys.
+
+        Parameters
+        ----------
+        ids : iterable of int, optional
+            Restrict the export to reactions with these primary keys (default all).
+
+        Yields
+        ------
+        cobra_component_models.io.ReactionModel
+            A pydantic reaction data model.
+
+        """
+        kind = get_component_kind("reaction")
+        for rows in self._iter_chunks([Reaction.id, Reaction.notes], Reaction.id, ids):
+            chunk = [row[0] for row in rows]
+            names = self._select_names(kind, chunk)
+            annotation = self._select_annotation(kind, chunk)
+            participants = self._select_participants(chunk)
+            for id, notes in rows:
+                reactants, products = participants.get(id, ({}, {}))
+                yield ReactionModel(
+                    id=str(id),
+                    notes=notes,
+                    names=names.get(id, {}),
+                    annotation=annotation.get(id, {}),
+                    reactants=reactants,
+                    products=products,
+                )
+
+    def _iter_chunks(
+        self, columns: list, primary_key, ids: Optional[Iterable[int]]
+    ) -> Iterator[List[Tuple]]:
+        """Select the given columns in chunks of rows ordered by primary key."""
+        if ids is not None:
+            ids = sorted(set(ids))
+            for start in range(0, len(ids), self.chunk_size):
+                query = (
+                    select(columns)
+                    .where(primary_key.in_(ids[start : start + self.chunk_size]))
+                    .order_by(primary_key)
+                )
+                rows = self.session.execute(query).fetchall()
+                if rows:
+                    yield rows
+            return
+        # Without explicit identifiers, we use keyset pagination which remains
+        # efficient on large tables unlike offsets.
+        last = None
+        while True:
+            query = select(columns).order_by(primary_key).limit(self.chunk_size)
+            if last is not None:
+                query = query.where(primary_key > last)
+            rows = self.session.execute(query).fetchall()
+            if not rows:
+                return
+            yield rows
+            last = rows[-1][0]
+
+    def _select_names(
+        self, kind: ComponentKind, chunk: Sequence[int]
+    ) -> Dict[int, Dict[str, List[NameModel]]]:
+        """Select and group the names of a chunk of components."""
+        cls = kind.name_class
+        foreign_key = getattr(cls, kind.foreign_key)
+        query = (
+            select([foreign_key, cls.namespace_id, cls.name, cls.is_preferred])
+            .where(foreign_key.in_(chunk))
+            .order_by(foreign_key, cls.id)
+        )
+        prefixes = self.prefixes
+        result = {}
+        for component_id, namespace_id, name, is_preferred in self.session.execute(
+            query
+        ):
+            result.setdefault(component_id, {}).setdefault(
+                prefixes[namespace_id], []
+            ).append(NameModel(name=name, is_preferred=is_preferred))
+        return result
+
+    def _select_annotation(
+        self, kind: ComponentKind, chunk: Sequence[int]
+    ) -> Dict[int, Dict[str, List[AnnotationModel]]]:
+        """Select and group the annotation of a chunk of components."""
+        cls = kind.annotation_class
+        foreign_key = getattr(cls, kind.foreign_key)
+        query = (
+            select(
+                [
+                    foreign_key,
+                    cls.namespace_id,
+                    cls.identifier,
+                    cls.biology_qualifier_id,
+                    cls.is_deprecated,
+                ]
+            )
+            .where(foreign_key.in_(chunk))
+            .order_by(foreign_key, cls.id)
+        )
+        prefixes = self.prefixes
+        qualifiers = self.qualifiers
+        result = {}
+        for (
+            component_id,
+            namespace_id,
+            identifier,
+            qualifier_id,
+            is_deprecated,
+        ) in self.session.execute(query):
+            result.setdefault(component_id, {}).setdefault(
+                prefixes[namespace_id], []
+            ).append(
+                AnnotationModel(
+                    identifier=identifier,
+                    biology_qualifier=qualifiers[qualifier_id],
+                    is_deprecated=is_deprecated,
+                )
+            )
+        return result
+
+    def _select_participants(
+        self, chunk: Sequence[int]
+    ) -> Dict[int, Tuple[Dict[str, ParticipantModel], Dict[str, ParticipantModel]]]:
+        """Select and group the reactants and products of a chunk of reactions."""
+        query = (
+            select(
+                [
+                    Participant.reaction_id,
+                    Participant.compound_id,
+                    Participant.compartment_id,
+                    Participant.stoichiometry,
+                    Participant.is_product,
+                ]
+            )
+            .where(Participant.reaction_id.in_(chunk))
+            .order_by(Participant.reaction_id, Participant.id)
+        )
+        result = {}
+        for (
+            reaction_id,
+            compound_id,
+            compartment_id,
+            stoichiometry,
+            is_product,
+        ) in self.session.execute(query):
+            reactants, products = result.setdefault(reaction_id, ({}, {}))
+            if compartment_id is None:
+                logger.warning(
+                    "Skipping the participant compound %d of reaction %d without a "
+                    "compartment.",
+                    compound_id,
+                    reaction_id,
+                )
+                continue
+            side = products if is_product else reactants
+            side[str(compound_id)] = ParticipantModel(
+                stoichiometry=stoichiometry, compartment=str(compartment_id)
+            )
+        return result
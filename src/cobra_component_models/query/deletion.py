@@ -0,0 +1,158 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide set-based deletion of components and their children."""
+
+
+from typing import Iterable
+
+from sqlalchemy import func, select
+
+from ..orm import CompoundElement, Participant
+from .component_kind import ComponentKind, get_component_kind
+
+
+def delete_components(
+    session, kind: str, ids: Iterable[int], chunk_size: int = 500
+) -> int:
+    """
+    Delete components and all of their children with set-based statements.
+
+    For each chunk of primary keys, the names and annotation of the components are
+    deleted first, followed by their dependent rows and finally the components
+    themselves. Deleting compounds also deletes their element counts and deleting
+    reactions deletes their participants. Compounds that participate in reactions
+    and compartments in which participants are located cannot be deleted, since
+    the reactions would be left incomplete; delete the reactions first. The
+    statements do not rely on ON DELETE rules, which SQLite only enforces with
+    foreign keys enabled.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    kind : str
+        One of 'compartment', 'compound', or 'reaction'.
+    ids : iterable of int
+        The primary keys of the components to be deleted.
+    chunk_size : int, optional
+        The number of components deleted per statement (default 500).
+
+    Returns
+    -------
+    int
+        The number of deleted components.
+
+    Raises
+    ------
+    ValueError
+        If any of the compounds participate in reactions or participants are
+        located in any of the compartments.
+
+    Warnings
+    --------
+    The statements bypass the ORM. Pending changes are flushed beforehand and all
+    instances in the session are expired afterwards.
+
+    """
+    component_kind = get_component_kind(kind)
+    session.flush()
+    ids = sorted(set(ids))
+    if kind == "compartment":
+        _check_references(
+            session, kind, Participant.compartment_id, ids, chunk_size, "are located in"
+        )
+    elif kind == "compound":
+        _check_references(
+            session, kind, Participant.compound_id, ids, chunk_size, "refer to"
+        )
+    num_deleted = 0
+    for start in range(0, len(ids), chunk_size):
+        num_deleted += _delete_chunk(
+            session, component_kind, ids[start : start + chunk_size]
+        )
+    session.expire_all()
+    return num_deleted
+
+
+def _delete_chunk(session, kind: ComponentKind, chunk: list) -> int:
+    """Delete a chunk of components and their children."""
+    for cls in (kind.name_class, kind.annotation_class):
+        table = cls.__table__
+        session.execute(table.delete().where(table.c[kind.foreign_key].in_(chunk)))
+    participants = Participant.__table__
+    if kind.name == "compound":
+        elements = CompoundElement.__table__
+        session.execute(elements.delete().where(elements.c.compound_id.in_(chunk)))
+    elif kind.name == "reaction":
+        session.execute(
+            participants.delete().where(participants.c.reaction_id.in_(chunk))
+        )
+    table = kind.component.__table__
+    return session.execute(table.delete().where(table.c.id.in_(chunk))).rowcount
+
+
+def _check_references(
+    session, kind: str, foreign_key, ids: list, chunk_size: int, relation: str
+) -> None:
+    """Ensure that no participants refer to the given components."""
+    for start in range(0, len(ids), chunk_size):
+        query = select([func.count(Participant.id)]).where(
+            foreign_key.in_(ids[start : start + chunk_size])
+        )
+        num_participants = session.execute(query).scalar()
+        if num_participants:
+            raise ValueError(
+                f"{num_participants} reaction participant(s) {relation} the "
+                f"{kind}s to be deleted. Please delete their reactions first."
+            )
+
+
+def delete_orphans(session, kind: str) -> int:
+    """
+    Delete names, annotation, and other children whose component no longer exists.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    kind : str
+        One of 'compartment', 'compound', or 'reaction'.
+
+    Returns
+    -------
+    int
+        The number of deleted rows.
+
+    """
+    component_kind = get_component_kind(kind)
+    session.flush()
+    existing = select([component_kind.component.__table__.c.id])
+    tables = [
+        (component_kind.name_class.__table__, component_kind.foreign_key),
+        (component_kind.annotation_class.__table__, component_kind.foreign_key),
+    ]
+    if kind == "compound":
+        tables.append((CompoundElement.__table__, "compound_id"))
+        tables.append((Participant.__table__, "compound_id"))
+    elif kind == "reaction":
+        tables.append((Participant.__table__, "reaction_id"))
+    num_deleted = 0
+    for table, foreign_key in tables:
+        num_deleted += session.execute(
+            table.delete().where(table.c[foreign_key].notin_(existing))
+        ).rowcount
+    session.expire_all()
+    return num_deleted
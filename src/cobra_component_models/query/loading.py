@@ -0,0 +1,59 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide eager loading options for serializing components."""
+
+
+from sqlalchemy.orm import selectinload
+
+from ..orm import Participant
+from .component_kind import ComponentKind
+
+
+def eager_loading_options(kind: ComponentKind) -> list:
+    """
+    Return loader options that load everything the builders' `build_io` needs.
+
+    Parameters
+    ----------
+    kind : ComponentKind
+        The ORM classes of the kind of component to be loaded.
+
+    Returns
+    -------
+    list
+        SQLAlchemy loader options to be passed to `Query.options`. Collections are
+        loaded with one additional `SELECT ... IN` statement each which avoids
+        :math:`N+1` problems without multiplying the rows of the main query.
+
+    """
+    component = kind.component
+    options = [
+        selectinload(component.names).joinedload(kind.name_class.namespace),
+        selectinload(component.annotation).joinedload(kind.annotation_class.namespace),
+        selectinload(component.annotation).joinedload(
+            kind.annotation_class.biology_qualifier
+        ),
+    ]
+    if kind.name == "reaction":
+        options.extend(
+            [
+                selectinload(component.participants).joinedload(Participant.compound),
+                selectinload(component.participants).joinedload(
+                    Participant.compartment
+                ),
+            ]
+        )
+    return options
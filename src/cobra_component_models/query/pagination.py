@@ -0,0 +1,168 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide keyset pagination of components."""
+
+
+import base64
+import json
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, exists, func
+
+from ..builder import AbstractBuilder
+from ..io import AbstractBaseModel
+from ..orm import Namespace
+from .component_kind import ComponentKind, get_component_kind
+from .loading import eager_loading_options
+
+
+class Page(NamedTuple):
+    """
+    Define a page of serialized components.
+
+    Attributes
+    ----------
+    items : list of cobra_component_models.io.AbstractBaseModel
+        The IO models of the components on this page in the order of their primary
+        keys.
+    cursor : str, optional
+        An opaque cursor that points to the next page or ``None`` if this is the
+        last page.
+
+    """
+
+    items: List[AbstractBaseModel]
+    cursor: Optional[str]
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the primary key of the last component on a page as a cursor."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor into the primary key of the last component on a page.
+
+    Raises
+    ------
+    ValueError
+        If the cursor was not created by `encode_cursor`.
+
+    """
+    try:
+        last_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["id"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError(f"Invalid page cursor '{cursor}'.") from None
+    if not isinstance(last_id, int):
+        raise ValueError(f"Invalid page cursor '{cursor}'.")
+    return last_id
+
+
+def paginate(
+    session,
+    kind: str,
+    builder: AbstractBuilder,
+    *,
+    page_size: int = 100,
+    cursor: Optional[str] = None,
+    namespace: Optional[str] = None,
+    annotation: Optional[Tuple[str, str]] = None,
+    updated_since: Optional[datetime] = None,
+) -> Page:
+    """
+    Return one page of serialized components using keyset pagination.
+
+    Instead of skipping rows with an ``OFFSET``, which the database has to scan
+    anyway, each page continues after the primary key of the previous page's last
+    component. Every page, no matter how deep, is thus retrieved by an index seek.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    kind : str
+        One of 'compartment', 'compound', or 'reaction'.
+    builder : cobra_component_models.builder.AbstractBuilder
+        The builder for the given kind of component that is used to create the IO
+        models.
+    page_size : int, optional
+        The maximum number of components per page (default 100).
+    cursor : str, optional
+        The cursor of the previous page (default start with the first page).
+    namespace : str, optional
+        Only include components that are annotated in the namespace with this
+        prefix.
+    annotation : tuple of str, optional
+        Only include components that carry this pair of namespace prefix and
+        identifier as annotation.
+    updated_since : datetime.datetime, optional
+        Only include components that were created or updated at or after this
+        moment.
+
+    Returns
+    -------
+    Page
+        The IO models on this page and a cursor pointing to the next page.
+
+    """
+    component_kind = get_component_kind(kind)
+    cls = component_kind.component
+    query = session.query(cls).options(*eager_loading_options(component_kind))
+    if cursor is not None:
+        query = query.filter(cls.id > decode_cursor(cursor))
+    filters = []
+    if namespace is not None:
+        filters.append((namespace, None))
+    if annotation is not None:
+        filters.append(annotation)
+    for prefix, identifier in filters:
+        criterion = _annotation_criterion(session, component_kind, prefix, identifier)
+        if criterion is None:
+            return Page(items=[], cursor=None)
+        query = query.filter(criterion)
+    if updated_since is not None:
+        query = query.filter(
+            func.coalesce(cls.updated_on, cls.created_on) >= updated_since
+        )
+    # We fetch one additional row in order to know whether there is a next page.
+    components = query.order_by(cls.id).limit(page_size + 1).all()
+    next_cursor = None
+    if len(components) > page_size:
+        components = components[:page_size]
+        next_cursor = encode_cursor(components[-1].id)
+    return Page(items=[builder.build_io(c) for c in components], cursor=next_cursor)
+
+
+def _annotation_criterion(
+    session, kind: ComponentKind, prefix: str, identifier: Optional[str]
+):
+    """Return a criterion on the existence of annotation in a namespace."""
+    namespace_id = (
+        session.query(Namespace.id).filter(Namespace.prefix == prefix).scalar()
+    )
+    if namespace_id is None:
+        return None
+    cls = kind.annotation_class
+    criteria = [
+        getattr(cls, kind.foreign_key) == kind.component.id,
+        cls.namespace_id == namespace_id,
+    ]
+    if identifier is not None:
+        criteria.append(cls.identifier == identifier)
+    return exists().where(and_(*criteria))
@@ -0,0 +1,126 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a reverse lookup of the reactions in which compounds participate."""
+
+
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from ..orm import Participant, Reaction
+from .component_kind import get_component_kind
+from .loading import eager_loading_options
+
+
+ROLES = ("any", "reactant", "product")
+
+
+def reactions_for_compounds(
+    session,
+    compound_ids: Iterable[int],
+    role: str = "any",
+    compartment_ids: Optional[Iterable[int]] = None,
+    chunk_size: int = 500,
+) -> Iterator[Reaction]:
+    """
+    Generate the reactions in which any of the given compounds participate.
+
+    The reactions' primary keys are selected from the participants table alone
+    which is served by the (compound_id, reaction_id) index. One ``SELECT
+    DISTINCT`` statement runs per chunk of compound identifiers and, if given, per
+    chunk of compartment identifiers, such that no statement exceeds the database's
+    limit of bound parameters. The role is a filter of the same statement. The
+    distinct reactions are then loaded in chunks ordered by primary key together
+    with everything `ReactionBuilder.build_io` needs.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+    compound_ids : iterable of int
+        The primary keys of the compounds.
+    role : str, optional
+        Restrict the lookup to reactions that consume ('reactant') or produce
+        ('product') the compounds (default 'any').
+    compartment_ids : iterable of int, optional
+        Restrict the lookup to participants located in these compartments (default
+        any compartment).
+    chunk_size : int, optional
+        The number of identifiers per statement and of reactions loaded at once
+        (default 500).
+
+    Yields
+    ------
+    cobra_component_models.orm.Reaction
+        Each matching reaction exactly once with eagerly loaded names, annotation,
+        and participants.
+
+    Raises
+    ------
+    ValueError
+        If the role is unknown.
+
+    """
+    if role not in ROLES:
+        raise ValueError(
+            f"Unknown participant role '{role}'. Please choose one of "
+            f"{', '.join(ROLES)}."
+        )
+    compound_ids = sorted(set(compound_ids))
+    if compartment_ids is None:
+        compartment_chunks = [None]
+    else:
+        compartment_ids = sorted(set(compartment_ids))
+        compartment_chunks = [
+            compartment_ids[start : start + chunk_size]
+            for start in range(0, len(compartment_ids), chunk_size)
+        ]
+    reaction_ids = set()
+    for start in range(0, len(compound_ids), chunk_size):
+        for compartment_chunk in compartment_chunks:
+            reaction_ids.update(
+                _select_reaction_ids(
+                    session,
+                    compound_ids[start : start + chunk_size],
+                    role,
+                    compartment_chunk,
+                )
+            )
+    reaction_ids = sorted(reaction_ids)
+    options = eager_loading_options(get_component_kind("reaction"))
+    for start in range(0, len(reaction_ids), chunk_size):
+        yield from (
+            session.query(Reaction)
+            .options(*options)
+            .filter(Reaction.id.in_(reaction_ids[start : start + chunk_size]))
+            .order_by(Reaction.id)
+        )
+
+
+def _select_reaction_ids(
+    session, chunk: List[int], role: str, compartment_ids: Optional[List[int]]
+) -> List[int]:
+    """Select the distinct primary keys of reactions involving a chunk of compounds."""
+    query = (
+        select([Participant.reaction_id])
+        .where(Participant.compound_id.in_(chunk))
+        .distinct()
+    )
+    if role != "any":
+        query = query.where(Participant.is_product == (role == "product"))
+    if compartment_ids is not None:
+        query = query.where(Participant.compartment_id.in_(compartment_ids))
+    return [reaction_id for reaction_id, in session.execute(query)]
@@ -0,0 +1,170 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide an export of components to SBML in bounded memory."""
+
+
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+from sqlalchemy import and_, select
+
+from ..io import ComponentsModel
+from ..io.sbml_writer import SBMLWriter
+from ..orm import Participant
+from .core_exporter import CoreExporter
+from .snapshot_diff import snapshot_key
+
+
+def export_sbml(
+    source: Union[ComponentsModel, object],
+    handle: TextIO,
+    model_id: str = "components",
+    default_compartment: Optional[str] = None,
+    chunk_size: int = 500,
+) -> Dict[str, int]:
+    """
+    Write all components of a snapshot or a database as an SBML document.
+
+    SBML species are compounds located in a compartment. A species is written for
+    every combination of compound and compartment that occurs in a reaction. The
+    compartments of database compounds are selected for one chunk of compounds at a
+    time.
+
+    Parameters
+    ----------
+    source : cobra_component_models.io.ComponentsModel or sqlalchemy.orm.Session
+        Either components in memory or a session whose components are streamed in
+        chunks with the `CoreExporter`. Database components are identified by
+        their primary keys.
+    handle : io.TextIOBase
+        A text file opened for writing.
+    model_id : str, optional
+        The identifier of the SBML model (default 'components').
+    default_compartment : str, optional
+        The identifier of a compartment in which compounds are placed that do not
+        participate in any reaction (default omit those compounds).
+    chunk_size : int, optional
+        The number of database components selected at once (default 500).
+
+    Returns
+    -------
+    dict
+        The number of written compartments, species, and reactions.
+
+    Raises
+    ------
+    ValueError
+        If the default compartment is not among the written compartments.
+
+    """
+    if isinstance(source, ComponentsModel):
+        compartments = _sorted_values(source.compartments)
+        compounds = _sorted_values(source.compounds)
+        reactions = _sorted_values(source.reactions)
+        id2compartments = _locate_models(source.reactions.values())
+
+        def locate(compound_ids: List[str]) -> Dict[str, List[str]]:
+            return id2compartments
+
+    else:
+        exporter = CoreExporter(source, chunk_size=chunk_size)
+        compartments = exporter.iter_compartments()
+        compounds = exporter.iter_compounds()
+        reactions = exporter.iter_reactions()
+
+        def locate(compound_ids: List[str]) -> Dict[str, List[str]]:
+            return _locate_rows(source, compound_ids)
+
+    counts = {"compartments": 0, "species": 0, "reactions": 0}
+    with SBMLWriter(handle, model_id=model_id) as writer:
+        written = set()
+        for compartment in compartments:
+            writer.write_compartment(compartment)
+            written.add(compartment.id)
+            counts["compartments"] += 1
+        if default_compartment is not None and default_compartment not in written:
+            raise ValueError(
+                f"The default compartment '{default_compartment}' does not exist."
+            )
+        for chunk in _chunks(compounds, chunk_size):
+            locations = locate([compound.id for compound in chunk])
+            for compound in chunk:
+                compartment_ids = locations.get(compound.id)
+                if not compartment_ids:
+                    if default_compartment is None:
+                        continue
+                    compartment_ids = [default_compartment]
+                for compartment_id in compartment_ids:
+                    writer.write_species(compound, compartment_id)
+                    counts["species"] += 1
+        for reaction in reactions:
+            writer.write_reaction(reaction)
+            counts["reactions"] += 1
+    return counts
+
+
+def _sorted_values(components: Optional[dict]) -> Iterator:
+    """Generate components in the order of their identifiers like the database."""
+    return (components[id] for id in sorted(components or {}, key=snapshot_key))
+
+
+def _locate_models(reactions) -> Dict[str, List[str]]:
+    """Map compound identifiers to the compartments in which they participate."""
+    pairs = set()
+    for reaction in reactions:
+        for compound_id, part in list(reaction.reactants.items()) + list(
+            reaction.products.items()
+        ):
+            pairs.add((compound_id, part.compartment))
+    return _group(
+        sorted(pairs, key=lambda pair: (snapshot_key(pair[0]), snapshot_key(pair[1])))
+    )
+
+
+def _chunks(components: Iterable, chunk_size: int) -> Iterator[list]:
+    """Generate lists of at most `chunk_size` components."""
+    iterator = iter(components)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+def _locate_rows(session, compound_ids: List[str]) -> Dict[str, List[str]]:
+    """Select the distinct compartments of the given compounds' participations."""
+    query = (
+        select([Participant.compound_id, Participant.compartment_id])
+        .where(
+            and_(
+                Participant.compound_id.in_([int(id) for id in compound_ids]),
+                Participant.compartment_id.isnot(None),
+            )
+        )
+        .distinct()
+        .order_by(Participant.compound_id, Participant.compartment_id)
+    )
+    return _group(
+        (str(compound_id), str(compartment_id))
+        for compound_id, compartment_id in session.execute(query)
+    )
+
+
+def _group(pairs) -> Dict[str, List[str]]:
+    """Group compartment identifiers by compound identifier."""
+    result: Dict[str, List[str]] = {}
+    for compound_id, compartment_id in pairs:
+        result.setdefault(compound_id, []).append(compartment_id)
+    return result
@@ -0,0 +1,633 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Provide a streaming diff of component snapshots that can be applied as a patch.
+
+By default, snapshots are joined on their component identifiers, which for a
+database are the autoincrement primary keys. Such a diff is only meaningful
+between snapshots of the same database, e.g., a database and an earlier dump of
+it, since independently created databases assign unrelated primary keys to the
+same components. Snapshots of independent sources, e.g., a new upstream release
+or a dump keyed by source identifiers, are instead joined on a stable key, i.e.,
+an identifier in a chosen namespace such as the InChIKey of compounds.
+
+"""
+
+
+from itertools import chain
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy.orm import Session
+
+from ..builder import CompartmentBuilder, CompoundBuilder, ReactionBuilder
+from ..builder.compound_builder import STRUCTURE_COLUMNS
+from ..chemistry import set_formula_attributes
+from ..helpers import reset_sequences
+from ..io import ComponentsModel
+from ..orm import Base, BiologyQualifier, Compartment, Compound, Namespace
+from ..record import ComponentRecord, to_model, to_record
+from .component_kind import get_component_kind
+from .core_exporter import CoreExporter
+from .deletion import delete_components
+
+
+# Kinds in the order in which they are added. Removals happen in reverse.
+KINDS = ("compartment", "compound", "reaction")
+# Record fields that are not compared. The SBO term is not stored in a database.
+IGNORED_FIELDS = ("id", "sbo_term")
+# Biology qualifiers of annotation that identifies a component.
+IDENTITY_QUALIFIERS = ("is", "bqm_is")
+# The prefix of added components' identifiers that are decimal numbers in the new
+# snapshot of a join on stable keys, since they are no primary keys of the old one.
+ADDED_PREFIX = "new:"
+
+Snapshot = Union[Session, ComponentsModel]
+
+
+class ComponentChange(NamedTuple):
+    """
+    Define the change of a single component between two snapshots.
+
+    Attributes
+    ----------
+    kind : str
+        One of 'compartment', 'compound', or 'reaction'.
+    id : str
+        The identifier of the component, i.e., its primary key in a database. In
+        a join on stable keys, the identifier in the old snapshot or, for added
+        components, in the new one.
+    status : str
+        One of 'added', 'removed', or 'changed'.
+    fields : tuple of str
+        The names of the record fields that differ, e.g., 'names' or
+        'annotation'. Empty unless the component changed.
+    record : CompartmentRecord or CompoundRecord or ReactionRecord or None
+        The new state of the component or None if it was removed.
+
+    """
+
+    kind: str
+    id: str
+    status: str
+    fields: Tuple[str, ...]
+    record: Optional[ComponentRecord]
+
+
+def snapshot_key(id: str) -> Tuple[int, str]:
+    """
+    Return the sort key of component identifiers.
+
+    Ordering by length first sorts decimal primary keys numerically, consistent
+    with the order in which they are selected from a database, while remaining a
+    total order on arbitrary identifiers.
+
+    """
+    return len(id), id
+
+
+def iter_snapshot(
+    snapshot: Snapshot, kind: str, chunk_size: int = 500
+) -> Iterator[Tuple[str, ComponentRecord]]:
+    """
+    Generate the components of one kind ordered by their key.
+
+    Parameters
+    ----------
+    snapshot : sqlalchemy.orm.Session or cobra_component_models.io.ComponentsModel
+        A session of a database or a dump of components. A database is streamed
+        in chunks of rows.
+    kind : str
+        One of 'compartment', 'compound', or 'reaction'.
+    chunk_size : int, optional
+        The number of components selected from a database at once (default 500).
+
+    Yields
+    ------
+    tuple
+        Pairs of identifiers and records ordered by `snapshot_key`. Database
+        identifiers are primary keys. Dump identifiers are the keys of its
+        mappings.
+
+    """
+    get_component_kind(kind)
+    if isinstance(snapshot, ComponentsModel):
+        models = getattr(snapshot, f"{kind}s") or {}
+        for id in sorted(models, key=snapshot_key):
+            yield id, to_record(models[id])
+        return
+    exporter = CoreExporter(snapshot, chunk_size=chunk_size)
+    for model in getattr(exporter, f"iter_{kind}s")():
+        yield model.id, to_record(model)
+
+
+def diff_snapshots(
+    old: Snapshot,
+    new: Snapshot,
+    kinds: Iterable[str] = KINDS,
+    chunk_size: int = 500,
+    join_on: Optional[Dict[str, str]] = None,
+) -> Iterator[ComponentChange]:
+    """
+    Compare two snapshots by merge-joining their components.
+
+    Both snapshots are traversed in key order such that only the current pair of
+    components is held in memory. The names and annotation of components are
+    compared irrespective of their order. By default, components are joined on
+    their identifiers and both snapshots must stem from the same database.
+
+    Kinds listed in `join_on` are joined on the smallest identifier that a
+    component has with an identity qualifier, i.e., 'is' or 'bqm_is', in the given
+    namespace instead. This requires one pass over each snapshot that keeps the
+    keys and identifiers of those kinds in memory. Changed and removed components
+    keep the identifiers of the old snapshot and references of reactions are
+    translated accordingly. Added components keep the identifiers of the new
+    snapshot, prefixed by 'new:' if they are decimal numbers, which are thus never
+    taken as primary keys by `apply_changes`. Components without a key or with
+    the same key as a previous one are never matched.
+
+    Parameters
+    ----------
+    old : sqlalchemy.orm.Session or cobra_component_models.io.ComponentsModel
+        The previous snapshot.
+    new : sqlalchemy.orm.Session or cobra_component_models.io.ComponentsModel
+        The next snapshot.
+    kinds : iterable of str, optional
+        The kinds of components to compare (default all).
+    chunk_size : int, optional
+        The number of components selected from a database at once (default 500).
+    join_on : dict, optional
+        A mapping from kinds to the namespace prefix of their stable key, e.g.,
+        ``{"compound": "inchikey", "reaction": "rhea"}`` (default join all kinds
+        on their identifiers).
+
+    Yields
+    ------
+    ComponentChange
+        The changes ordered by kind and key. Unmatched components without a stable
+        key follow the others of their kind.
+
+    """
+    join_on = join_on or {}
+    for kind in join_on:
+        get_component_kind(kind)
+    indices = {
+        kind: _JoinIndex(old, new, kind, prefix, chunk_size)
+        for kind, prefix in join_on.items()
+    }
+    translations = {kind: index.translation for kind, index in indices.items()}
+    for kind in kinds:
+        index = indices.get(kind)
+        if index is None:
+            pairs = _merge_join(
+                (
+                    (id, (id, record))
+                    for id, record in iter_snapshot(old, kind, chunk_size)
+                ),
+                (
+                    (id, (id, record))
+                    for id, record in iter_snapshot(new, kind, chunk_size)
+                ),
+                key=snapshot_key,
+            )
+        else:
+            pairs = index.iter_pairs(chunk_size)
+        for old_item, new_item in pairs:
+            if new_item is None:
+                yield ComponentChange(kind, old_item[0], "removed", (), None)
+                continue
+            id = new_item[0] if index is None else index.translation[new_item[0]]
+            record = _translate(new_item[1], id, translations)
+            if old_item is None:
+                yield ComponentChange(kind, id, "added", (), record)
+                continue
+            fields = _changed_fields(old_item[1], record)
+            if fields:
+                yield ComponentChange(kind, id, "changed", fields, record)
+
+
+def stable_key(record: ComponentRecord, prefix: str) -> Optional[str]:
+    """
+    Return the key of a component that is stable across databases.
+
+    Parameters
+    ----------
+    record : CompartmentRecord or CompoundRecord or ReactionRecord
+        A component record.
+    prefix : str
+        A namespace prefix, e.g., 'inchikey'.
+
+    Returns
+    -------
+    str or None
+        The smallest identifier with an identity qualifier in the namespace or
+        None if there is none.
+
+    """
+    identifiers = [
+        ann.identifier
+        for ann in record.annotation.get(prefix, [])
+        if ann.biology_qualifier in IDENTITY_QUALIFIERS
+    ]
+    return min(identifiers) if identifiers else None
+
+
+class _JoinIndex:
+    """Define the stable keys and identifiers of one kind in two snapshots."""
+
+    def __init__(
+        self, old: Snapshot, new: Snapshot, kind: str, prefix: str, chunk_size: int
+    ):
+        """Collect and join the keys of both snapshots."""
+        self.old = old
+        self.new = new
+        self.kind = kind
+        self.old_keys, old_unkeyed = self._collect(old, prefix, chunk_size)
+        self.new_keys, new_unkeyed = self._collect(new, prefix, chunk_size)
+        self.unkeyed = (old_unkeyed, new_unkeyed)
+        old_ids = dict(self.old_keys)
+        # Map the identifiers of the new snapshot onto those of the changes.
+        self.translation: Dict[str, str] = {}
+        for key, id in self.new_keys:
+            self.translation[id] = old_ids.get(key) or _added_id(id)
+        for id in new_unkeyed:
+            self.translation[id] = _added_id(id)
+
+    def _collect(
+        self, snapshot: Snapshot, prefix: str, chunk_size: int
+    ) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """Return sorted pairs of unique keys and identifiers and the others."""
+        pairs = []
+        unkeyed = []
+        for id, record in iter_snapshot(snapshot, self.kind, chunk_size):
+            key = stable_key(record, prefix)
+            if key is None:
+                unkeyed.append(id)
+            else:
+                pairs.append((key, id))
+        pairs.sort(key=lambda pair: (pair[0], snapshot_key(pair[1])))
+        unique = []
+        for key, id in pairs:
+            if unique and unique[-1][0] == key:
+                unkeyed.append(id)
+            else:
+                unique.append((key, id))
+        return unique, sorted(unkeyed, key=snapshot_key)
+
+    def iter_pairs(self, chunk_size: int) -> Iterator[tuple]:
+        """Generate pairs of joined components in the order of their keys."""
+        old_records = _iter_records(
+            self.old, self.kind, [id for _, id in self.old_keys], chunk_size
+        )
+        new_records = _iter_records(
+            self.new, self.kind, [id for _, id in self.new_keys], chunk_size
+        )
+        yield from _merge_join(
+            (
+                (key, (id, record))
+                for (key, id), record in zip(self.old_keys, old_records)
+            ),
+            (
+                (key, (id, record))
+                for (key, id), record in zip(self.new_keys, new_records)
+            ),
+        )
+        old_unkeyed, new_unkeyed = self.unkeyed
+        old_records = _iter_records(self.old, self.kind, old_unkeyed, chunk_size)
+        for id, record in zip(old_unkeyed, old_records):
+            yield (id, record), None
+        new_records = _iter_records(self.new, self.kind, new_unkeyed, chunk_size)
+        for id, record in zip(new_unkeyed, new_records):
+            yield None, (id, record)
+
+
+def _merge_join(
+    old_items: Iterable[tuple], new_items: Iterable[tuple], key=None
+) -> Iterator[tuple]:
+    """
+    Join pairs of join values and payloads ordered by the values' sort key.
+
+    Generate pairs of the old and new payloads where unmatched ones are None.
+
+    """
+    key = key or (lambda value: value)
+    old_iter = iter(old_items)
+    new_iter = iter(new_items)
+    old_item = next(old_iter, None)
+    new_item = next(new_iter, None)
+    while old_item is not None or new_item is not None:
+        if new_item is None or (
+            old_item is not None and key(old_item[0]) < key(new_item[0])
+        ):
+            yield old_item[1], None
+            old_item = next(old_iter, None)
+        elif old_item is None or key(new_item[0]) < key(old_item[0]):
+            yield None, new_item[1]
+            new_item = next(new_iter, None)
+        else:
+            yield old_item[1], new_item[1]
+            old_item = next(old_iter, None)
+            new_item = next(new_iter, None)
+
+
+def _iter_records(
+    snapshot: Snapshot, kind: str, ids: List[str], chunk_size: int
+) -> Iterator[ComponentRecord]:
+    """Generate the records of components in the order of the given identifiers."""
+    if isinstance(snapshot, ComponentsModel):
+        models = getattr(snapshot, f"{kind}s")
+        for id in ids:
+            yield to_record(models[id])
+        return
+    exporter = CoreExporter(snapshot, chunk_size=chunk_size)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start : start + chunk_size]
+        records = {
+            model.id: to_record(model)
+            for model in getattr(exporter, f"iter_{kind}s")([int(id) for id in chunk])
+        }
+        for id in chunk:
+            yield records[id]
+
+
+def _added_id(id: str) -> str:
+    """Return the identifier of a component added in a join on stable keys."""
+    return f"{ADDED_PREFIX}{id}" if id.isdigit() else id
+
+
+def _translate(
+    record: ComponentRecord, id: str, translations: Dict[str, Dict[str, str]]
+) -> ComponentRecord:
+    """Replace the identifier and the references of a new snapshot's record."""
+    if record.id != id:
+        record = record._replace(id=id)
+    if not translations or not hasattr(record, "reactants"):
+        return record
+    compounds = translations.get("compound", {})
+    compartments = translations.get("compartment", {})
+
+    def translate(participants: dict) -> dict:
+        return {
+            compounds.get(compound_id, compound_id): participant._replace(
+                compartment=compartments.get(
+                    participant.compartment, participant.compartment
+                )
+            )
+            for compound_id, participant in participants.items()
+        }
+
+    return record._replace(
+        reactants=translate(record.reactants), products=translate(record.products)
+    )
+
+
+def patch_components(
+    components: ComponentsModel, changes: Iterable[ComponentChange]
+) -> ComponentsModel:
+    """
+    Apply changes to a dump of components.
+
+    Parameters
+    ----------
+    components : cobra_component_models.io.ComponentsModel
+        The dump to be patched. It is not modified.
+    changes : iterable of ComponentChange
+        The changes, for example, from `diff_snapshots`.
+
+    Returns
+    -------
+    cobra_component_models.io.ComponentsModel
+        A new dump with the changes applied.
+
+    """
+    sections = {kind: dict(getattr(components, f"{kind}s") or {}) for kind in KINDS}
+    for change in changes:
+        if change.status == "removed":
+            sections[change.kind].pop(change.id, None)
+        else:
+            sections[change.kind][change.id] = to_model(change.record)
+    return ComponentsModel(**{f"{kind}s": models for kind, models in sections.items()})
+
+
+def apply_changes(
+    session, changes: Iterable[ComponentChange], chunk_size: int = 500
+) -> Dict[str, int]:
+    """
+    Apply changes to a database.
+
+    Components are added and changed in the order compartments, compounds, and
+    reactions, and removed in reverse order. Added components whose identifier is
+    a decimal number keep it as their primary key, such that a diff of the
+    patched database against the new snapshot is empty. Components added by a join
+    on stable keys never have such identifiers. Afterwards, PostgreSQL's
+    primary key sequences are advanced past the explicit primary keys.
+
+    Changed and removed components are identified by their primary keys. Reaction
+    participants refer to compounds and compartments either by primary key or by
+    the identifier of a component added by the same changes.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to the database to be patched.
+    changes : iterable of ComponentChange
+        The changes, for example, from `diff_snapshots`.
+    chunk_size : int, optional
+        The number of components removed per statement (default 500).
+
+    Returns
+    -------
+    dict
+        The number of applied changes per status.
+
+    Raises
+    ------
+    ValueError
+        If a changed or removed component is not identified by a primary key, or
+        if a reaction refers to an unknown compound or compartment.
+
+    """
+    grouped: Dict[Tuple[str, str], List[ComponentChange]] = {}
+    for change in changes:
+        if change.status != "added":
+            # Fail before anything is applied.
+            _primary_key(change)
+        grouped.setdefault((change.kind, change.status), []).append(change)
+    kwargs = {
+        "biology_qualifiers": BiologyQualifier.get_map(session),
+        "namespaces": Namespace.get_map(session),
+    }
+    counts = {"added": 0, "changed": 0, "removed": 0}
+    added: Dict[str, Dict[str, Base]] = {kind: {} for kind in KINDS}
+    for kind in KINDS:
+        builder = _make_builder(session, kind, grouped, kwargs, added)
+        component = get_component_kind(kind).component
+        for change in grouped.get((kind, "added"), []):
+            instance = builder.build_orm(change.record)
+            if change.id.isdigit():
+                instance.id = int(change.id)
+            session.add(instance)
+            added[kind][change.id] = instance
+            counts["added"] += 1
+        for change in grouped.get((kind, "changed"), []):
+            instance = session.query(component).get(_primary_key(change))
+            if instance is None:
+                raise ValueError(f"There is no {kind} with primary key {change.id}.")
+            _update(session, builder, instance, change)
+            counts["changed"] += 1
+        session.flush()
+    for kind in reversed(KINDS):
+        removed = grouped.get((kind, "removed"), [])
+        counts["removed"] += delete_components(
+            session, kind, [_primary_key(c) for c in removed], chunk_size=chunk_size
+        )
+    reset_sequences(session)
+    return counts
+
+
+def _primary_key(change: ComponentChange) -> int:
+    """Return the primary key of a changed or removed component."""
+    if not change.id.isdigit():
+        raise ValueError(
+            f"The {change.status} {change.kind} '{change.id}' must be identified by "
+            f"its primary key. Diffs are only meaningful between snapshots of the "
+            f"same database unless they are joined on stable keys."
+        )
+    return int(change.id)
+
+
+def _changed_fields(old: ComponentRecord, new: ComponentRecord) -> Tuple[str, ...]:
+    """Return the names of the fields that differ between two records."""
+    fields = []
+    for name in new._fields:
+        if name in IGNORED_FIELDS:
+            continue
+        old_value = getattr(old, name)
+        new_value = getattr(new, name)
+        if name in ("names", "annotation"):
+            old_value = _normalize(old_value)
+            new_value = _normalize(new_value)
+        if old_value != new_value:
+            fields.append(name)
+    return tuple(fields)
+
+
+def _normalize(mapping: dict) -> dict:
+    """Sort the names or annotation per namespace and drop empty namespaces."""
+    return {prefix: sorted(values) for prefix, values in mapping.items() if values}
+
+
+def _make_builder(
+    session, kind: str, grouped: dict, kwargs: dict, added: Dict[str, Dict[str, Base]]
+):
+    """Create a builder for the kind of component with resolved references."""
+    if kind == "compartment":
+        return CompartmentBuilder(**kwargs)
+    if kind == "compound":
+        return CompoundBuilder(**kwargs)
+    compound_ids = set()
+    compartment_ids = set()
+    for status in ("added", "changed"):
+        for change in grouped.get((kind, status), []):
+            record = change.record
+            for compound_id, participant in chain(
+                record.reactants.items(), record.products.items()
+            ):
+                compound_ids.add(compound_id)
+                compartment_ids.add(participant.compartment)
+    return ReactionBuilder(
+        id2compound=_resolve(session, Compound, compound_ids, added["compound"]),
+        id2compartment=_resolve(
+            session, Compartment, compartment_ids, added["compartment"]
+        ),
+        **kwargs,
+    )
+
+
+def _resolve(
+    session, cls: type, ids: Set[str], added: Dict[str, Base]
+) -> Dict[str, Base]:
+    """Map identifiers to added components or to existing ones by primary key."""
+    result = {id: added[id] for id in ids if id in added}
+    keys = sorted(int(id) for id in ids - set(result) if id.isdigit())
+    result.update((str(obj.id), obj) for obj in _load(session, cls, keys))
+    missing = ids - set(result)
+    if missing:
+        raise ValueError(
+            f"The reactions refer to {len(missing)} unknown "
+            f"{cls.__tablename__}: {', '.join(sorted(missing))}. Diffs are only "
+            f"meaningful between snapshots of the same database unless they are "
+            f"joined on stable keys."
+        )
+    return result
+
+
+def _load(session, cls, ids: List[int], chunk_size: int = 500) -> list:
+    """Load instances by their primary keys in chunks."""
+    result = []
+    for start in range(0, len(ids), chunk_size):
+        result.extend(
+            session.query(cls).filter(cls.id.in_(ids[start : start + chunk_size]))
+        )
+    return result
+
+
+def _update(session, builder, instance, change: ComponentChange) -> None:
+    """Update a component's attributes and replace its changed children."""
+    kind = get_component_kind(change.kind)
+    record = change.record
+    annotation = dict(record.annotation)
+    # Old children are deleted before new ones are inserted since they would
+    # otherwise violate unique constraints within a single flush.
+    if "names" in change.fields:
+        instance.names = []
+    if "annotation" in change.fields:
+        instance.annotation = []
+    if "reactants" in change.fields or "products" in change.fields:
+        instance.participants = []
+    if "chemical_formula" in change.fields:
+        instance.elements = []
+    session.flush()
+    instance.notes = record.notes
+    if change.kind == "compound":
+        for key, column in STRUCTURE_COLUMNS.items():
+            structures = annotation.pop(key, [])
+            setattr(instance, column, structures[0].identifier if structures else None)
+        instance.charge = record.charge
+        if "chemical_formula" in change.fields:
+            instance.chemical_formula = record.chemical_formula
+            set_formula_attributes(instance)
+    if "names" in change.fields:
+        instance.names.extend(builder.build_orm_names(record.names, kind.name_class))
+    if "annotation" in change.fields:
+        instance.annotation.extend(
+            builder.build_orm_annotation(annotation, kind.annotation_class)
+        )
+    if "reactants" in change.fields or "products" in change.fields:
+        instance.participants.extend(
+            builder.build_orm_participants(
+                reactants=record.reactants, products=record.products
+            )
+        )
@@ -0,0 +1,233 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide aggregate statistics and health checks of a component database."""
+
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, func, inspect, or_, select, text
+
+from ..orm import Base, Compartment, Compound, Namespace, Participant
+from .component_kind import COMPONENT_KINDS, ComponentKind
+
+
+class IndexUsage(NamedTuple):
+    """
+    Define the usage of one database index.
+
+    Attributes
+    ----------
+    table : str
+        The name of the indexed table.
+    name : str
+        The name of the index.
+    columns : tuple of str
+        The indexed columns.
+    scans : int, optional
+        The number of index scans since the statistics were last reset. Only
+        PostgreSQL tracks them; it is None for other databases.
+
+    """
+
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+    scans: Optional[int] = None
+
+
+class DatabaseStatistics(NamedTuple):
+    """
+    Define aggregate statistics of a component database.
+
+    Attributes
+    ----------
+    row_counts : dict
+        The number of rows per table.
+    names_per_namespace : dict
+        The number of names per kind of component and namespace prefix. Names
+        without namespace are counted under None.
+    annotations_per_namespace : dict
+        The number of annotations per kind of component and namespace prefix.
+    orphaned_names : dict
+        The number of names per kind of component whose component does not exist.
+    orphaned_annotations : dict
+        The number of annotations per kind of component whose component does not
+        exist.
+    compounds_without_structure : int
+        The number of compounds without InChI, InChIKey, and SMILES.
+    reactions_with_missing_compartments : int
+        The number of reactions with at least one participant whose compartment is
+        unset or does not exist.
+    indexes : list of IndexUsage
+        The indexes of all component tables.
+
+    """
+
+    row_counts: Dict[str, int]
+    names_per_namespace: Dict[str, Dict[Optional[str], int]]
+    annotations_per_namespace: Dict[str, Dict[str, int]]
+    orphaned_names: Dict[str, int]
+    orphaned_annotations: Dict[str, int]
+    compounds_without_structure: int
+    reactions_with_missing_compartments: int
+    indexes: List[IndexUsage]
+
+
+def stats(session) -> DatabaseStatistics:
+    """
+    Compute aggregate statistics of the component tables.
+
+    All statistics are computed with aggregate queries on plain tables. No ORM
+    instances are loaded, such that the cost is independent of the size of the
+    identity map and a few queries suffice for databases of any size.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+        A SQLAlchemy session giving access to a database.
+
+    Returns
+    -------
+    DatabaseStatistics
+        The table sizes, per namespace counts, data quality problems, and index
+        usage.
+
+    """
+    names_per_namespace = {}
+    annotations_per_namespace = {}
+    orphaned_names = {}
+    orphaned_annotations = {}
+    for kind in COMPONENT_KINDS.values():
+        names_per_namespace[kind.name] = _count_per_namespace(
+            session, kind.name_class.__table__
+        )
+        annotations_per_namespace[kind.name] = _count_per_namespace(
+            session, kind.annotation_class.__table__
+        )
+        orphaned_names[kind.name] = _count_orphans(
+            session, kind, kind.name_class.__table__
+        )
+        orphaned_annotations[kind.name] = _count_orphans(
+            session, kind, kind.annotation_class.__table__
+        )
+    return DatabaseStatistics(
+        row_counts=_count_rows(session),
+        names_per_namespace=names_per_namespace,
+        annotations_per_namespace=annotations_per_namespace,
+        orphaned_names=orphaned_names,
+        orphaned_annotations=orphaned_annotations,
+        compounds_without_structure=_count_compounds_without_structure(session),
+        reactions_with_missing_compartments=_count_missing_compartments(session),
+        indexes=_index_usage(session),
+    )
+
+
+def _count_rows(session) -> Dict[str, int]:
+    """Count the rows of all tables in a single query."""
+    tables = sorted(Base.metadata.tables.items())
+    query = select(
+        [
+            select([func.count()]).select_from(table).label(name)
+            for name, table in tables
+        ]
+    )
+    row = session.execute(query).first()
+    return {name: count for (name, _), count in zip(tables, row)}
+
+
+def _count_per_namespace(session, table) -> Dict[Optional[str], int]:
+    """Count the rows of a name or annotation table per namespace prefix."""
+    namespaces = Namespace.__table__
+    query = (
+        select([namespaces.c.prefix, func.count()])
+        .select_from(
+            table.outerjoin(namespaces, table.c.namespace_id == namespaces.c.id)
+        )
+        .group_by(namespaces.c.prefix)
+    )
+    return {prefix: count for prefix, count in session.execute(query)}
+
+
+def _count_orphans(session, kind: ComponentKind, table) -> int:
+    """Count the rows of a child table whose component does not exist."""
+    components = kind.component.__table__
+    foreign_key = table.c[kind.foreign_key]
+    query = (
+        select([func.count()])
+        .select_from(table.outerjoin(components, foreign_key == components.c.id))
+        .where(components.c.id.is_(None))
+    )
+    return session.execute(query).scalar()
+
+
+def _count_compounds_without_structure(session) -> int:
+    """Count the compounds that have neither InChI, InChIKey, nor SMILES."""
+    compounds = Compound.__table__
+    query = select([func.count()]).where(
+        and_(
+            compounds.c.inchi.is_(None),
+            compounds.c.inchi_key.is_(None),
+            compounds.c.smiles.is_(None),
+        )
+    )
+    return session.execute(query).scalar()
+
+
+def _count_missing_compartments(session) -> int:
+    """Count the reactions with participants in unset or unknown compartments."""
+    participants = Participant.__table__
+    compartments = Compartment.__table__
+    query = (
+        select([func.count(participants.c.reaction_id.distinct())])
+        .select_from(
+            participants.outerjoin(
+                compartments, participants.c.compartment_id == compartments.c.id
+            )
+        )
+        .where(
+            or_(participants.c.compartment_id.is_(None), compartments.c.id.is_(None))
+        )
+    )
+    return session.execute(query).scalar()
+
+
+def _index_usage(session) -> List[IndexUsage]:
+    """List the indexes of all tables with their number of scans if available."""
+    connection = session.connection()
+    inspector = inspect(connection)
+    scans = {}
+    if connection.dialect.name == "postgresql":
+        scans = {
+            (table, name): num
+            for table, name, num in connection.execute(
+                text(
+                    "SELECT relname, indexrelname, idx_scan "
+                    "FROM pg_stat_user_indexes"
+                )
+            )
+        }
+    result = []
+    for table in sorted(Base.metadata.tables):
+        for index in inspector.get_indexes(table):
+            result.append(
+                IndexUsage(
+                    table=table,
+                    name=index["name"],
+                    columns=tuple(index["column_names"]),
+                    scans=scans.get((table, index["name"])),
+                )
+            )
+    return result
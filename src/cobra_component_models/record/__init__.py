@@ -0,0 +1,27 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide lightweight records of components for in-process pipelines."""
+
+
+from .component_records import (
+    AnnotationRecord,
+    CompartmentRecord,
+    CompoundRecord,
+    NameRecord,
+    ParticipantRecord,
+    ReactionRecord,
+)
+from .conversion import ComponentRecord, to_model, to_record
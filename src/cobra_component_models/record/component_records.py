@@ -0,0 +1,104 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Provide immutable records with the same fields as the IO models.
+
+Records are named tuples and thus neither carry a per-instance dictionary nor
+any validation. They are meant for pipelines that keep large numbers of
+components in memory without leaving the process. The builders consume them in
+place of IO models and emit them with their `build_record` methods. Use
+:func:`cobra_component_models.record.to_model` where validation or JSON
+serialization is needed.
+
+"""
+
+
+from typing import Dict, List, NamedTuple, Optional
+
+
+class NameRecord(NamedTuple):
+    """Define a component name record."""
+
+    name: str
+    is_preferred: bool = False
+
+
+class AnnotationRecord(NamedTuple):
+    """Define a component annotation record."""
+
+    biology_qualifier: str
+    identifier: str
+    is_deprecated: bool = False
+
+
+class ParticipantRecord(NamedTuple):
+    """Define a reactant/product record."""
+
+    stoichiometry: str
+    compartment: str
+
+
+class CompartmentRecord(NamedTuple):
+    """
+    Define a compartment record.
+
+    Names and annotation map namespace prefixes to lists of name and annotation
+    records, respectively.
+
+    """
+
+    id: str
+    names: Dict[str, List[NameRecord]]
+    annotation: Dict[str, List[AnnotationRecord]]
+    notes: Optional[str] = None
+    sbo_term: Optional[str] = None
+
+
+class CompoundRecord(NamedTuple):
+    """
+    Define a compound record.
+
+    Names and annotation map namespace prefixes to lists of name and annotation
+    records, respectively.
+
+    """
+
+    id: str
+    names: Dict[str, List[NameRecord]]
+    annotation: Dict[str, List[AnnotationRecord]]
+    notes: Optional[str] = None
+    sbo_term: Optional[str] = None
+    charge: Optional[float] = None
+    chemical_formula: Optional[str] = None
+
+
+class ReactionRecord(NamedTuple):
+    """
+    Define a reaction record.
+
+    Names and annotation map namespace prefixes to lists of name and annotation
+    records, respectively. Reactants and products map compound identifiers to
+    participant records.
+
+    """
+
+    id: str
+    names: Dict[str, List[NameRecord]]
+    annotation: Dict[str, List[AnnotationRecord]]
+    reactants: Dict[str, ParticipantRecord]
+    products: Dict[str, ParticipantRecord]
+    notes: Optional[str] = None
+    sbo_term: Optional[str] = None
@@ -0,0 +1,192 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide conversions between IO models and records."""
+
+
+from typing import Dict, Union
+
+from ..io import (
+    AbstractBaseModel,
+    AnnotationModel,
+    CompartmentModel,
+    CompoundModel,
+    NameModel,
+    ParticipantModel,
+    ReactionModel,
+)
+from .component_records import (
+    AnnotationRecord,
+    CompartmentRecord,
+    CompoundRecord,
+    NameRecord,
+    ParticipantRecord,
+    ReactionRecord,
+)
+
+
+ComponentRecord = Union[CompartmentRecord, CompoundRecord, ReactionRecord]
+
+
+def to_record(model: AbstractBaseModel) -> ComponentRecord:
+    """
+    Convert a compartment, compound, or reaction IO model to a record.
+
+    Parameters
+    ----------
+    model : cobra_component_models.io.AbstractBaseModel
+        A compartment, compound, or reaction pydantic data model.
+
+    Returns
+    -------
+    CompartmentRecord or CompoundRecord or ReactionRecord
+        A record with the same field values.
+
+    Raises
+    ------
+    TypeError
+        If the model is of any other type.
+
+    """
+    if not isinstance(model, (CompartmentModel, CompoundModel, ReactionModel)):
+        raise TypeError(f"Cannot convert a {type(model).__name__} to a record.")
+    names = {
+        prefix: [NameRecord(n.name, n.is_preferred) for n in name_models]
+        for prefix, name_models in model.names.items()
+    }
+    annotation = {
+        prefix: [
+            AnnotationRecord(a.biology_qualifier, a.identifier, a.is_deprecated)
+            for a in annotation_models
+        ]
+        for prefix, annotation_models in model.annotation.items()
+    }
+    if isinstance(model, CompoundModel):
+        return CompoundRecord(
+            id=model.id,
+            names=names,
+            annotation=annotation,
+            notes=model.notes,
+            sbo_term=model.sbo_term,
+            charge=model.charge,
+            chemical_formula=model.chemical_formula,
+        )
+    if isinstance(model, ReactionModel):
+        return ReactionRecord(
+            id=model.id,
+            names=names,
+            annotation=annotation,
+            reactants=_to_participant_records(model.reactants),
+            products=_to_participant_records(model.products),
+            notes=model.notes,
+            sbo_term=model.sbo_term,
+        )
+    return CompartmentRecord(
+        id=model.id,
+        names=names,
+        annotation=annotation,
+        notes=model.notes,
+        sbo_term=model.sbo_term,
+    )
+
+
+def to_model(record: ComponentRecord) -> AbstractBaseModel:
+    """
+    Convert a compartment, compound, or reaction record to a validated IO model.
+
+    Parameters
+    ----------
+    record : CompartmentRecord or CompoundRecord or ReactionRecord
+        A component record.
+
+    Returns
+    -------
+    cobra_component_models.io.AbstractBaseModel
+        A pydantic data model of the corresponding type.
+
+    Raises
+    ------
+    TypeError
+        If the record is of any other type.
+    pydantic.ValidationError
+        If the record's values are invalid.
+
+    """
+    if not isinstance(record, (CompartmentRecord, CompoundRecord, ReactionRecord)):
+        raise TypeError(f"Cannot convert a {type(record).__name__} to a model.")
+    names = {
+        prefix: [NameModel(name=n.name, is_preferred=n.is_preferred) for n in records]
+        for prefix, records in record.names.items()
+    }
+    annotation = {
+        prefix: [
+            AnnotationModel(
+                biology_qualifier=a.biology_qualifier,
+                identifier=a.identifier,
+                is_deprecated=a.is_deprecated,
+            )
+            for a in records
+        ]
+        for prefix, records in record.annotation.items()
+    }
+    if isinstance(record, CompoundRecord):
+        return CompoundModel(
+            id=record.id,
+            names=names,
+            annotation=annotation,
+            notes=record.notes,
+            sbo_term=record.sbo_term,
+            charge=record.charge,
+            chemical_formula=record.chemical_formula,
+        )
+    if isinstance(record, ReactionRecord):
+        return ReactionModel(
+            id=record.id,
+            names=names,
+            annotation=annotation,
+            reactants=_to_participant_models(record.reactants),
+            products=_to_participant_models(record.products),
+            notes=record.notes,
+            sbo_term=record.sbo_term,
+        )
+    return CompartmentModel(
+        id=record.id,
+        names=names,
+        annotation=annotation,
+        notes=record.notes,
+        sbo_term=record.sbo_term,
+    )
+
+
+def _to_participant_records(
+    participants: Dict[str, ParticipantModel]
+) -> Dict[str, ParticipantRecord]:
+    """Convert participant models to records."""
+    return {
+        compound_id: ParticipantRecord(p.stoichiometry, p.compartment)
+        for compound_id, p in participants.items()
+    }
+
+
+def _to_participant_models(
+    participants: Dict[str, ParticipantRecord]
+) -> Dict[str, ParticipantModel]:
+    """Convert participant records to models."""
+    return {
+        compound_id: ParticipantModel(
+            stoichiometry=p.stoichiometry, compartment=p.compartment
+        )
+        for compound_id, p in participants.items()
+    }
@@ -0,0 +1,114 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that the mass and charge balance of reactions is checked correctly."""
+
+
+from typing import Dict
+
+import numpy as np
+import pytest
+
+from cobra_component_models.analysis import check_mass_balance
+from cobra_component_models.builder import CompoundBuilder
+from cobra_component_models.io import CompoundModel
+from cobra_component_models.orm import Compound, Participant, Reaction
+
+
+@pytest.fixture(scope="function")
+def compounds(session, biology_qualifiers, namespaces) -> Dict[str, Compound]:
+    """Return compounds with chemical formulae and charges."""
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    data = {
+        "ethanol": ("C2H6O", 0),
+        "nad": ("C21H26N7O14P2", -1),
+        "acetaldehyde": ("C2H4O", 0),
+        "h": ("H", 1),
+        "nadh": ("C21H27N7O14P2", -2),
+        "protein": ("(C6H10O5)n", None),
+    }
+    result = {}
+    for id, (formula, charge) in data.items():
+        compound = builder.build_orm(
+            CompoundModel(id=id, chemical_formula=formula, charge=charge)
+        )
+        session.add(compound)
+        result[id] = compound
+    session.commit()
+    return result
+
+
+def make_reaction(compounds, reactants, products) -> Reaction:
+    """Create a reaction from pairs of compound identifiers and coefficients."""
+    reaction = Reaction()
+    for is_product, side in ((False, reactants), (True, products)):
+        for compound_id, stoichiometry in side:
+            reaction.participants.append(
+                Participant(
+                    compound=compounds[compound_id],
+                    stoichiometry=stoichiometry,
+                    is_product=is_product,
+                )
+            )
+    return reaction
+
+
+def test_check_mass_balance(session, compounds):
+    """Expect that balanced, unbalanced, and unknown reactions are recognized."""
+    balanced = make_reaction(
+        compounds,
+        [("ethanol", "1"), ("nad", "1")],
+        [("acetaldehyde", "1"), ("h", "1"), ("nadh", "1")],
+    )
+    unbalanced = make_reaction(
+        compounds, [("ethanol", "1"), ("nad", "1")], [("acetaldehyde", "1")]
+    )
+    doubled = make_reaction(compounds, [("h", "2")], [("h", "2.0")])
+    unknown = make_reaction(compounds, [("protein", "1")], [("h", "1")])
+    session.add_all([balanced, unbalanced, doubled, unknown])
+    session.commit()
+    result = check_mass_balance(session)
+    assert result.reaction_ids.tolist() == [
+        balanced.id,
+        unbalanced.id,
+        doubled.id,
+        unknown.id,
+    ]
+    assert result.elements == ["C", "H", "N", "O", "P"]
+    assert result.is_mass_balanced().tolist() == [True, False, True, False]
+    assert result.is_charge_balanced().tolist() == [True, False, True, False]
+    assert result.is_checkable().tolist() == [True, True, True, False]
+    np.testing.assert_allclose(result.element_imbalance[1], [-21, -28, -7, -14, -2])
+    assert result.charge_imbalance[1] == 1
+
+
+def test_check_selected_reactions(session, compounds):
+    """Expect that only the given reactions are checked."""
+    first = make_reaction(compounds, [("h", "1")], [("h", "1")])
+    second = make_reaction(compounds, [("h", "1")], [("nad", "1")])
+    session.add_all([first, second])
+    session.commit()
+    result = check_mass_balance(session, [second.id])
+    assert result.reaction_ids.tolist() == [second.id]
+    assert not result.is_mass_balanced()[0]
+
+
+def test_check_empty(session):
+    """Expect that a database without reactions yields an empty result."""
+    result = check_mass_balance(session)
+    assert len(result.reaction_ids) == 0
+    assert result.elements == []
@@ -0,0 +1,108 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that the compound-reaction network is exported as CSR arrays."""
+
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from cobra_component_models.analysis import build_network
+from cobra_component_models.builder import ReactionBuilder
+from cobra_component_models.io import ReactionModel
+from cobra_component_models.orm import Participant, Reaction
+
+
+@pytest.fixture(scope="function")
+def reactions(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    reactions_data,
+) -> List[Reaction]:
+    """Return the dehydrogenase and a second reaction without cofactors."""
+    dehydrogenase = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        id2compartment=id2compartments,
+        id2compound=id2compounds,
+    ).build_orm(ReactionModel.parse_obj(reactions_data["dehydrogenase"]))
+    oxidation = Reaction()
+    oxidation.participants.append(
+        Participant(
+            compound=id2compounds["ethanol"], stoichiometry="2", is_product=False
+        )
+    )
+    oxidation.participants.append(
+        Participant(
+            compound=id2compounds["acetaldehyde"], stoichiometry="2", is_product=True
+        )
+    )
+    session.add_all([dehydrogenase, oxidation])
+    session.commit()
+    return [dehydrogenase, oxidation]
+
+
+def test_network(session, id2compounds, reactions):
+    """Expect that both adjacency indexes describe the same edges."""
+    network = build_network(session)
+    assert network.reaction_ids.tolist() == [r.id for r in reactions]
+    assert network.compound_ids.tolist() == sorted(c.id for c in id2compounds.values())
+    compound_index = network.compound_ids.tolist()
+    assert network.reaction_compounds.degrees().tolist() == [5, 2]
+    ethanol = compound_index.index(id2compounds["ethanol"].id)
+    acetaldehyde = compound_index.index(id2compounds["acetaldehyde"].id)
+    assert network.compound_reactions.neighbors(ethanol).tolist() == [0, 1]
+    assert network.compound_reactions.edge_weights(ethanol).tolist() == [-1.0, -2.0]
+    assert network.reaction_compounds.neighbors(1).tolist() == sorted(
+        [ethanol, acetaldehyde]
+    )
+    assert network.compound_reactions.indptr[-1] == 7
+    assert np.array_equal(
+        np.sort(network.compound_reactions.weights),
+        np.sort(network.reaction_compounds.weights),
+    )
+
+
+def test_currency_metabolites(session, id2compounds, reactions):
+    """Expect that compounds annotated as currency metabolites are excluded."""
+    network = build_network(
+        session,
+        currency_metabolites={
+            "chebi": ["CHEBI:57540", "CHEBI:57945", "CHEBI:15378"],
+        },
+    )
+    assert network.compound_ids.tolist() == sorted(
+        [id2compounds["ethanol"].id, id2compounds["acetaldehyde"].id]
+    )
+    assert network.reaction_compounds.degrees().tolist() == [2, 2]
+
+
+def test_reaction_ids(session, reactions):
+    """Expect that the network is restricted to the given reactions."""
+    network = build_network(session, reaction_ids=[reactions[1].id])
+    assert network.reaction_ids.tolist() == [reactions[1].id]
+    assert network.compound_reactions.degrees().tolist() == [1, 1]
+
+
+def test_empty(session):
+    """Expect that an empty database yields an empty network."""
+    network = build_network(session)
+    assert len(network.compound_ids) == 0
+    assert network.compound_reactions.indptr.tolist() == [0]
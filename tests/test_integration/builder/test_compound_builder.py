@@ -16,6 +16,8 @@
 """Expect that compounds can be de-/serialized and selected/inserted."""
 
 
+import pytest
+
 from cobra_component_models.builder import CompoundBuilder
 from cobra_component_models.io import CompoundModel
 from cobra_component_models.orm import Compound, CompoundAnnotation, CompoundName
@@ -128,3 +130,184 @@ def test_build_full_orm_compound(session, biology_qualifiers, namespaces):
         "CHEBI:44594",
         "CHEBI:42377",
     }
+
+
+def test_upsert_new_compounds(session, biology_qualifiers, namespaces, compounds_data):
+    """Expect that unmatched compounds are inserted."""
+    models = [CompoundModel.parse_obj(data) for data in compounds_data.values()]
+    compounds = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    ).upsert(session, models, match_on="chebi", chunk_size=2)
+    assert len(compounds) == len(models)
+    assert all(c.id is not None for c in compounds)
+    assert session.query(Compound).count() == len(models)
+
+
+def test_upsert_is_idempotent(session, biology_qualifiers, namespaces, compounds_data):
+    """Expect that repeatedly upserting the same compounds changes nothing."""
+    models = [CompoundModel.parse_obj(data) for data in compounds_data.values()]
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    first = builder.upsert(session, models)
+    session.commit()
+    num_names = session.query(CompoundName).count()
+    num_annotation = session.query(CompoundAnnotation).count()
+    second = builder.upsert(session, models, match_on="chebi")
+    session.commit()
+    assert [c.id for c in first] == [c.id for c in second]
+    assert session.query(Compound).count() == len(models)
+    assert session.query(CompoundName).count() == num_names
+    assert session.query(CompoundAnnotation).count() == num_annotation
+
+
+def test_upsert_merges_by_inchikey(
+    session, biology_qualifiers, namespaces, compounds_data
+):
+    """Expect that names and annotation are merged into a matching compound."""
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    (ethanol,) = builder.upsert(
+        session, [CompoundModel.parse_obj(compounds_data["ethanol"])]
+    )
+    session.commit()
+    other = CompoundModel.parse_obj(
+        {
+            "id": "EtOH",
+            "charge": 0,
+            "names": {"chebi": [{"name": "ethanol"}, {"name": "ethyl alcohol"}]},
+            "annotation": {
+                "chebi": [
+                    {"biology_qualifier": "is", "identifier": "CHEBI:16236"},
+                    {"biology_qualifier": "is", "identifier": "CHEBI:30880"},
+                ],
+                "inchikey": [
+                    {
+                        "biology_qualifier": "is",
+                        "identifier": "LFQSCWFLJHTTHZ-UHFFFAOYSA-N",
+                    }
+                ],
+            },
+        }
+    )
+    (result,) = builder.upsert(session, [other])
+    session.commit()
+    assert result is ethanol
+    assert session.query(Compound).count() == 1
+    assert ethanol.charge == 0
+    assert {n.name for n in ethanol.names} == {
+        "ethanol",
+        "Aethanol",
+        "Alkohol",
+        "ethyl alcohol",
+    }
+    assert {a.identifier for a in ethanol.annotation} == {
+        "CHEBI:16236",
+        "CHEBI:44594",
+        "CHEBI:42377",
+        "CHEBI:30880",
+    }
+
+
+def test_upsert_merges_within_data(session, biology_qualifiers, namespaces):
+    """Expect that compounds matching each other within the data are merged."""
+    models = [
+        CompoundModel.parse_obj(
+            {
+                "id": str(i),
+                "names": {"chebi": [{"name": name}]},
+                "annotation": {
+                    "chebi": [{"biology_qualifier": "is", "identifier": "CHEBI:15377"}]
+                },
+            }
+        )
+        for i, name in enumerate(["water", "H2O", "water"])
+    ]
+    compounds = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    ).upsert(session, models, match_on="chebi")
+    session.commit()
+    assert len({c.id for c in compounds}) == 1
+    assert {n.name for n in compounds[0].names} == {"water", "H2O"}
+
+
+def test_upsert_by_qualifiers(session, biology_qualifiers, namespaces):
+    """Expect that only annotation with the given qualifiers matches compounds."""
+    models = [
+        CompoundModel.parse_obj(
+            {
+                "id": id,
+                "annotation": {
+                    "chebi": [
+                        {"biology_qualifier": "is", "identifier": identifier},
+                        {
+                            "biology_qualifier": "isVersionOf",
+                            "identifier": "CHEBI:13389",
+                        },
+                    ]
+                },
+            }
+        )
+        for id, identifier in [("nad", "CHEBI:57540"), ("nadh", "CHEBI:57945")]
+    ]
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    compounds = builder.upsert(session, models, match_on="chebi", qualifiers=["is"])
+    session.commit()
+    assert len({c.id for c in compounds}) == 2
+    again = builder.upsert(session, models, match_on="chebi", qualifiers=["is"])
+    assert [c.id for c in again] == [c.id for c in compounds]
+
+
+def _structure_model(id, chebi, inchi_key=None):
+    annotation = {"chebi": [{"biology_qualifier": "is", "identifier": chebi}]}
+    if inchi_key is not None:
+        annotation["inchikey"] = [{"biology_qualifier": "is", "identifier": inchi_key}]
+    return CompoundModel.parse_obj({"id": id, "annotation": annotation})
+
+
+def test_upsert_fills_in_structures(session, biology_qualifiers, namespaces):
+    """Expect that a missing InChIKey is filled in and reused for matching."""
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    (compound,) = builder.upsert(
+        session, [_structure_model("etoh", "CHEBI:16236")], match_on="chebi"
+    )
+    session.commit()
+    key = "LFQSCWFLJHTTHZ-UHFFFAOYSA-N"
+    (merged,) = builder.upsert(
+        session, [_structure_model("etoh", "CHEBI:16236", key)], match_on="chebi"
+    )
+    session.commit()
+    assert merged.id == compound.id
+    assert merged.inchi_key == key
+    (again,) = builder.upsert(
+        session, [_structure_model("ethanol", "CHEBI:30880", key)], match_on="chebi"
+    )
+    assert again.id == compound.id
+    assert session.query(Compound).count() == 1
+
+
+def test_upsert_structure_conflict(session, biology_qualifiers, namespaces):
+    """Expect that an InChIKey stored on another compound is rejected."""
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    key = "LFQSCWFLJHTTHZ-UHFFFAOYSA-N"
+    builder.upsert(
+        session,
+        [
+            _structure_model("etoh", "CHEBI:16236", key),
+            _structure_model("acald", "CHEBI:15343"),
+        ],
+        match_on="chebi",
+    )
+    session.commit()
+    with pytest.raises(ValueError, match=r"acald \(LFQSCWFLJHTTHZ"):
+        builder.upsert(
+            session, [_structure_model("acald", "CHEBI:15343", key)], match_on="chebi"
+        )
+    assert session.query(Compound).filter_by(inchi_key=key).count() == 1
@@ -142,3 +142,74 @@ def test_build_full_orm_reaction(
         compartment_id = compartments2id[part.compartment]
         assert compartment_id == part_data["compartment"]
         assert part.stoichiometry == part_data["stoichiometry"]
+
+
+def test_resolve_participants_by_primary_key(
+    session, biology_qualifiers, namespaces, id2compartments, id2compounds
+):
+    """Expect that referenced compounds and compartments are fetched by key."""
+    ethanol = id2compounds["ethanol"]
+    nad = id2compounds["nad"]
+    compartment = id2compartments["c"]
+    obj = ReactionModel(
+        id="1",
+        reactants={
+            str(ethanol.id): {"compartment": str(compartment.id), "stoichiometry": "1"}
+        },
+        products={
+            str(nad.id): {"compartment": str(compartment.id), "stoichiometry": "1"}
+        },
+    )
+    builder = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    builder.resolve_participants(session, [obj])
+    assert builder.id2compound == {str(ethanol.id): ethanol, str(nad.id): nad}
+    assert builder.id2compartment == {str(compartment.id): compartment}
+    reaction = builder.build_orm(obj)
+    assert {p.compound for p in reaction.participants} == {ethanol, nad}
+
+
+def test_resolve_participants_by_namespace(
+    session, biology_qualifiers, namespaces, id2compartments, id2compounds
+):
+    """Expect that referenced compounds and compartments are fetched by annotation."""
+    obj = ReactionModel(
+        id="1",
+        reactants={"CHEBI:16236": {"compartment": "GO:0005737", "stoichiometry": "1"}},
+        products={"CHEBI:15343": {"compartment": "GO:0005737", "stoichiometry": "1"}},
+    )
+    builder = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    builder.resolve_participants(
+        session, [obj], compound_namespace="chebi", compartment_namespace="go"
+    )
+    assert builder.id2compound == {
+        "CHEBI:16236": id2compounds["ethanol"],
+        "CHEBI:15343": id2compounds["acetaldehyde"],
+    }
+    assert builder.id2compartment == {"GO:0005737": id2compartments["c"]}
+
+
+@pytest.mark.raises(
+    exception=ValueError,
+    message="2 unknown compound(s) and 1 unknown compartment(s). "
+    "Compounds: 999, foo. Compartments: bar.",
+)
+def test_resolve_missing_participants(
+    session, biology_qualifiers, namespaces, id2compartments, id2compounds
+):
+    """Expect that all missing references are reported at once."""
+    ethanol = id2compounds["ethanol"]
+    obj = ReactionModel(
+        id="1",
+        reactants={
+            str(ethanol.id): {"compartment": "bar", "stoichiometry": "1"},
+            "foo": {"compartment": "bar", "stoichiometry": "1"},
+        },
+        products={"999": {"compartment": "bar", "stoichiometry": "1"}},
+    )
+    ReactionBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    ).resolve_participants(session, [obj])
@@ -0,0 +1,92 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that the builders consume and emit records like IO models."""
+
+
+from cobra_component_models.builder import (
+    CompartmentBuilder,
+    CompoundBuilder,
+    ReactionBuilder,
+)
+from cobra_component_models.io import CompartmentModel, CompoundModel, ReactionModel
+from cobra_component_models.record import to_record
+
+
+def normalize(mapping: dict) -> dict:
+    """Sort the records per namespace since their database order is arbitrary."""
+    return {prefix: sorted(records) for prefix, records in mapping.items()}
+
+
+def test_compartment_records(
+    session, biology_qualifiers, namespaces, compartments_data
+):
+    """Expect that compartment records round-trip through the database."""
+    builder = CompartmentBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    record = to_record(CompartmentModel.parse_obj(compartments_data["c"]))
+    compartment = builder.build_orm(record)
+    session.add(compartment)
+    session.commit()
+    assert builder.build_record(compartment) == to_record(builder.build_io(compartment))
+    result = builder.build_record(compartment)
+    assert normalize(result.names) == normalize(record.names)
+    assert normalize(result.annotation) == normalize(record.annotation)
+
+
+def test_compound_records(session, biology_qualifiers, namespaces, compounds_data):
+    """Expect that compound records round-trip through the database."""
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    record = to_record(CompoundModel.parse_obj(compounds_data["ethanol"]))
+    compound = builder.build_orm(record)
+    session.add(compound)
+    session.commit()
+    assert compound.inchi_key == record.annotation["inchikey"][0].identifier
+    result = builder.build_record(compound)
+    assert result == to_record(builder.build_io(compound))
+    assert normalize(result.annotation) == normalize(record.annotation)
+    assert normalize(result.names) == normalize(record.names)
+
+
+def test_reaction_records(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    compartments2id,
+    compounds2id,
+    reactions_data,
+):
+    """Expect that reaction records round-trip through the database."""
+    builder = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        id2compartment=id2compartments,
+        id2compound=id2compounds,
+        compartment2id=compartments2id,
+        compound2id=compounds2id,
+    )
+    record = to_record(ReactionModel.parse_obj(reactions_data["dehydrogenase"]))
+    reaction = builder.build_orm(record)
+    session.add(reaction)
+    session.commit()
+    result = builder.build_record(reaction)
+    assert result == to_record(builder.build_io(reaction))
+    assert result.reactants == record.reactants
+    assert result.products == record.products
@@ -0,0 +1,141 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that serialized components are cached and invalidated correctly."""
+
+
+import json
+
+import pytest
+
+from cobra_component_models.builder import CompoundBuilder, SerializationCache
+from cobra_component_models.orm import CompoundName
+
+
+@pytest.fixture(scope="function")
+def cache(biology_qualifiers, namespaces) -> SerializationCache:
+    """Return a listening serialization cache for compounds."""
+    cache = SerializationCache(
+        CompoundBuilder(biology_qualifiers=biology_qualifiers, namespaces=namespaces),
+        maxsize=2,
+    )
+    cache.listen()
+    try:
+        yield cache
+    finally:
+        cache.close()
+
+
+@pytest.mark.raises(exception=ValueError, message="positive integer")
+def test_invalid_size():
+    """Expect that a cache needs space for at least one entry."""
+    SerializationCache(CompoundBuilder(biology_qualifiers={}, namespaces={}), 0)
+
+
+def test_hit(cache, id2compounds):
+    """Expect that a repeated serialization is served from the cache."""
+    ethanol = id2compounds["ethanol"]
+    first = cache.get_json(ethanol)
+    assert json.loads(first)["id"] == str(ethanol.id)
+    assert cache.get_json(ethanol) is first
+    stats = cache.statistics
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+
+
+def test_eviction(cache, id2compounds):
+    """Expect that the least recently used entry is evicted."""
+    ethanol, nad, nadh = (id2compounds[i] for i in ("ethanol", "nad", "nadh"))
+    cache.get_json(ethanol)
+    cache.get_json(nad)
+    cache.get_json(ethanol)
+    cache.get_json(nadh)
+    assert cache.statistics.evictions == 1
+    cache.get_json(ethanol)
+    assert cache.statistics.hits == 2
+    cache.get_json(nad)
+    assert cache.statistics.misses == 4
+
+
+def test_update_invalidation(session, cache, id2compounds):
+    """Expect that updating a compound invalidates its entry."""
+    ethanol = id2compounds["ethanol"]
+    cache.get_json(ethanol)
+    ethanol.notes = "updated"
+    session.commit()
+    assert cache.statistics.invalidations == 1
+    assert json.loads(cache.get_json(ethanol))["notes"] == "updated"
+
+
+def test_child_invalidation(session, namespaces, cache, id2compounds):
+    """Expect that adding a name to a compound invalidates its entry."""
+    nad = id2compounds["nad"]
+    cache.get_json(nad)
+    nad.names.append(CompoundName(name="NAD", namespace=namespaces["chebi"]))
+    session.commit()
+    assert cache.statistics.size == 0
+    names = json.loads(cache.get_json(nad))["names"]["chebi"]
+    assert {n["name"] for n in names} == {"NAD+", "NAD"}
+
+
+def test_close(session, cache, id2compounds):
+    """Expect that a closed cache no longer reacts to events."""
+    ethanol = id2compounds["ethanol"]
+    cache.get_json(ethanol)
+    cache.close()
+    session.delete(ethanol.names[0])
+    session.commit()
+    assert cache.statistics.invalidations == 0
+
+
+def test_clear(cache, id2compounds):
+    """Expect that clearing the cache resets everything."""
+    cache.get_json(id2compounds["ethanol"])
+    cache.clear()
+    assert cache.statistics == (0, 0, 0, 0, 0, 2)
+
+
+def test_concurrent_invalidation(cache, id2compounds):
+    """Expect that a serialization overlapping with an invalidation is not kept."""
+    ethanol = id2compounds["ethanol"]
+    build_io = cache.builder.build_io
+
+    def invalidating_build_io(orm_model):
+        cache.invalidate("Compound", orm_model.id)
+        return build_io(orm_model)
+
+    cache.builder.build_io = invalidating_build_io
+    cache.get_json(ethanol)
+    cache.builder.build_io = build_io
+    assert cache.statistics.size == 0
+    cache.get_json(ethanol)
+    assert cache.statistics.misses == 2
+
+
+def test_child_version(session, biology_qualifiers, namespaces, id2compounds):
+    """Expect that a child change is detected without listening to events."""
+    cache = SerializationCache(
+        CompoundBuilder(biology_qualifiers=biology_qualifiers, namespaces=namespaces)
+    )
+    nad = id2compounds["nad"]
+    cache.get_json(nad)
+    session.add(
+        CompoundName(compound_id=nad.id, name="NAD", namespace=namespaces["chebi"])
+    )
+    session.commit()
+    names = json.loads(cache.get_json(nad))["names"]["chebi"]
+    assert {n["name"] for n in names} == {"NAD+", "NAD"}
+    assert cache.statistics.misses == 2
@@ -0,0 +1,75 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that compound attributes are derived from chemical formulae."""
+
+
+import pytest
+
+from cobra_component_models.builder import CompoundBuilder
+from cobra_component_models.chemistry import (
+    set_formula_attributes,
+    update_formula_attributes,
+)
+from cobra_component_models.io import CompoundModel
+from cobra_component_models.orm import Compound, CompoundElement
+
+
+def test_set_formula_attributes():
+    """Expect that element counts and masses are set."""
+    compound = Compound(chemical_formula="C2H6O")
+    assert set_formula_attributes(compound)
+    assert {(e.element, e.count) for e in compound.elements} == {
+        ("C", 2),
+        ("H", 6),
+        ("O", 1),
+    }
+    assert compound.monoisotopic_mass == pytest.approx(46.041865, abs=1e-6)
+    assert compound.mass == pytest.approx(46.069, abs=1e-3)
+
+
+@pytest.mark.parametrize("formula", [None, "", "(C6H10O5)n"])
+def test_set_invalid_formula_attributes(formula):
+    """Expect that compounds without a valid formula have no derived attributes."""
+    compound = Compound(chemical_formula=formula)
+    assert not set_formula_attributes(compound)
+    assert compound.elements == []
+    assert compound.mass is None
+
+
+def test_build_orm_sets_formula_attributes(biology_qualifiers, namespaces):
+    """Expect that the builder derives element counts and masses."""
+    compound = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    ).build_orm(CompoundModel(id="water", chemical_formula="H2O"))
+    assert {(e.element, e.count) for e in compound.elements} == {("H", 2), ("O", 1)}
+    assert compound.mass == pytest.approx(18.015, abs=1e-3)
+
+
+def test_update_formula_attributes(session):
+    """Expect that only compounds lacking element counts are updated."""
+    session.add_all(
+        [
+            Compound(chemical_formula="H2O"),
+            Compound(chemical_formula="CO2"),
+            Compound(chemical_formula="invalid"),
+            Compound(),
+        ]
+    )
+    session.commit()
+    assert update_formula_attributes(session, chunk_size=1) == 2
+    session.commit()
+    assert session.query(CompoundElement).count() == 4
+    assert update_formula_attributes(session) == 0
@@ -18,7 +18,7 @@
 
 import pytest
 
-from cobra_component_models.orm import CompoundName
+from cobra_component_models.orm import Compound, CompoundName
 
 
 @pytest.mark.parametrize(
@@ -34,3 +34,23 @@ def test_init(attributes):
     instance = CompoundName(**attributes)
     for attr, value in attributes.items():
         assert getattr(instance, attr) == value
+
+
+def test_touch_compound(session, namespaces):
+    """Expect that changing a compound's names updates its timestamp."""
+    compound = Compound()
+    compound.names.append(CompoundName(name="NAD", namespace=namespaces["chebi"]))
+    session.add(compound)
+    session.commit()
+    assert compound.updated_on is None
+    session.add(
+        CompoundName(
+            compound_id=compound.id, name="NAD+", namespace=namespaces["chebi"]
+        )
+    )
+    session.commit()
+    first = compound.updated_on
+    assert first is not None
+    session.delete(compound.names[0])
+    session.commit()
+    assert compound.updated_on > first
@@ -0,0 +1,119 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that component files are ingested in parallel and in order."""
+
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from cobra_component_models.orm import (
+    Compartment,
+    Compound,
+    CompoundName,
+    Participant,
+    Reaction,
+)
+from cobra_component_models.pipeline import IngestionScheduler
+
+
+INCHIKEY = "LFQSCWFLJHTTHZ-UHFFFAOYSA-N"
+
+
+@pytest.fixture(scope="function")
+def paths(tmp_path, compartments_data, compounds_data, reactions_data) -> List[Path]:
+    """Write the test data to several files with references across files."""
+    # The reactions come first, yet refer to compounds of later files.
+    files = {
+        "reactions.json": {"reactions": reactions_data},
+        "compartments.json": {"compartments": compartments_data},
+        "compounds.json": {"compounds": compounds_data},
+        "duplicate.json": {
+            "compounds": {"h": compounds_data["h"]},
+            "reactions": reactions_data,
+        },
+    }
+    result = []
+    for name, obj in files.items():
+        path = tmp_path / name
+        path.write_text(json.dumps(obj))
+        result.append(path)
+    return result
+
+
+def test_process_pool(session, biology_qualifiers, namespaces, paths, compounds_data):
+    """Expect that all components are written with a pool of processes."""
+    counts = IngestionScheduler(session, max_workers=2, max_pending=2).run(paths)
+    assert counts == {"compartments": 1, "compounds": 5, "reactions": 1}
+    assert session.query(Compartment).count() == 1
+    assert session.query(Compound).count() == 5
+    assert session.query(Reaction).count() == 1
+    assert session.query(Participant).count() == 5
+    assert session.query(CompoundName).count() == sum(
+        len(names)
+        for data in compounds_data.values()
+        for names in data["names"].values()
+    )
+    ethanol = session.query(Compound).filter_by(inchi_key=INCHIKEY).one()
+    assert {a.identifier for a in ethanol.annotation} >= {"CHEBI:16236"}
+
+
+def test_progress(session, biology_qualifiers, namespaces, paths):
+    """Expect that progress is reported per section in write order."""
+    reports = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        IngestionScheduler(session, executor=executor, progress=reports.append).run(
+            paths
+        )
+    assert [r.section for r in reports] == ["compartments"] * 4 + ["compounds"] * 4 + [
+        "reactions"
+    ] * 4
+    assert [r.num_done for r in reports] == list(range(1, 13))
+    assert all(r.num_total == 12 for r in reports)
+    assert sum(r.num_components for r in reports) == 7
+
+
+@pytest.mark.raises(exception=ValueError, message="Invalid compounds")
+def test_invalid(session, biology_qualifiers, namespaces, tmp_path):
+    """Expect that invalid components raise an error in the writer."""
+    path = tmp_path / "invalid.json"
+    path.write_text(json.dumps({"compounds": {"x": {"charge": "many"}}}))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        IngestionScheduler(session, executor=executor).run([path])
+
+
+def test_sequential_runs(session, biology_qualifiers, namespaces, paths):
+    """Expect that later inserts continue after the assigned primary keys."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        IngestionScheduler(session, executor=executor).run(paths[1:3])
+    session.add(Compound(notes="new"))
+    session.commit()
+    assert session.query(Compound).count() == 6
+
+
+def test_unknown_references(session, biology_qualifiers, namespaces, paths):
+    """Expect that all missing references are reported before anything is written."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError, match="4 unknown compound") as error:
+            IngestionScheduler(session, executor=executor).run(
+                [paths[0], paths[1], paths[3]]
+            )
+    assert "acetaldehyde, ethanol, nad, nadh" in str(error.value)
+    assert session.query(Compartment).count() == 0
+    assert session.query(Compound).count() == 0
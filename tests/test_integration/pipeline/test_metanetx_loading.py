@@ -0,0 +1,134 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that MetaNetX tables are loaded into the database."""
+
+
+from pathlib import Path
+
+import pytest
+
+from cobra_component_models.orm import (
+    Compartment,
+    Compound,
+    CompoundAnnotation,
+    CompoundName,
+    Namespace,
+    Reaction,
+)
+from cobra_component_models.pipeline import load_metanetx
+
+
+data_path = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture(scope="function")
+def metanetx_namespaces(session, biology_qualifiers, namespaces):
+    """Add the MetaNetX namespaces to the database."""
+    session.add_all(
+        [
+            Namespace(
+                miriam_id="MIR:00000567",
+                prefix="metanetx.chemical",
+                pattern=r"^(MNXM\d+|BIOMASS|WATER)$",
+            ),
+            Namespace(
+                miriam_id="MIR:00000568",
+                prefix="metanetx.reaction",
+                pattern=r"^(MNXR\d+|EMPTY)$",
+            ),
+            Namespace(
+                miriam_id="MIR:00000596",
+                prefix="metanetx.compartment",
+                pattern=r"^(MNX[CD]\d+|BOUNDARY|IN|OUT)$",
+            ),
+        ]
+    )
+    session.commit()
+
+
+def load(session, batch_size: int = 2) -> dict:
+    """Load all MetaNetX test tables."""
+    return load_metanetx(
+        session,
+        chem_prop=data_path / "metanetx_chem_prop.tsv",
+        chem_xref=data_path / "metanetx_chem_xref.tsv",
+        reac_prop=data_path / "metanetx_reac_prop.tsv",
+        batch_size=batch_size,
+    )
+
+
+def test_load(session, metanetx_namespaces):
+    """Expect that compounds, cross-references, and reactions are loaded."""
+    progress = []
+    counts = load_metanetx(
+        session,
+        chem_prop=data_path / "metanetx_chem_prop.tsv",
+        chem_xref=data_path / "metanetx_chem_xref.tsv",
+        reac_prop=data_path / "metanetx_reac_prop.tsv",
+        batch_size=2,
+        progress=lambda table, num: progress.append((table, num)),
+    )
+    assert counts == {"chem_prop": 5, "chem_xref": 4, "reac_prop": 2}
+    assert progress[:3] == [("chem_prop", 2), ("chem_prop", 2), ("chem_prop", 1)]
+    assert session.query(Compound).count() == 5
+    assert session.query(Reaction).count() == 2
+    assert session.query(Compartment).count() == 2
+    ethanol = (
+        session.query(Compound).filter(Compound.inchi_key.like("LFQSCWFLJHTTHZ%")).one()
+    )
+    assert ethanol.chemical_formula == "C2H6O"
+    assert {(a.namespace.prefix, a.identifier) for a in ethanol.annotation} == {
+        ("metanetx.chemical", "MNXM3"),
+        ("chebi", "CHEBI:16236"),
+    }
+    assert {n.name for n in ethanol.names} == {"ethanol", "ethyl alcohol"}
+
+
+def test_reactions(session, metanetx_namespaces):
+    """Expect that participants are resolved by their MetaNetX identifiers."""
+    load(session)
+    reaction = (
+        session.query(Reaction)
+        .join(Reaction.annotation)
+        .filter_by(identifier="MNXR1")
+        .one()
+    )
+    products = {
+        (p.compound.inchi_key, p.stoichiometry)
+        for p in reaction.participants
+        if p.is_product
+    }
+    assert products == {
+        ("IKHGUXGNUITLKF-UHFFFAOYSA-N", "1"),
+        ("GPRLSGONYQIRFK-UHFFFAOYSA-N", "2"),
+    }
+
+
+def test_idempotent(session, metanetx_namespaces):
+    """Expect that loading the tables twice does not duplicate anything."""
+    load(session)
+    load(session, batch_size=10)
+    assert session.query(Compound).count() == 5
+    assert session.query(Reaction).count() == 2
+    assert session.query(Compartment).count() == 2
+    assert session.query(CompoundName).count() == 10
+    assert session.query(CompoundAnnotation).count() == 9
+
+
+@pytest.mark.raises(exception=ValueError, message="lacks the required namespace")
+def test_missing_namespaces(session, namespaces):
+    """Expect that the MetaNetX namespaces are required."""
+    load(session)
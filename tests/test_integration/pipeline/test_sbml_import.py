@@ -0,0 +1,221 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that SBML documents are imported into the database."""
+
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from cobra_component_models.io import ComponentsModel
+from cobra_component_models.orm import (
+    Base,
+    BiologyQualifier,
+    Compartment,
+    Compound,
+    Namespace,
+    Reaction,
+)
+from cobra_component_models.pipeline import import_sbml
+from cobra_component_models.query import CoreExporter, export_sbml
+
+
+def write_document(path, compartments: dict, compounds: dict, reactions: dict):
+    """Write components to an SBML document and return its path."""
+    with path.open("w") as handle:
+        export_sbml(
+            ComponentsModel.parse_obj(
+                {
+                    "compartments": compartments,
+                    "compounds": compounds,
+                    "reactions": reactions,
+                }
+            ),
+            handle,
+        )
+    return path
+
+
+@pytest.fixture(scope="function")
+def document(tmp_path, compartments_data, compounds_data, reactions_data):
+    """Return the path to an SBML document of the test components."""
+    return write_document(
+        tmp_path / "model.xml", compartments_data, compounds_data, reactions_data
+    )
+
+
+@pytest.fixture(scope="function")
+def target(tmp_path, namespaces_data):
+    """Return a session on an empty database with namespaces and qualifiers."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    Base.metadata.create_all(engine)
+    session = Session(bind=engine)
+    BiologyQualifier.load(session)
+    session.add_all([Namespace(**data) for data in namespaces_data.values()])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def count(session, cls) -> int:
+    """Return the number of rows of a table."""
+    return session.execute(select([func.count(cls.id)])).scalar()
+
+
+def test_import(target, document):
+    """Expect all components with their names and annotation."""
+    paths = []
+    counts = import_sbml(
+        target,
+        [document],
+        name_prefix="chebi",
+        progress=lambda path, _: paths.append(path),
+    )
+    assert counts == {
+        "documents": 1,
+        "compartments": 1,
+        "compounds": 5,
+        "reactions": 1,
+    }
+    assert paths == [document]
+    assert count(target, Compartment) == 1
+    assert count(target, Compound) == 5
+    assert count(target, Reaction) == 1
+    components = CoreExporter(target).export()
+    (ethanol,) = [
+        c for c in components.compounds.values() if "inchikey" in c.annotation
+    ]
+    assert ethanol.annotation["inchikey"][0].identifier == (
+        "LFQSCWFLJHTTHZ-UHFFFAOYSA-N"
+    )
+    assert {n.name for n in ethanol.names["chebi"]} >= {"ethanol"}
+    (reaction,) = components.reactions.values()
+    assert len(reaction.reactants) == 2
+    assert len(reaction.products) == 3
+    assert reaction.annotation["rhea"]
+
+
+def test_import_twice(target, document):
+    """Expect that a repeated import matches the existing components."""
+    for _ in range(2):
+        import_sbml(target, [document], match_on="chebi", reaction_match_on="rhea")
+    assert count(target, Compartment) == 1
+    assert count(target, Compound) == 5
+    assert count(target, Reaction) == 1
+
+
+@pytest.mark.parametrize("name_prefix", [None, "chebi"])
+def test_import_twice_by_default(target, document, name_prefix):
+    """Expect that a repeated import with the default matching adds nothing."""
+    for _ in range(2):
+        import_sbml(target, [document], name_prefix=name_prefix)
+    assert count(target, Compartment) == 1
+    assert count(target, Compound) == 5
+    assert count(target, Reaction) == 1
+
+
+def test_import_twice_by_name(
+    target, tmp_path, compartments_data, compounds_data, reactions_data
+):
+    """Expect that components without annotation are matched by their names."""
+    path = write_document(
+        tmp_path / "unannotated.xml",
+        *(
+            {id: {**obj, "annotation": {}} for id, obj in data.items()}
+            for data in (compartments_data, compounds_data, reactions_data)
+        ),
+    )
+    for _ in range(2):
+        import_sbml(target, [path], name_prefix="chebi")
+    assert count(target, Compartment) == 1
+    assert count(target, Compound) == 5
+    assert count(target, Reaction) == 1
+
+
+def test_import_shared_classification(
+    target, tmp_path, compartments_data, compounds_data, reactions_data
+):
+    """Expect that sharing an EC number or a parent class is no identity."""
+    target.add(
+        Namespace(
+            miriam_id="MIR:00000004",
+            prefix="ec-code",
+            pattern=r"^\d+\.-\.-\.-|\d+\.\d+\.-\.-|\d+\.\d+\.\d+\.-|"
+            r"\d+\.\d+\.\d+\.(n)?\d+$",
+        )
+    )
+    target.commit()
+    dehydrogenase = reactions_data["dehydrogenase"]
+    version_of = {
+        "ec-code": [{"biology_qualifier": "isVersionOf", "identifier": "1.1.1.1"}],
+        "rhea": [{"biology_qualifier": "isVersionOf", "identifier": "25290"}],
+    }
+    forward = {**dehydrogenase, "id": "forward", "annotation": version_of}
+    backward = {
+        **forward,
+        "id": "backward",
+        "names": {"rhea": [{"name": "acetaldehyde reductase"}]},
+        "reactants": dehydrogenase["products"],
+        "products": dehydrogenase["reactants"],
+    }
+    # Both NAD+ and NADH are a version of the same parent class and are matched by
+    # their names instead.
+    parent = [{"biology_qualifier": "isVersionOf", "identifier": "CHEBI:13389"}]
+    compounds = {
+        id: {**obj, "annotation": {"chebi": parent}} if id in ("nad", "nadh") else obj
+        for id, obj in compounds_data.items()
+    }
+    for name, reaction in [("forward", forward), ("backward", backward)]:
+        import_sbml(
+            target,
+            [
+                write_document(
+                    tmp_path / f"{name}.xml",
+                    compartments_data,
+                    compounds,
+                    {name: reaction},
+                )
+            ],
+            name_prefix="chebi",
+        )
+    assert count(target, Compound) == 5
+    assert count(target, Reaction) == 2
+
+
+def test_import_parallel(target, document, tmp_path):
+    """Expect that documents parsed by worker processes are imported in order."""
+    paths = []
+    counts = import_sbml(
+        target,
+        [document, document],
+        match_on="chebi",
+        reaction_match_on="rhea",
+        max_workers=2,
+        progress=lambda path, _: paths.append(path),
+    )
+    assert counts["documents"] == 2
+    assert paths == [document, document]
+    assert count(target, Compound) == 5
+    assert count(target, Reaction) == 1
+
+
+@pytest.mark.raises(exception=ValueError, message="is unknown")
+def test_unknown_name_prefix(target, document):
+    """Expect that names cannot be stored in an unknown namespace."""
+    import_sbml(target, [document], name_prefix="unknown")
@@ -0,0 +1,163 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that components are exported to and imported from shards."""
+
+
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from cobra_component_models.builder import ReactionBuilder
+from cobra_component_models.io import ReactionModel
+from cobra_component_models.orm import Base, BiologyQualifier, Namespace, Reaction
+from cobra_component_models.pipeline import (
+    export_shards,
+    import_shards,
+    read_manifest,
+    verify_shards,
+)
+from cobra_component_models.query import CoreExporter, diff_snapshots
+
+
+@pytest.fixture(scope="function")
+def source(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    reactions_data,
+):
+    """Return a session on a database with one reaction."""
+    session.add(
+        ReactionBuilder(
+            biology_qualifiers=biology_qualifiers,
+            namespaces=namespaces,
+            id2compartment=id2compartments,
+            id2compound=id2compounds,
+        ).build_orm(ReactionModel.parse_obj(reactions_data["dehydrogenase"]))
+    )
+    session.commit()
+    return session
+
+
+@pytest.fixture(scope="function")
+def target(tmp_path, namespaces_data):
+    """Return an engine on an empty database with namespaces and qualifiers."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    Base.metadata.create_all(engine)
+    session = Session(bind=engine)
+    BiologyQualifier.load(session)
+    session.add_all([Namespace(**data) for data in namespaces_data.values()])
+    session.commit()
+    session.close()
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def test_export(tmp_path, source):
+    """Expect shards of the given size and a manifest describing them."""
+    shards = export_shards(source.connection(), tmp_path / "dump", shard_size=2)
+    assert read_manifest(tmp_path / "dump") == shards
+    assert [(s.kind, s.count) for s in shards] == [
+        ("compartment", 1),
+        ("compound", 2),
+        ("compound", 2),
+        ("compound", 1),
+        ("reaction", 1),
+    ]
+    assert all(s.first_id <= s.last_id for s in shards)
+    assert all((tmp_path / "dump" / s.path).is_file() for s in shards)
+
+
+def test_round_trip(tmp_path, source, target):
+    """Expect that an imported dump is identical to the original database."""
+    export_shards(source.connection(), tmp_path / "dump", shard_size=2)
+    counts = import_shards(target, tmp_path / "dump")
+    assert counts == {"compartment": 1, "compound": 5, "reaction": 1}
+    session = Session(bind=target)
+    assert list(diff_snapshots(session, CoreExporter(source).export())) == []
+    session.close()
+
+
+def test_concurrent_round_trip(tmp_path, caplog, source, target):
+    """Expect serial export from a connection and threads with an engine."""
+    shards = export_shards(
+        source.connection(), tmp_path / "dump", shard_size=2, max_workers=2
+    )
+    assert "Processing shards serially" in caplog.text
+    assert len(shards) == 5
+    counts = import_shards(target, tmp_path / "dump", max_workers=2)
+    assert counts == {"compartment": 1, "compound": 5, "reaction": 1}
+    session = Session(bind=target)
+    assert list(diff_snapshots(session, CoreExporter(source).export())) == []
+    session.close()
+
+
+def test_url_profile(tmp_path, source, target):
+    """Expect that engines created from a URL use the given SQLite profile."""
+    export_shards(source.connection(), tmp_path / "dump")
+    counts = import_shards(
+        str(target.url), tmp_path / "dump", max_workers=2, profile="bulk_load"
+    )
+    assert counts["reaction"] == 1
+    assert target.execute("PRAGMA journal_mode").scalar() == "wal"
+
+
+def test_retry_shard(tmp_path, source, target):
+    """Expect that a single shard can be imported after the others."""
+    shards = export_shards(source.connection(), tmp_path / "dump", shard_size=2)
+    paths = [s.path for s in shards if s.path != "compounds-00001.json"]
+    with pytest.raises(ValueError, match="unknown compound"):
+        # The reaction refers to compounds of the missing shard.
+        import_shards(target, tmp_path / "dump", paths=paths)
+    import_shards(target, tmp_path / "dump", paths=["compounds-00001.json"])
+    import_shards(target, tmp_path / "dump", paths=["reactions-00000.json"])
+    session = Session(bind=target)
+    assert session.query(Reaction).count() == 1
+    assert list(diff_snapshots(session, CoreExporter(source).export())) == []
+    session.close()
+
+
+@pytest.mark.raises(exception=ValueError, message="does not match the manifest")
+def test_checksum_mismatch(tmp_path, source, target):
+    """Expect that a modified shard is rejected."""
+    shards = export_shards(source.connection(), tmp_path / "dump")
+    path = tmp_path / "dump" / shards[0].path
+    obj = json.loads(path.read_text())
+    obj["compartments"].clear()
+    path.write_text(json.dumps(obj))
+    import_shards(target, tmp_path / "dump")
+
+
+@pytest.mark.raises(exception=ValueError, message="lists no shard")
+def test_unknown_shard(tmp_path, source, target):
+    """Expect that unknown shard paths are rejected."""
+    export_shards(source.connection(), tmp_path / "dump")
+    import_shards(target, tmp_path / "dump", paths=["foo.json"])
+
+
+def test_verify_shards(tmp_path, source):
+    """Expect that missing and modified shards are reported."""
+    shards = export_shards(source.connection(), tmp_path / "dump", shard_size=2)
+    assert verify_shards(tmp_path / "dump") == []
+    (tmp_path / "dump" / shards[0].path).unlink()
+    (tmp_path / "dump" / shards[-1].path).write_text("{}")
+    assert verify_shards(tmp_path / "dump") == [shards[0], shards[-1]]
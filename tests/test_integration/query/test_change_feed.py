@@ -0,0 +1,90 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that component changes are fed in timestamp order."""
+
+
+from datetime import datetime, timedelta, timezone
+
+from cobra_component_models.orm import (
+    Compound,
+    CompoundAnnotation,
+    CompoundName,
+)
+from cobra_component_models.query import iter_changes
+
+
+def test_iter_all_changes(session, id2compartments, id2compounds):
+    """Expect that every component is part of the initial feed."""
+    changes = list(iter_changes(session))
+    assert [c.kind for c in changes].count("compartment") == len(id2compartments)
+    assert [c.kind for c in changes].count("compound") == len(id2compounds)
+    timestamps = [c.timestamp for c in changes]
+    assert all(isinstance(t, datetime) for t in timestamps)
+    assert timestamps == sorted(timestamps)
+
+
+def test_iter_no_changes(session, id2compounds):
+    """Expect that no changes are fed after the last change."""
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+    assert list(iter_changes(session, since=future)) == []
+
+
+def test_iter_changes_of_kind(session, id2compartments, id2compounds):
+    """Expect that only changes of the requested kinds are fed."""
+    changes = list(iter_changes(session, kinds=["compartment"]))
+    assert {c.kind for c in changes} == {"compartment"}
+
+
+def test_iter_child_changes(session, namespaces, id2compounds):
+    """Expect that a changed name marks its compound as changed."""
+    (last, *_) = reversed(list(iter_changes(session)))
+    nad = id2compounds["nad"]
+    nad.names.append(CompoundName(name="NAD", namespace=namespaces["chebi"]))
+    session.commit()
+    changes = list(iter_changes(session, since=last.timestamp))
+    assert len(changes) == 1
+    assert changes[0].model.id == str(nad.id)
+    assert {n.name for n in changes[0].model.names["chebi"]} == {"NAD+", "NAD"}
+
+
+def test_iter_updated_changes(session, id2compounds):
+    """Expect that an updated compound is fed last."""
+    ethanol = id2compounds["ethanol"]
+    session.query(Compound).filter_by(id=ethanol.id).one().notes = "updated"
+    session.commit()
+    changes = list(iter_changes(session, kinds=["compound"]))
+    assert changes[-1].model.id == str(ethanol.id)
+    assert changes[-1].model.notes == "updated"
+
+
+def test_resume_at_same_timestamp(session, id2compartments, id2compounds):
+    """Expect that resuming from a cursor keeps changes sharing its timestamp."""
+    moment = datetime(2020, 1, 1)
+    for cls in (Compound, CompoundName, CompoundAnnotation):
+        session.query(cls).update(
+            {cls.created_on: moment, cls.updated_on: None}, synchronize_session=False
+        )
+    session.commit()
+    changes = list(iter_changes(session))
+    compounds = [c for c in changes if c.kind == "compound"]
+    assert {c.timestamp for c in compounds} == {moment}
+    assert len(compounds) == len(id2compounds)
+    assert [c.cursor for c in changes] == sorted(c.cursor for c in changes)
+    for index, change in enumerate(changes):
+        assert [c.cursor for c in iter_changes(session, since=change.cursor)] == [
+            c.cursor for c in changes[index + 1 :]
+        ]
+    assert list(iter_changes(session, since=moment, kinds=["compound"])) == []
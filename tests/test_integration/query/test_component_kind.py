@@ -0,0 +1,37 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that component kinds are looked up correctly."""
+
+
+import pytest
+
+from cobra_component_models.orm import Compound, CompoundAnnotation, CompoundName
+from cobra_component_models.query import get_component_kind
+
+
+def test_get_component_kind():
+    """Expect that a known kind of component returns its ORM classes."""
+    kind = get_component_kind("compound")
+    assert kind.component is Compound
+    assert kind.name_class is CompoundName
+    assert kind.annotation_class is CompoundAnnotation
+    assert kind.foreign_key == "compound_id"
+
+
+@pytest.mark.raises(exception=ValueError, message="Unknown kind")
+def test_get_unknown_component_kind():
+    """Expect that an unknown kind of component raises an error."""
+    get_component_kind("gene")
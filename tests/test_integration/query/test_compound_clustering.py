@@ -0,0 +1,93 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that compounds sharing annotation are clustered."""
+
+
+from typing import Dict
+
+import pytest
+
+from cobra_component_models.orm import (
+    BiologyQualifier,
+    Compound,
+    CompoundAnnotation,
+    Namespace,
+)
+from cobra_component_models.query import DisjointSet, cluster_compounds
+
+
+def test_disjoint_set():
+    """Expect that unions are transitive and singletons are not stored."""
+    disjoint_set = DisjointSet()
+    disjoint_set.union(1, 2)
+    disjoint_set.union(3, 4)
+    disjoint_set.union(4, 2)
+    disjoint_set.union(6, 5)
+    assert disjoint_set.find(7) == 7
+    assert len(disjoint_set) == 6
+    assert disjoint_set.find(1) == disjoint_set.find(3)
+    assert disjoint_set.groups() == [[1, 2, 3, 4], [5, 6]]
+
+
+@pytest.fixture(scope="function")
+def compounds(
+    session,
+    biology_qualifiers: Dict[str, BiologyQualifier],
+    namespaces: Dict[str, Namespace],
+) -> Dict[str, Compound]:
+    """Return compounds that are linked through their annotation."""
+    chebi = namespaces["chebi"]
+    rhea = namespaces["rhea"]
+    qualifier = biology_qualifiers["is"]
+    annotation = {
+        "a": [(chebi, "CHEBI:1")],
+        "b": [(chebi, "CHEBI:1"), (rhea, "10000")],
+        "c": [(rhea, "10000")],
+        "d": [(chebi, "CHEBI:2")],
+        "e": [(chebi, "CHEBI:3")],
+        "f": [(chebi, "CHEBI:3")],
+    }
+    formulas = {"a": "H2O", "b": "H2O", "c": "H2O", "e": "C2H6O", "f": "C2H5O"}
+    result = {}
+    for key, pairs in annotation.items():
+        compound = Compound(chemical_formula=formulas.get(key))
+        compound.annotation = [
+            CompoundAnnotation(
+                namespace=namespace, identifier=identifier, biology_qualifier=qualifier
+            )
+            for namespace, identifier in pairs
+        ]
+        session.add(compound)
+        result[key] = compound
+    session.commit()
+    return result
+
+
+def test_cluster_compounds(session, compounds):
+    """Expect that transitively connected compounds form a cluster."""
+    clusters = list(cluster_compounds(session, chunk_size=2))
+    assert [c.compound_ids for c in clusters] == [
+        sorted(compounds[k].id for k in "abc"),
+        sorted(compounds[k].id for k in "ef"),
+    ]
+    assert clusters[0].conflicts == {}
+    assert clusters[1].conflicts == {"chemical_formula": ["C2H5O", "C2H6O"]}
+
+
+def test_cluster_compounds_by_namespace(session, compounds):
+    """Expect that only annotation in the given namespaces links compounds."""
+    clusters = list(cluster_compounds(session, namespaces=["rhea"]))
+    assert [c.compound_ids for c in clusters] == [sorted(compounds[k].id for k in "bc")]
@@ -0,0 +1,147 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that the core exporter produces the same models as the builders."""
+
+
+from io import StringIO
+
+import pytest
+
+from cobra_component_models.builder import (
+    CompartmentBuilder,
+    CompoundBuilder,
+    ReactionBuilder,
+)
+from cobra_component_models.io import AbstractBaseModel, ReactionModel
+from cobra_component_models.orm import Compound, Participant, Reaction
+from cobra_component_models.query import CoreExporter, export_sbml
+
+
+def normalize(model: AbstractBaseModel) -> dict:
+    """Return a model's data with names and annotation in a defined order."""
+    obj = model.dict()
+    for field in ("names", "annotation"):
+        for items in obj[field].values():
+            items.sort(key=lambda item: sorted(item.items()))
+    return obj
+
+
+@pytest.fixture(scope="function")
+def reaction(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    reactions_data,
+) -> Reaction:
+    """Return a reaction database instance."""
+    reaction = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        id2compartment=id2compartments,
+        id2compound=id2compounds,
+    ).build_orm(ReactionModel.parse_obj(reactions_data["dehydrogenase"]))
+    session.add(reaction)
+    session.commit()
+    return reaction
+
+
+def test_export_compartments(session, biology_qualifiers, namespaces, id2compartments):
+    """Expect that exported compartments are equal to built ones."""
+    builder = CompartmentBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    expected = [normalize(builder.build_io(c)) for c in id2compartments.values()]
+    assert [normalize(c) for c in CoreExporter(session).iter_compartments()] == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 500])
+def test_export_compounds(
+    session, biology_qualifiers, namespaces, id2compounds, chunk_size: int
+):
+    """Expect that exported compounds are equal to built ones in any chunk size."""
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    expected = [
+        normalize(builder.build_io(c))
+        for c in sorted(id2compounds.values(), key=lambda c: c.id)
+    ]
+    exporter = CoreExporter(session, chunk_size=chunk_size)
+    assert [normalize(c) for c in exporter.iter_compounds()] == expected
+
+
+def test_export_selected_compounds(
+    session, biology_qualifiers, namespaces, id2compounds
+):
+    """Expect that only compounds with the given primary keys are exported."""
+    builder = CompoundBuilder(
+        biology_qualifiers=biology_qualifiers, namespaces=namespaces
+    )
+    ethanol = id2compounds["ethanol"]
+    nadh = id2compounds["nadh"]
+    result = list(CoreExporter(session).iter_compounds([nadh.id, ethanol.id]))
+    assert [normalize(c) for c in result] == [
+        normalize(builder.build_io(ethanol)),
+        normalize(builder.build_io(nadh)),
+    ]
+
+
+def test_export_reactions(session, biology_qualifiers, namespaces, reaction):
+    """Expect that exported reactions are equal to built ones."""
+    builder = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        compartment2id={
+            p.compartment: str(p.compartment.id) for p in reaction.participants
+        },
+        compound2id={p.compound: str(p.compound.id) for p in reaction.participants},
+    )
+    assert [normalize(r) for r in CoreExporter(session).iter_reactions()] == [
+        normalize(builder.build_io(reaction))
+    ]
+
+
+def test_export(session, namespaces, biology_qualifiers, reaction):
+    """Expect that all components are exported at once."""
+    result = CoreExporter(session).export()
+    assert len(result.compartments) == 1
+    assert len(result.compounds) == session.query(Compound).count()
+    assert list(result.reactions) == [str(reaction.id)]
+
+
+def test_export_without_compartment(caplog, session, reaction):
+    """Expect that participants without a compartment are skipped."""
+    participant = reaction.participants[0]
+    session.execute(
+        Participant.__table__.update()
+        .where(Participant.id == participant.id)
+        .values(compartment_id=None)
+    )
+    (result,) = CoreExporter(session).iter_reactions()
+    assert len(result.reactants) + len(result.products) == 4
+    assert str(participant.compound_id) not in {**result.reactants, **result.products}
+    assert "without a compartment" in caplog.text
+    assert export_sbml(session, StringIO())["reactions"] == 1
+
+
+def test_export_empty(session):
+    """Expect that an empty database exports empty collections."""
+    result = CoreExporter(session).export()
+    assert result.compartments == {}
+    assert result.compounds == {}
+    assert result.reactions == {}
@@ -0,0 +1,133 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that components and their children are deleted in bulk."""
+
+
+import pytest
+
+from cobra_component_models.builder import ReactionBuilder
+from cobra_component_models.io import ReactionModel
+from cobra_component_models.orm import (
+    Compartment,
+    CompartmentName,
+    Compound,
+    CompoundAnnotation,
+    CompoundName,
+    Participant,
+    Reaction,
+    ReactionName,
+)
+from cobra_component_models.query import (
+    CoreExporter,
+    delete_components,
+    delete_orphans,
+)
+
+
+@pytest.fixture(scope="function")
+def reaction(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    reactions_data,
+) -> Reaction:
+    """Return a reaction database instance."""
+    reaction = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        id2compartment=id2compartments,
+        id2compound=id2compounds,
+    ).build_orm(ReactionModel.parse_obj(reactions_data["dehydrogenase"]))
+    session.add(reaction)
+    session.commit()
+    return reaction
+
+
+def test_orm_cascade(session, id2compounds):
+    """Expect that deleting a compound through the ORM deletes its children."""
+    session.delete(id2compounds["ethanol"])
+    session.commit()
+    assert session.query(CompoundName).filter_by(name="Aethanol").count() == 0
+    assert (
+        session.query(CompoundAnnotation).filter_by(identifier="CHEBI:16236").count()
+        == 0
+    )
+
+
+def test_delete_compounds(session, id2compounds):
+    """Expect that compounds and their children are deleted."""
+    ids = [id2compounds["ethanol"].id, id2compounds["nad"].id, 999]
+    assert delete_components(session, "compound", ids, chunk_size=1) == 2
+    session.commit()
+    assert session.query(Compound).count() == len(id2compounds) - 2
+    assert (
+        session.query(CompoundName).filter(CompoundName.compound_id.in_(ids)).count()
+        == 0
+    )
+    assert (
+        session.query(CompoundAnnotation)
+        .filter(CompoundAnnotation.compound_id.in_(ids))
+        .count()
+        == 0
+    )
+
+
+@pytest.mark.raises(exception=ValueError, message="delete their reactions first")
+def test_delete_participating_compounds(session, id2compounds, reaction):
+    """Expect that compounds that participate in reactions cannot be deleted."""
+    delete_components(session, "compound", [id2compounds["ethanol"].id])
+
+
+def test_delete_reactions(session, reaction):
+    """Expect that reactions, their names, and participants are deleted."""
+    assert delete_components(session, "reaction", [reaction.id]) == 1
+    session.commit()
+    assert session.query(Reaction).count() == 0
+    assert session.query(ReactionName).count() == 0
+    assert session.query(Participant).count() == 0
+    assert session.query(Compound).count() > 0
+
+
+@pytest.mark.raises(exception=ValueError, message="delete their reactions first")
+def test_delete_located_compartments(session, id2compartments, reaction):
+    """Expect that compartments with participants cannot be deleted."""
+    delete_components(session, "compartment", [id2compartments["c"].id])
+
+
+def test_delete_compartments(session, id2compartments, reaction):
+    """Expect that compartments are deleted after their reactions."""
+    delete_components(session, "reaction", [reaction.id])
+    assert delete_components(session, "compartment", [id2compartments["c"].id]) == 1
+    session.commit()
+    assert session.query(Compartment).count() == 0
+    assert session.query(CompartmentName).count() == 0
+    components = CoreExporter(session).export()
+    assert components.compartments == {}
+    assert components.reactions == {}
+    assert len(components.compounds) == session.query(Compound).count()
+
+
+def test_delete_orphans(session, id2compounds):
+    """Expect that children without a component are deleted."""
+    num_names = session.query(CompoundName).count()
+    ethanol = id2compounds["ethanol"]
+    session.execute(Compound.__table__.delete().where(Compound.id == ethanol.id))
+    assert session.query(CompoundName).count() == num_names
+    # Three names, three annotation, and no element counts belong to ethanol.
+    assert delete_orphans(session, "compound") == 6
+    assert session.query(CompoundName).count() == num_names - 3
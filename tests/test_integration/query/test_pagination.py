@@ -0,0 +1,98 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that components can be paginated by keyset."""
+
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from cobra_component_models.builder import CompoundBuilder
+from cobra_component_models.query import decode_cursor, encode_cursor, paginate
+
+
+@pytest.fixture(scope="function")
+def builder(biology_qualifiers, namespaces) -> CompoundBuilder:
+    """Return a compound builder."""
+    return CompoundBuilder(biology_qualifiers=biology_qualifiers, namespaces=namespaces)
+
+
+def test_cursor_round_trip():
+    """Expect that a cursor decodes to the encoded primary key."""
+    assert decode_cursor(encode_cursor(10000)) == 10000
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        pytest.param("garbage", marks=pytest.mark.raises(exception=ValueError)),
+        pytest.param(
+            "eyJpZCI6ImEifQ==", marks=pytest.mark.raises(exception=ValueError)
+        ),
+    ],
+)
+def test_invalid_cursor(cursor: str):
+    """Expect that invalid cursors are rejected."""
+    decode_cursor(cursor)
+
+
+def test_paginate_all(session, builder, id2compounds):
+    """Expect that following the cursors visits every compound exactly once."""
+    result = []
+    cursor = None
+    pages = 0
+    while True:
+        page = paginate(session, "compound", builder, page_size=2, cursor=cursor)
+        assert len(page.items) <= 2
+        result.extend(page.items)
+        pages += 1
+        if page.cursor is None:
+            break
+        cursor = page.cursor
+    assert pages == 3
+    assert [c.id for c in result] == sorted(
+        (str(c.id) for c in id2compounds.values()), key=int
+    )
+
+
+def test_paginate_by_namespace(session, builder, id2compounds):
+    """Expect that only compounds annotated in the namespace are listed."""
+    page = paginate(session, "compound", builder, namespace="chebi")
+    assert len(page.items) == len(id2compounds)
+    assert page.cursor is None
+    assert paginate(session, "compound", builder, namespace="rhea").items == []
+
+
+def test_paginate_by_annotation(session, builder, id2compounds):
+    """Expect that only compounds with the given annotation are listed."""
+    page = paginate(session, "compound", builder, annotation=("chebi", "CHEBI:57540"))
+    assert [c.id for c in page.items] == [str(id2compounds["nad"].id)]
+
+
+def test_paginate_by_unknown_namespace(session, builder, id2compounds):
+    """Expect that an unknown namespace returns an empty page."""
+    page = paginate(session, "compound", builder, namespace="kegg")
+    assert page.items == []
+    assert page.cursor is None
+
+
+def test_paginate_updated_since(session, builder, id2compounds):
+    """Expect that compounds can be filtered by their modification time."""
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+    page = paginate(session, "compound", builder, updated_since=past)
+    assert len(page.items) == len(id2compounds)
+    assert paginate(session, "compound", builder, updated_since=future).items == []
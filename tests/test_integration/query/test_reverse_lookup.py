@@ -0,0 +1,117 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that the reactions in which compounds participate are found."""
+
+
+from typing import Dict
+
+import pytest
+
+from cobra_component_models.builder import ReactionBuilder
+from cobra_component_models.io import ReactionModel
+from cobra_component_models.orm import Reaction
+from cobra_component_models.query import reactions_for_compounds
+
+
+@pytest.fixture(scope="function")
+def reactions(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    reactions_data,
+) -> Dict[str, Reaction]:
+    """Return a forward and a backward dehydrogenase database instance."""
+    builder = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        id2compartment=id2compartments,
+        id2compound=id2compounds,
+    )
+    forward = reactions_data["dehydrogenase"]
+    backward = {
+        "id": "backward",
+        "reactants": forward["products"],
+        "products": forward["reactants"],
+    }
+    result = {
+        "forward": builder.build_orm(ReactionModel.parse_obj(forward)),
+        "backward": builder.build_orm(ReactionModel.parse_obj(backward)),
+    }
+    session.add_all(result.values())
+    session.commit()
+    return result
+
+
+@pytest.mark.parametrize(
+    "role, expected",
+    [
+        ("any", ["forward", "backward"]),
+        ("reactant", ["forward"]),
+        ("product", ["backward"]),
+    ],
+)
+def test_roles(session, id2compounds, reactions, role, expected):
+    """Expect that reactions are found by the role of the compounds."""
+    result = list(
+        reactions_for_compounds(session, [id2compounds["ethanol"].id], role=role)
+    )
+    assert result == sorted((reactions[key] for key in expected), key=lambda r: r.id)
+
+
+def test_multiple_compounds(session, id2compounds, reactions):
+    """Expect that every reaction is generated exactly once."""
+    compound_ids = [c.id for c in id2compounds.values()]
+    result = list(reactions_for_compounds(session, compound_ids, chunk_size=2))
+    assert len(result) == 2
+
+
+@pytest.mark.parametrize("compartment, num_expected", [("c", 2), (None, 0)])
+def test_compartments(
+    session, id2compounds, id2compartments, reactions, compartment, num_expected
+):
+    """Expect that reactions are restricted to participants in the compartments."""
+    compartment_ids = [] if compartment is None else [id2compartments[compartment].id]
+    result = list(
+        reactions_for_compounds(
+            session, [id2compounds["nad"].id], compartment_ids=compartment_ids
+        )
+    )
+    assert len(result) == num_expected
+
+
+def test_compartment_chunks(session, id2compounds, id2compartments, reactions):
+    """Expect that many compartments are filtered in chunks."""
+    compartment_ids = list(range(-1000, 0)) + [id2compartments["c"].id]
+    compound_ids = [c.id for c in id2compounds.values()]
+    result = list(
+        reactions_for_compounds(
+            session, compound_ids, compartment_ids=compartment_ids, chunk_size=300
+        )
+    )
+    assert len(result) == 2
+
+
+def test_unknown_compound(session, reactions):
+    """Expect that an unknown compound participates in no reaction."""
+    assert list(reactions_for_compounds(session, [-1])) == []
+
+
+@pytest.mark.raises(exception=ValueError, message="Unknown participant role")
+def test_unknown_role(session):
+    """Expect that an unknown role raises an error."""
+    list(reactions_for_compounds(session, [1], role="catalyst"))
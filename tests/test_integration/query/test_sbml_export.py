@@ -0,0 +1,102 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that components are exported as SBML."""
+
+
+from io import StringIO
+from xml.etree import ElementTree
+
+import pytest
+
+from cobra_component_models.builder import ReactionBuilder
+from cobra_component_models.io import ReactionModel
+from cobra_component_models.io.sbml_writer import SBML_NS
+from cobra_component_models.query import CoreExporter, export_sbml
+
+
+NS = {"sbml": SBML_NS}
+
+
+@pytest.fixture(scope="function")
+def reaction(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    reactions_data,
+):
+    """Add a reaction to the database."""
+    reaction = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        id2compartment=id2compartments,
+        id2compound=id2compounds,
+    ).build_orm(ReactionModel.parse_obj(reactions_data["dehydrogenase"]))
+    session.add(reaction)
+    session.commit()
+    return reaction
+
+
+def element_ids(document: str, path: str) -> list:
+    """Return the identifiers of the elements at the given path."""
+    root = ElementTree.fromstring(document)
+    return [e.get("id") for e in root.iterfind(f"sbml:model/{path}", NS)]
+
+
+def test_export_session(session, id2compounds, id2compartments, reaction):
+    """Expect species for all participating compounds of the database."""
+    handle = StringIO()
+    counts = export_sbml(session, handle, chunk_size=2)
+    assert counts == {"compartments": 1, "species": 5, "reactions": 1}
+    compartment = id2compartments["c"].id
+    assert element_ids(handle.getvalue(), "sbml:listOfSpecies/sbml:species") == [
+        f"M_{c.id}_{compartment}"
+        for c in sorted(id2compounds.values(), key=lambda c: c.id)
+    ]
+    species = {
+        e.get("species")
+        for e in ElementTree.fromstring(handle.getvalue()).iterfind(
+            ".//sbml:speciesReference", NS
+        )
+    }
+    assert species == {f"M_{c.id}_{compartment}" for c in id2compounds.values()}
+
+
+def test_export_snapshot(session, reaction):
+    """Expect the same document from a snapshot as from the database."""
+    from_session = StringIO()
+    export_sbml(session, from_session)
+    from_snapshot = StringIO()
+    export_sbml(CoreExporter(session).export(), from_snapshot)
+    assert from_snapshot.getvalue() == from_session.getvalue()
+
+
+def test_default_compartment(session, id2compounds, id2compartments):
+    """Expect that compounds without reactions are placed by default only."""
+    handle = StringIO()
+    assert export_sbml(session, handle)["species"] == 0
+    handle = StringIO()
+    counts = export_sbml(
+        session, handle, default_compartment=str(id2compartments["c"].id)
+    )
+    assert counts["species"] == len(id2compounds)
+
+
+@pytest.mark.raises(exception=ValueError, message="does not exist")
+def test_unknown_default_compartment(session, id2compounds, id2compartments):
+    """Expect that the default compartment must be exported."""
+    export_sbml(session, StringIO(), default_compartment="unknown")
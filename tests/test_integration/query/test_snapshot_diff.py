@@ -0,0 +1,212 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that snapshots are compared and patched."""
+
+
+import pytest
+
+from cobra_component_models.builder import ReactionBuilder
+from cobra_component_models.io import ComponentsModel, ReactionModel
+from cobra_component_models.orm import Compartment, Compound, Reaction
+from cobra_component_models.query import (
+    CoreExporter,
+    apply_changes,
+    diff_snapshots,
+    patch_components,
+    snapshot_key,
+)
+
+
+@pytest.fixture(scope="function")
+def reaction(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    reactions_data,
+) -> Reaction:
+    """Return a reaction database instance."""
+    reaction = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        id2compartment=id2compartments,
+        id2compound=id2compounds,
+    ).build_orm(ReactionModel.parse_obj(reactions_data["dehydrogenase"]))
+    session.add(reaction)
+    session.commit()
+    return reaction
+
+
+@pytest.fixture(scope="function")
+def snapshot(session, id2compounds, reaction) -> ComponentsModel:
+    """Return a modified dump of the database."""
+    obj = CoreExporter(session).export().dict()
+    ethanol = str(id2compounds["ethanol"].id)
+    obj["compounds"][ethanol]["names"] = {"chebi": [{"name": "ethyl alcohol"}]}
+    obj["compounds"][ethanol]["chemical_formula"] = "C2H5OH"
+    del obj["compounds"][str(id2compounds["h"].id)]
+    del obj["reactions"][str(reaction.id)]["products"][str(id2compounds["h"].id)]
+    obj["compartments"]["99"] = {"id": "99", "names": {"go": [{"name": "vacuole"}]}}
+    return ComponentsModel.parse_obj(obj)
+
+
+def test_snapshot_key():
+    """Expect that numeric identifiers sort numerically."""
+    assert sorted(["10", "a", "9", "100"], key=snapshot_key) == ["9", "a", "10", "100"]
+
+
+def test_identical(session, reaction):
+    """Expect no changes between a database and its dump."""
+    assert list(diff_snapshots(session, CoreExporter(session).export())) == []
+
+
+def test_diff(session, id2compounds, reaction, snapshot):
+    """Expect the added, removed, and changed components."""
+    changes = {
+        (c.kind, c.id): (c.status, c.fields)
+        for c in diff_snapshots(session, snapshot, chunk_size=2)
+    }
+    assert changes == {
+        ("compartment", "99"): ("added", ()),
+        ("compound", str(id2compounds["ethanol"].id)): (
+            "changed",
+            ("names", "chemical_formula"),
+        ),
+        ("compound", str(id2compounds["h"].id)): ("removed", ()),
+        ("reaction", str(reaction.id)): ("changed", ("products",)),
+    }
+
+
+def test_apply_changes(session, id2compounds, reaction, snapshot):
+    """Expect that a patched database equals the new snapshot."""
+    counts = apply_changes(session, list(diff_snapshots(session, snapshot)))
+    session.commit()
+    assert counts == {"added": 1, "changed": 2, "removed": 1}
+    assert list(diff_snapshots(session, snapshot)) == []
+    assert session.query(Compartment).get(99) is not None
+    assert session.query(Compound).count() == 4
+    ethanol = session.query(Compound).get(id2compounds["ethanol"].id)
+    assert [n.name for n in ethanol.names] == ["ethyl alcohol"]
+    assert {e.element: e.count for e in ethanol.elements} == {"C": 2, "H": 6, "O": 1}
+
+
+def test_patch_components(session, reaction, snapshot):
+    """Expect that a patched dump equals the new snapshot."""
+    old = CoreExporter(session).export()
+    patched = patch_components(old, diff_snapshots(old, snapshot))
+    assert list(diff_snapshots(patched, snapshot)) == []
+    assert list(diff_snapshots(old, CoreExporter(session).export())) == []
+
+
+@pytest.fixture(scope="function")
+def dump(compartments_data, compounds_data, reactions_data) -> ComponentsModel:
+    """Return a dump of the test data whose identifiers are not primary keys."""
+    return ComponentsModel.parse_obj(
+        {
+            "compartments": compartments_data,
+            "compounds": compounds_data,
+            "reactions": reactions_data,
+        }
+    )
+
+
+def test_apply_added_dump(session, biology_qualifiers, namespaces, dump):
+    """Expect that added reactions refer to components added with them."""
+    changes = list(diff_snapshots(ComponentsModel(), dump))
+    assert apply_changes(session, changes) == {
+        "added": 7,
+        "changed": 0,
+        "removed": 0,
+    }
+    session.commit()
+    (reaction,) = session.query(Reaction).all()
+    assert len(reaction.participants) == 5
+    session.add(Compound(notes="new"))
+    session.commit()
+
+
+@pytest.mark.raises(exception=ValueError, message="same database")
+def test_apply_changed_dump(session, biology_qualifiers, namespaces, dump):
+    """Expect that changes to components without primary keys are rejected."""
+    changed = dump.copy(deep=True)
+    changed.compounds["ethanol"].notes = "changed"
+    apply_changes(session, diff_snapshots(dump, changed))
+
+
+@pytest.mark.raises(exception=ValueError, message="unknown compounds")
+def test_apply_unknown_participant(
+    session, biology_qualifiers, namespaces, id2compartments, dump
+):
+    """Expect that reactions must refer to existing or added compounds."""
+    reactions = ComponentsModel(reactions=dump.reactions)
+    apply_changes(session, diff_snapshots(ComponentsModel(), reactions))
+
+
+JOIN_ON = {"compartment": "go", "compound": "chebi", "reaction": "rhea"}
+
+
+def test_join_on_stable_keys(session, reaction, dump):
+    """Expect no changes between a database and the source it was built from."""
+    assert list(diff_snapshots(session, dump, join_on=JOIN_ON)) == []
+
+
+def test_apply_joined_changes(session, id2compounds, reaction, dump):
+    """Expect that a database converges to a dump with other identifiers."""
+    obj = dump.dict()
+    obj["compounds"]["ethanol"]["notes"] = "changed"
+    del obj["compounds"]["h"]
+    del obj["reactions"]["dehydrogenase"]["products"]["h"]
+    obj["compounds"]["water"] = {
+        "id": "water",
+        "annotation": {
+            "chebi": [{"biology_qualifier": "is", "identifier": "CHEBI:15377"}]
+        },
+    }
+    obj["reactions"]["dehydrogenase"]["reactants"]["water"] = {
+        "stoichiometry": "1",
+        "compartment": "c",
+    }
+    new = ComponentsModel.parse_obj(obj)
+    changes = {
+        (c.kind, c.id): (c.status, c.fields)
+        for c in diff_snapshots(session, new, join_on=JOIN_ON)
+    }
+    assert changes == {
+        ("compound", str(id2compounds["ethanol"].id)): ("changed", ("notes",)),
+        ("compound", str(id2compounds["h"].id)): ("removed", ()),
+        ("compound", "water"): ("added", ()),
+        ("reaction", str(reaction.id)): ("changed", ("reactants", "products")),
+    }
+    apply_changes(session, diff_snapshots(session, new, join_on=JOIN_ON))
+    session.commit()
+    assert list(diff_snapshots(session, new, join_on=JOIN_ON)) == []
+    assert session.query(Compound).count() == 5
+
+
+def test_added_primary_keys(session, reaction):
+    """Expect that primary keys of another database are not reused."""
+    changes = list(
+        diff_snapshots(ComponentsModel(), session, kinds=["compound"], join_on=JOIN_ON)
+    )
+    assert all(c.id.startswith("new:") for c in changes)
+
+
+def test_ignore_sbo_term(session, id2compounds, reaction):
+    """Expect that the SBO term, which is not stored, is not compared."""
+    obj = CoreExporter(session).export().dict()
+    obj["compounds"][str(id2compounds["ethanol"].id)]["sbo_term"] = "SBO:0000247"
+    assert list(diff_snapshots(session, ComponentsModel.parse_obj(obj))) == []
@@ -0,0 +1,96 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that database statistics are aggregated correctly."""
+
+
+import pytest
+
+from cobra_component_models.builder import ReactionBuilder
+from cobra_component_models.io import ReactionModel
+from cobra_component_models.orm import CompoundName, Participant
+from cobra_component_models.query import stats
+
+
+@pytest.fixture(scope="function")
+def reaction(
+    session,
+    biology_qualifiers,
+    namespaces,
+    id2compartments,
+    id2compounds,
+    reactions_data,
+):
+    """Add a reaction to the database."""
+    reaction = ReactionBuilder(
+        biology_qualifiers=biology_qualifiers,
+        namespaces=namespaces,
+        id2compartment=id2compartments,
+        id2compound=id2compounds,
+    ).build_orm(ReactionModel.parse_obj(reactions_data["dehydrogenase"]))
+    session.add(reaction)
+    session.commit()
+    return reaction
+
+
+def test_empty(session):
+    """Expect zero counts for an empty database."""
+    result = stats(session)
+    assert set(result.row_counts.values()) == {0}
+    assert result.names_per_namespace == {
+        "compartment": {},
+        "compound": {},
+        "reaction": {},
+    }
+    assert result.compounds_without_structure == 0
+    assert result.reactions_with_missing_compartments == 0
+
+
+def test_counts(session, reaction):
+    """Expect the table sizes and counts per namespace."""
+    result = stats(session)
+    assert result.row_counts["compounds"] == 5
+    assert result.row_counts["participants"] == 5
+    assert result.names_per_namespace["compound"] == {"chebi": 7}
+    assert result.annotations_per_namespace["compartment"] == {"go": 1}
+    assert result.annotations_per_namespace["reaction"] == {"rhea": 1}
+    assert result.orphaned_names == {"compartment": 0, "compound": 0, "reaction": 0}
+    assert result.compounds_without_structure == 4
+    assert result.reactions_with_missing_compartments == 0
+
+
+def test_problems(session, id2compounds, reaction):
+    """Expect orphaned names and missing compartments to be reported."""
+    session.execute(
+        CompoundName.__table__.insert().values(
+            compound_id=id2compounds["nad"].id + 1000, name="ghost"
+        )
+    )
+    session.execute(
+        Participant.__table__.update()
+        .where(Participant.__table__.c.compound_id == id2compounds["h"].id)
+        .values(compartment_id=None)
+    )
+    result = stats(session)
+    assert result.orphaned_names["compound"] == 1
+    assert result.names_per_namespace["compound"] == {"chebi": 7, None: 1}
+    assert result.reactions_with_missing_compartments == 1
+
+
+def test_indexes(session):
+    """Expect the indexes of the component tables."""
+    indexes = {(i.table, i.columns) for i in stats(session).indexes}
+    assert ("participants", ("compound_id", "reaction_id")) in indexes
+    assert ("compound_annotations", ("namespace_id",)) in indexes
@@ -0,0 +1,121 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that the command line interface loads, exports, and verifies components."""
+
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from cobra_component_models.cli import main
+
+
+@pytest.fixture(scope="function")
+def database(tmp_path, namespaces_data) -> str:
+    """Return the URL of an initialized database."""
+    path = tmp_path / "namespaces.json"
+    path.write_text(json.dumps(namespaces_data))
+    url = f"sqlite:///{tmp_path / 'components.db'}"
+    assert main(["init-db", url, "--namespaces", str(path)]) == 0
+    return url
+
+
+@pytest.fixture(scope="function")
+def components(tmp_path, compartments_data, compounds_data, reactions_data):
+    """Return the path of a components JSON file."""
+    path = tmp_path / "components.json"
+    path.write_text(
+        json.dumps(
+            {
+                "compartments": compartments_data,
+                "compounds": compounds_data,
+                "reactions": reactions_data,
+            }
+        )
+    )
+    return path
+
+
+def test_load(capsys, database, components):
+    """Expect that a components file is loaded."""
+    assert (
+        main(["load", database, str(components), "--workers", "1", "--chunk-size", "2"])
+        == 0
+    )
+    assert json.loads(capsys.readouterr().out) == {
+        "compartments": 1,
+        "compounds": 5,
+        "reactions": 1,
+    }
+    assert main(["stats", database]) == 0
+    counts = json.loads(capsys.readouterr().out)
+    assert counts["row_counts"]["compounds"] == 5
+    assert counts["row_counts"]["participants"] == 5
+    assert counts["row_counts"]["namespaces"] == 3
+
+
+def test_export(tmp_path, capsys, database, components):
+    """Expect that the exported file is equivalent to the loaded one."""
+    main(["load", database, str(components), "--workers", "1"])
+    capsys.readouterr()
+    output = tmp_path / "export.json"
+    assert main(["export", database, str(output), "--chunk-size", "2"]) == 0
+    counts = json.loads(capsys.readouterr().out)
+    obj = json.loads(output.read_text())
+    assert {section: len(obj[section]) for section in obj} == counts
+    assert counts == {"compartments": 1, "compounds": 5, "reactions": 1}
+
+
+def test_sharded_round_trip(tmp_path, capsys, database, components, namespaces_data):
+    """Expect that a sharded dump is verified and loaded into another database."""
+    main(["load", database, str(components), "--workers", "1"])
+    dump = tmp_path / "dump"
+    assert main(["export", database, str(dump), "--shard-size", "2"]) == 0
+    assert main(["verify", str(dump)]) == 0
+    (tmp_path / "namespaces.json").write_text(json.dumps(namespaces_data))
+    other = f"sqlite:///{tmp_path / 'other.db'}"
+    main(["init-db", other, "--namespaces", str(tmp_path / "namespaces.json")])
+    capsys.readouterr()
+    assert main(["load", other, str(dump), "--progress", "--chunk-size", "1"]) == 0
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == {
+        "compartments": 1,
+        "compounds": 5,
+        "reactions": 1,
+    }
+    assert "compounds-00002.json: 1 compounds" in captured.err
+
+
+def test_verify_corrupt(tmp_path, database, components):
+    """Expect that a corrupt shard fails verification."""
+    main(["load", database, str(components), "--workers", "1"])
+    dump = tmp_path / "dump"
+    main(["export", database, str(dump), "--shard-size", "10"])
+    (dump / "compounds-00000.json").write_text("{}")
+    assert main(["verify", str(dump)]) == 1
+
+
+def test_module(database):
+    """Expect that the interface runs as a module."""
+    result = subprocess.run(
+        [sys.executable, "-m", "cobra_component_models.cli", "stats", database],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "row_counts" in json.loads(result.stdout)
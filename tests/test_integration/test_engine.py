@@ -0,0 +1,60 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that SQLite profiles are applied to every connection."""
+
+
+import pytest
+from sqlalchemy import text
+
+from cobra_component_models.engine import SQLITE_PROFILES, make_engine
+
+
+PRAGMA_VALUES = {
+    "journal_mode": {"WAL": "wal"},
+    "synchronous": {"OFF": 0, "NORMAL": 1},
+    "temp_store": {"MEMORY": 2},
+    "foreign_keys": {"ON": 1},
+}
+
+
+@pytest.mark.parametrize("profile", sorted(SQLITE_PROFILES))
+def test_profile(tmp_path, profile):
+    """Expect that the connections of the engine use the profile's PRAGMAs."""
+    engine = make_engine(f"sqlite:///{tmp_path / 'test.db'}", profile=profile)
+    try:
+        with engine.connect() as connection:
+            for name, value in SQLITE_PROFILES[profile].items():
+                (result,) = connection.execute(text(f"PRAGMA {name}")).fetchone()
+                assert result == PRAGMA_VALUES.get(name, {}).get(value, value)
+    finally:
+        engine.dispose()
+
+
+def test_default(tmp_path):
+    """Expect that no PRAGMAs are set without a profile."""
+    engine = make_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    try:
+        with engine.connect() as connection:
+            (result,) = connection.execute(text("PRAGMA journal_mode")).fetchone()
+            assert result == "delete"
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.raises(exception=ValueError, message="Unknown SQLite profile")
+def test_unknown_profile():
+    """Expect that an unknown profile raises an error."""
+    make_engine("sqlite://", profile="fastest")
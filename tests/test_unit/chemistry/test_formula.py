@@ -0,0 +1,93 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that chemical formulae are parsed and evaluated correctly."""
+
+
+import pytest
+
+from cobra_component_models.chemistry import (
+    average_mass,
+    format_formula,
+    monoisotopic_mass,
+    parse_formula,
+)
+
+
+@pytest.mark.parametrize(
+    "formula, expected",
+    [
+        ("H2O", {"H": 2, "O": 1}),
+        ("C2H6O", {"C": 2, "H": 6, "O": 1}),
+        ("CH3CH2OH", {"C": 2, "H": 6, "O": 1}),
+        ("Ca(OH)2", {"Ca": 1, "O": 2, "H": 2}),
+        ("K4[Fe(CN)6]", {"K": 4, "Fe": 1, "C": 6, "N": 6}),
+        ("CuSO4.5H2O", {"Cu": 1, "S": 1, "O": 9, "H": 10}),
+        ("CH3.2H2O.NaCl", {"C": 1, "H": 7, "O": 2, "Na": 1, "Cl": 1}),
+        ("C5H8O4R", {"C": 5, "H": 8, "O": 4, "R": 1}),
+        ("", {}),
+        pytest.param(
+            "C2H6O-",
+            None,
+            marks=pytest.mark.raises(exception=ValueError, message="Unexpected"),
+        ),
+        pytest.param(
+            "Ca(OH2",
+            None,
+            marks=pytest.mark.raises(exception=ValueError, message="Unbalanced"),
+        ),
+        pytest.param(
+            "CaOH)2",
+            None,
+            marks=pytest.mark.raises(exception=ValueError, message="Unbalanced"),
+        ),
+        pytest.param(
+            "(C6H10O5)n",
+            None,
+            marks=pytest.mark.raises(exception=ValueError, message="Unexpected"),
+        ),
+    ],
+)
+def test_parse_formula(formula, expected):
+    """Expect that formulae are converted to element counts."""
+    assert parse_formula(formula) == expected
+
+
+@pytest.mark.parametrize(
+    "counts, expected",
+    [
+        ({"O": 1, "H": 2}, "H2O"),
+        ({"O": 1, "H": 6, "C": 2}, "C2H6O"),
+        ({"Na": 1, "Cl": 1}, "ClNa"),
+        ({"C": 1, "O": 2, "N": 0}, "CO2"),
+    ],
+)
+def test_format_formula(counts, expected):
+    """Expect that element counts are formatted in Hill notation."""
+    assert format_formula(counts) == expected
+
+
+def test_masses():
+    """Expect that masses of water are computed correctly."""
+    counts = parse_formula("H2O")
+    assert monoisotopic_mass(counts) == pytest.approx(18.010565, abs=1e-6)
+    assert average_mass(counts) == pytest.approx(18.015, abs=1e-3)
+
+
+def test_unknown_mass():
+    """Expect that masses of generic formulae are undefined."""
+    counts = parse_formula("C5H8O4R")
+    assert monoisotopic_mass(counts) is None
+    assert average_mass(counts) is None
@@ -0,0 +1,37 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that stoichiometries are converted to numbers."""
+
+
+import math
+
+import pytest
+
+from cobra_component_models.chemistry import parse_stoichiometry
+
+
+@pytest.mark.parametrize(
+    "stoichiometry, expected", [("1", 1.0), ("2.5", 2.5), ("-1", -1.0)]
+)
+def test_parse_numeric(stoichiometry: str, expected: float):
+    """Expect numeric stoichiometries as floats."""
+    assert parse_stoichiometry(stoichiometry) == expected
+
+
+@pytest.mark.parametrize("stoichiometry", ["n", "2n", "n+1"])
+def test_parse_symbolic(stoichiometry: str):
+    """Expect symbolic stoichiometries as NaN."""
+    assert math.isnan(parse_stoichiometry(stoichiometry))
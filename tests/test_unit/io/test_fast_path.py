@@ -0,0 +1,134 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that the validation fast path is equivalent to regular validation."""
+
+
+import pytest
+from pydantic import ValidationError
+
+from cobra_component_models.io import (
+    AnnotationModel,
+    ComponentsModel,
+    CompoundModel,
+    NameModel,
+    ParticipantModel,
+    ReactionModel,
+)
+from cobra_component_models.io.fast_path import NotPlainError
+
+
+@pytest.mark.parametrize(
+    "model, data",
+    [
+        (NameModel, {"name": "foo"}),
+        (NameModel, {"name": "foo", "isPreferred": True}),
+        (NameModel, {"name": "foo", "is_preferred": False}),
+        (AnnotationModel, {"biologyQualifier": "is", "identifier": "bar"}),
+        (
+            AnnotationModel,
+            {
+                "biology_qualifier": "isVersionOf",
+                "identifier": "bar",
+                "isDeprecated": True,
+            },
+        ),
+        (ParticipantModel, {"stoichiometry": "2", "compartment": "c"}),
+    ],
+)
+def test_equivalent_leaves(model, data: dict):
+    """Expect the same values and set fields as with regular validation."""
+    plain = model.construct_plain(data)
+    regular = model(**data)
+    assert plain == regular
+    assert plain.__fields_set__ == regular.__fields_set__
+    assert plain.json() == regular.json()
+
+
+def test_equivalent_components():
+    """Expect nested documents to equal their regular validation."""
+    data = {
+        "compounds": {
+            "x": {
+                "id": "x",
+                "charge": -1,
+                "chemicalFormula": "C2H3O2",
+                "names": {"chebi": [{"name": "acetate"}]},
+                "annotation": {
+                    "chebi": [{"biologyQualifier": "is", "identifier": "CHEBI:30089"}]
+                },
+            }
+        },
+        "reactions": {
+            "r": {
+                "id": "r",
+                "reactants": {"x": {"stoichiometry": "1", "compartment": "c"}},
+            }
+        },
+    }
+    plain = ComponentsModel.construct_plain(data)
+    assert plain == ComponentsModel(**data)
+    compound = plain.compounds["x"]
+    assert isinstance(compound, CompoundModel)
+    assert compound.charge == -1.0 and isinstance(compound.charge, float)
+    assert compound.annotation["chebi"][0].identifier == "CHEBI:30089"
+    assert isinstance(plain.reactions["r"], ReactionModel)
+    assert plain.compartments == {}
+
+
+def test_fresh_defaults():
+    """Expect that mutable defaults are not shared between instances."""
+    first = CompoundModel.construct_plain({"id": "a"})
+    second = CompoundModel.construct_plain({"id": "b"})
+    first.names["chebi"] = []
+    assert second.names == {}
+
+
+@pytest.mark.parametrize(
+    "model, data",
+    [
+        (NameModel, {"name": 1}),
+        (NameModel, {"name": "foo", "isPreferred": "true"}),
+        (NameModel, {"name": "foo", "unknown": None}),
+        (NameModel, {"name": "foo", "is_preferred": True, "isPreferred": True}),
+        (NameModel, {}),
+        (AnnotationModel, {"biologyQualifier": "was", "identifier": "bar"}),
+        (CompoundModel, {"id": "x", "charge": "1"}),
+        (CompoundModel, {"id": "x", "names": {"chebi": [{"name": 1}]}}),
+        (ComponentsModel, []),
+    ],
+)
+def test_not_plain(model, data):
+    """Expect that data needing coercion or validation leaves the fast path."""
+    with pytest.raises(NotPlainError):
+        model.construct_plain(data)
+
+
+def test_coercion_fallback():
+    """Expect that coercion still happens through regular validation."""
+    compound = CompoundModel.parse_obj(
+        {"id": "x", "charge": "1", "names": {"chebi": [{"name": 1}]}}
+    )
+    assert compound.charge == 1.0
+    assert compound.names["chebi"][0].name == "1"
+
+
+def test_error_messages():
+    """Expect the error messages of regular validation."""
+    data = {"annotation": {"chebi": [{"biologyQualifier": "was", "identifier": "a"}]}}
+    with pytest.raises(ValidationError) as fast_error:
+        CompoundModel.parse_obj({"id": "x", **data})
+    assert "valid biology qualifiers" in str(fast_error.value)
+    assert "annotation -> chebi -> 0 -> biologyQualifier" in str(fast_error.value)
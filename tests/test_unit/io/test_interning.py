@@ -0,0 +1,93 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that recurring strings are shared between IO models."""
+
+
+from cobra_component_models.io import (
+    AnnotationModel,
+    CompoundModel,
+    ParticipantModel,
+    intern_keys,
+    set_interning,
+)
+
+
+def copy(value: str) -> str:
+    """Return an equal but distinct string object."""
+    return "".join(list(value))
+
+
+def test_intern_keys():
+    """Expect that the keys of a mapping are interned."""
+    (first,) = intern_keys({copy("kegg.compound"): 1})
+    (second,) = intern_keys({copy("kegg.compound"): 2})
+    assert first is second
+
+
+def test_parsed_annotation():
+    """Expect shared qualifiers and prefixes with and without the fast path."""
+    compounds = [
+        CompoundModel.parse_obj(
+            {
+                "id": copy("x"),
+                "annotation": {
+                    copy("kegg.compound"): [
+                        {
+                            "biologyQualifier": copy("isVersionOf"),
+                            "identifier": "C00001",
+                            # Coercion of the flag forces regular validation.
+                            "isDeprecated": is_deprecated,
+                        }
+                    ]
+                },
+            }
+        )
+        for is_deprecated in (False, 0)
+    ]
+    first, second = [next(iter(c.annotation.items())) for c in compounds]
+    assert first[0] is second[0]
+    assert first[1][0].biology_qualifier is second[1][0].biology_qualifier
+
+
+def test_builder_annotation():
+    """Expect shared qualifiers for models created with keyword arguments."""
+    first = AnnotationModel(biology_qualifier=copy("hasPart"), identifier="a")
+    second = AnnotationModel(biology_qualifier=copy("hasPart"), identifier="b")
+    assert first.biology_qualifier is second.biology_qualifier
+
+
+def test_compartment():
+    """Expect shared compartment identifiers of participants."""
+    first = ParticipantModel.parse_obj(
+        {"stoichiometry": "1", "compartment": copy("cytosol")}
+    )
+    second = ParticipantModel(stoichiometry="1", compartment=copy("cytosol"))
+    assert first.compartment is second.compartment
+
+
+def test_disabled_interning():
+    """Expect distinct strings while interning is turned off."""
+    previous = set_interning(False)
+    try:
+        first = ParticipantModel.parse_obj(
+            {"stoichiometry": "1", "compartment": copy("cytosol")}
+        )
+        second = ParticipantModel(stoichiometry="1", compartment=copy("cytosol"))
+        (prefix,) = intern_keys({copy("kegg.compound"): 1})
+    finally:
+        set_interning(previous)
+    assert first.compartment is not second.compartment
+    assert prefix is not intern_keys({copy("kegg.compound"): 1}).popitem()[0]
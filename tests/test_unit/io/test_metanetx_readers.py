@@ -0,0 +1,101 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that MetaNetX tables are read into IO models."""
+
+
+from io import StringIO
+
+import pytest
+
+from cobra_component_models.io import iter_chem_prop, iter_chem_xref, iter_reac_prop
+from cobra_component_models.io.metanetx import iter_batches, iter_rows
+
+
+def test_iter_rows():
+    """Expect that the last comment line is the header and empty values dropped."""
+    handle = StringIO(
+        "### License\n#ID\tname\tunknown\nMNXM1\t\tfoo\n\nMNXM2\twater\t\n"
+    )
+    assert list(iter_rows(handle)) == [
+        {"id": "MNXM1"},
+        {"id": "MNXM2", "name": "water"},
+    ]
+
+
+@pytest.mark.parametrize("content", ["MNXM1\twater\n", "#name\nwater\n"])
+def test_iter_rows_invalid_header(content: str):
+    """Expect that tables without header or identifier column are rejected."""
+    with pytest.raises(ValueError):
+        list(iter_rows(StringIO(content)))
+
+
+def test_iter_chem_prop():
+    """Expect compound models with structure and MetaNetX annotation."""
+    handle = StringIO(
+        "#ID\tname\treference\tformula\tcharge\tmass\tInChI\tInChIKey\tSMILES\n"
+        "MNXM2\tH2O\tchebi:15377\tH2O\t0\t18.0\tInChI=1S/H2O/h1H2\t"
+        "XLYOFNOQVPJJNP-UHFFFAOYSA-N\tO\n"
+    )
+    (water,) = iter_chem_prop(handle)
+    assert water.id == "MNXM2"
+    assert water.charge == 0
+    assert water.chemical_formula == "H2O"
+    assert water.names["metanetx.chemical"][0].is_preferred
+    assert {p: [a.identifier for a in v] for p, v in water.annotation.items()} == {
+        "metanetx.chemical": ["MNXM2"],
+        "chebi": ["15377"],
+        "inchi": ["InChI=1S/H2O/h1H2"],
+        "inchikey": ["XLYOFNOQVPJJNP-UHFFFAOYSA-N"],
+        "smiles": ["O"],
+    }
+
+
+def test_iter_chem_prop_old_release():
+    """Expect that the columns of older releases are recognized."""
+    handle = StringIO("#MNX_ID\tDescription\tFormula\tCharge\nMNXM2\tH2O\tH2O\t0\n")
+    (water,) = iter_chem_prop(handle)
+    assert water.names["metanetx.chemical"][0].name == "H2O"
+    assert water.chemical_formula == "H2O"
+
+
+def test_iter_chem_xref():
+    """Expect partial compound models with cross-references and names."""
+    handle = StringIO("#source\tID\tdescription\nchebi:15377\tMNXM2\twater||oxidane\n")
+    (water,) = iter_chem_xref(handle)
+    assert water.id == "MNXM2"
+    assert [n.name for n in water.names["chebi"]] == ["water", "oxidane"]
+    assert water.annotation["chebi"][0].identifier == "15377"
+
+
+def test_iter_reac_prop():
+    """Expect reaction models with participants located in compartments."""
+    handle = StringIO(
+        "#ID\tmnx_equation\treference\tclassifs\n"
+        "MNXR1\t1 MNXM3@MNXD1 = 2 MNXM1@MNXD1\trheaR:1\t1.1.1.1;1.1.1.71\n"
+    )
+    (reaction,) = iter_reac_prop(handle)
+    assert reaction.reactants["MNXM3"].compartment == "MNXD1"
+    assert reaction.products["MNXM1"].stoichiometry == "2"
+    assert [a.identifier for a in reaction.annotation["ec-code"]] == [
+        "1.1.1.1",
+        "1.1.1.71",
+    ]
+    assert "products" in reaction.__fields_set__
+
+
+def test_iter_batches():
+    """Expect consecutive batches of at most the given size."""
+    assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
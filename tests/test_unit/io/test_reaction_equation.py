@@ -0,0 +1,110 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that reaction equations are parsed and rendered."""
+
+
+import pytest
+
+from cobra_component_models.io import (
+    ParticipantModel,
+    ReactionModel,
+    parse_equation,
+    parse_equations,
+    render_equation,
+    render_equations,
+)
+
+
+def as_tuples(participants: dict) -> dict:
+    """Return the participants as plain tuples for comparison."""
+    return {c: (p.stoichiometry, p.compartment) for c, p in participants.items()}
+
+
+@pytest.mark.parametrize(
+    "equation, reactants, products",
+    [
+        (
+            "2 h2o[c] <=> 2 h2[c] + o2[c]",
+            {"h2o": ("2", "c")},
+            {"h2": ("2", "c"), "o2": ("1", "c")},
+        ),
+        ("a[c] --> 0.5 b[e]", {"a": ("1", "c")}, {"b": ("0.5", "e")}),
+        ("a[c] <-- 1e-3 b[e]", {"b": ("1e-3", "e")}, {"a": ("1", "c")}),
+        (
+            "[c]: fe2+ + h+ -> fe3+",
+            {"fe2+": ("1", "c"), "h+": ("1", "c")},
+            {"fe3+": ("1", "c")},
+        ),
+        ("[c]: a <=> b[e]", {"a": ("1", "c")}, {"b": ("1", "e")}),
+        ("h2o[e] <=>", {"h2o": ("1", "e")}, {}),
+        ("<=> h2o[e]", {}, {"h2o": ("1", "e")}),
+    ],
+)
+def test_parse_equation(equation: str, reactants: dict, products: dict):
+    """Expect that reactants and products are parsed from valid equations."""
+    left, right = parse_equation(equation)
+    assert as_tuples(left) == reactants
+    assert as_tuples(right) == products
+
+
+@pytest.mark.parametrize(
+    "equation, message",
+    [
+        ("a[c] + b[c]", "exactly one reaction arrow"),
+        ("a[c] <=> b[c] <=> c[c]", "exactly one reaction arrow"),
+        ("a[c] <=> b", "lacks a compartment"),
+        ("a[c] + a[c] <=> b[c]", "occurs twice"),
+        ("a[c] b[c] <=> c[c]", "Malformed term"),
+        ("a[c] + <=> c[c]", "Malformed term"),
+        ("a[] <=> c[c]", "Malformed term"),
+        ("a[c]<=>b[c]", "exactly one reaction arrow"),
+    ],
+)
+def test_parse_invalid_equation(equation: str, message: str):
+    """Expect that invalid equations are rejected."""
+    with pytest.raises(ValueError, match=message):
+        parse_equation(equation)
+
+
+def test_parse_equations():
+    """Expect that many equations are parsed in order."""
+    result = list(parse_equations(["a[c] -> b[c]", "b[c] -> c[c]"]))
+    assert [list(products) for _, products in result] == [["b"], ["c"]]
+
+
+def test_render_equation():
+    """Expect that coefficients of one are omitted."""
+    reaction = ReactionModel(
+        id="r",
+        reactants={"h2o": ParticipantModel(stoichiometry="2", compartment="c")},
+        products={
+            "h2": ParticipantModel(stoichiometry="2", compartment="c"),
+            "o2": ParticipantModel(stoichiometry="1", compartment="c"),
+        },
+    )
+    assert render_equation(reaction) == "2 h2o[c] <=> 2 h2[c] + o2[c]"
+    assert render_equation(reaction, arrow="-->") == "2 h2o[c] --> 2 h2[c] + o2[c]"
+
+
+@pytest.mark.parametrize(
+    "equation",
+    ["2 h2o[c] <=> 2 h2[c] + o2[c]", "fe2+[c] <=> fe3+[c]", "h2o[e] <=>"],
+)
+def test_round_trip(equation: str):
+    """Expect that rendering a parsed equation reproduces it."""
+    reactants, products = parse_equation(equation)
+    reaction = ReactionModel(id="r", reactants=reactants, products=products)
+    assert list(render_equations([reaction])) == [equation]
@@ -0,0 +1,104 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that SBML documents are read incrementally."""
+
+
+from typing import Optional, Tuple
+
+import pytest
+
+from cobra_component_models.io import (
+    CompartmentModel,
+    CompoundModel,
+    MiriamIndex,
+    ParticipantModel,
+    ReactionModel,
+    SBMLWriter,
+    read_sbml,
+)
+
+
+@pytest.fixture(scope="module")
+def index() -> MiriamIndex:
+    """Return a MIRIAM index of a few namespaces."""
+    return MiriamIndex({"chebi": True, "bigg.metabolite": False, "go": True})
+
+
+@pytest.mark.parametrize(
+    "uri, expected",
+    [
+        ("https://identifiers.org/chebi/CHEBI:15377", ("chebi", "CHEBI:15377")),
+        ("http://identifiers.org/chebi/CHEBI:15377", ("chebi", "CHEBI:15377")),
+        ("https://identifiers.org/CHEBI:15377", ("chebi", "CHEBI:15377")),
+        ("https://identifiers.org/bigg.metabolite:h2o", ("bigg.metabolite", "h2o")),
+        ("urn:miriam:chebi:CHEBI%3A15377", ("chebi", "CHEBI:15377")),
+        ("https://identifiers.org/kegg.compound/C00001", None),
+        ("https://example.org/chebi/CHEBI:15377", None),
+    ],
+)
+def test_resolve(index: MiriamIndex, uri: str, expected: Optional[Tuple[str, str]]):
+    """Expect that the URI forms map onto namespace prefix and identifier."""
+    assert index.resolve(uri) == expected
+
+
+def test_read_sbml(tmp_path, index: MiriamIndex):
+    """Expect that written components are read back."""
+    path = tmp_path / "model.xml"
+    with path.open("w") as handle, SBMLWriter(handle, model_id="test") as writer:
+        writer.write_compartment(
+            CompartmentModel.parse_obj(
+                {
+                    "id": "c",
+                    "annotation": {
+                        "go": [{"biologyQualifier": "is", "identifier": "GO:0005829"}]
+                    },
+                }
+            )
+        )
+        writer.write_species(
+            CompoundModel.parse_obj(
+                {
+                    "id": "h2o",
+                    "charge": 0,
+                    "chemicalFormula": "H2O",
+                    "names": {"chebi": [{"name": "water", "isPreferred": True}]},
+                    "annotation": {
+                        "chebi": [
+                            {"biologyQualifier": "is", "identifier": "CHEBI:15377"}
+                        ]
+                    },
+                }
+            ),
+            "c",
+        )
+        writer.write_reaction(
+            ReactionModel(
+                id="r1",
+                reactants={"h2o": ParticipantModel(stoichiometry="2", compartment="c")},
+            )
+        )
+    document = read_sbml(path, index, name_prefix="chebi")
+    assert document.model_id == "model_test"
+    assert list(document.compartments) == ["c"]
+    assert document.compartments["c"].annotation["go"][0].identifier == "GO:0005829"
+    compound = document.compounds["h2o"]
+    assert compound.charge == 0
+    assert compound.chemical_formula == "H2O"
+    assert compound.names["chebi"][0].name == "water"
+    assert compound.annotation["chebi"][0].identifier == "CHEBI:15377"
+    participant = document.reactions["r1"].reactants["h2o"]
+    assert participant.compartment == "c"
+    assert float(participant.stoichiometry) == 2
@@ -0,0 +1,158 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that SBML documents are written incrementally."""
+
+
+from io import StringIO
+from xml.etree import ElementTree
+
+import pytest
+
+from cobra_component_models.io import (
+    CompartmentModel,
+    CompoundModel,
+    ParticipantModel,
+    ReactionModel,
+    SBMLWriter,
+    make_sid,
+)
+from cobra_component_models.io.sbml_writer import (
+    BQBIOL_NS,
+    FBC_NS,
+    RDF_NS,
+    SBML_NS,
+)
+
+
+NS = {"sbml": SBML_NS, "fbc": FBC_NS, "rdf": RDF_NS, "bqbiol": BQBIOL_NS}
+
+
+@pytest.mark.parametrize(
+    "prefix, parts, expected",
+    [
+        ("M", ("h2o", "c"), "M_h2o_c"),
+        ("R", ("12",), "R_12"),
+        ("M", ("a-b.c",), "M_a_b_c"),
+    ],
+)
+def test_make_sid(prefix: str, parts: tuple, expected: str):
+    """Expect valid SBML identifiers."""
+    assert make_sid(prefix, *parts) == expected
+
+
+def test_write():
+    """Expect compartments, species, and reactions with their attributes."""
+    handle = StringIO()
+    with SBMLWriter(handle, model_id="test") as writer:
+        writer.write_compartment(CompartmentModel(id="c", notes="The cytosol."))
+        writer.write_species(
+            CompoundModel.parse_obj(
+                {
+                    "id": "h2o",
+                    "charge": 0,
+                    "chemicalFormula": "H2O",
+                    "sboTerm": "SBO:0000247",
+                    "names": {
+                        "chebi": [
+                            {"name": "oxidane"},
+                            {"name": "water", "isPreferred": True},
+                        ]
+                    },
+                    "annotation": {
+                        "chebi": [
+                            {"biologyQualifier": "is", "identifier": "CHEBI:15377"}
+                        ],
+                        "smiles": [{"biologyQualifier": "is", "identifier": "O"}],
+                    },
+                }
+            ),
+            "c",
+        )
+        writer.write_reaction(
+            ReactionModel(
+                id="r1",
+                reactants={"h2o": ParticipantModel(stoichiometry="2", compartment="c")},
+            )
+        )
+    root = ElementTree.fromstring(handle.getvalue())
+    model = root.find("sbml:model", NS)
+    assert model.get("id") == "model_test"
+    compartment = model.find("sbml:listOfCompartments/sbml:compartment", NS)
+    assert compartment.get("id") == "C_c"
+    assert "".join(compartment.find("sbml:notes", NS).itertext()) == "The cytosol."
+    species = model.find("sbml:listOfSpecies/sbml:species", NS)
+    assert species.get("id") == "M_h2o_c"
+    assert species.get("compartment") == "C_c"
+    assert species.get("name") == "water"
+    assert species.get("sboTerm") == "SBO:0000247"
+    assert species.get(f"{{{FBC_NS}}}charge") == "0"
+    assert species.get(f"{{{FBC_NS}}}chemicalFormula") == "H2O"
+    assert [
+        li.get(f"{{{RDF_NS}}}resource")
+        for li in species.iterfind(".//bqbiol:is/rdf:Bag/rdf:li", NS)
+    ] == ["https://identifiers.org/chebi/CHEBI:15377"]
+    reference = model.find(
+        "sbml:listOfReactions/sbml:reaction/sbml:listOfReactants/"
+        "sbml:speciesReference",
+        NS,
+    )
+    assert reference.get("species") == "M_h2o_c"
+    assert reference.get("stoichiometry") == "2"
+
+
+@pytest.mark.raises(exception=ValueError, message="must be written before")
+def test_write_out_of_order():
+    """Expect that compartments cannot follow species."""
+    writer = SBMLWriter(StringIO())
+    writer.start()
+    writer.write_compartment(CompartmentModel(id="c"))
+    writer.write_species(CompoundModel(id="h2o"), "c")
+    writer.write_compartment(CompartmentModel(id="c"))
+
+
+def test_write_colliding_ids():
+    """Expect a suffix for components whose identifiers would collide."""
+    handle = StringIO()
+    with SBMLWriter(handle) as writer:
+        writer.write_compartment(CompartmentModel(id="c"))
+        writer.write_compartment(CompartmentModel(id="b_c"))
+        writer.write_species(CompoundModel(id="a-b"), "c")
+        writer.write_species(CompoundModel(id="a_b"), "c")
+        writer.write_species(CompoundModel(id="a"), "b_c")
+        writer.write_reaction(
+            ReactionModel(
+                id="r1",
+                reactants={"a_b": ParticipantModel(stoichiometry="1", compartment="c")},
+                products={"a": ParticipantModel(stoichiometry="1", compartment="b_c")},
+            )
+        )
+    model = ElementTree.fromstring(handle.getvalue()).find("sbml:model", NS)
+    assert [
+        species.get("id")
+        for species in model.iterfind("sbml:listOfSpecies/sbml:species", NS)
+    ] == ["M_a_b_c", "M_a_b_c_2", "M_a_b_c_3"]
+    assert [
+        reference.get("species")
+        for reference in model.iterfind(".//sbml:speciesReference", NS)
+    ] == ["M_a_b_c_2", "M_a_b_c_3"]
+
+
+@pytest.mark.raises(exception=ValueError, message="was not written")
+def test_write_unknown_compartment():
+    """Expect that species must be located in a written compartment."""
+    with SBMLWriter(StringIO()) as writer:
+        writer.write_compartment(CompartmentModel(id="c"))
+        writer.write_species(CompoundModel(id="h2o"), "e")
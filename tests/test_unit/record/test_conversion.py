@@ -0,0 +1,112 @@
+# Copyright (c) 2020, Moritz E. Beber.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Expect that IO models and records are converted losslessly."""
+
+
+import pytest
+
+from cobra_component_models.io import (
+    CompartmentModel,
+    CompoundModel,
+    NameModel,
+    ReactionModel,
+)
+from cobra_component_models.record import (
+    AnnotationRecord,
+    CompoundRecord,
+    NameRecord,
+    ParticipantRecord,
+    ReactionRecord,
+    to_model,
+    to_record,
+)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        CompartmentModel(id="c", notes="cytosol", names={"go": [{"name": "cytosol"}]}),
+        CompoundModel(
+            id="x",
+            sboTerm="SBO:0000247",
+            charge=-1,
+            chemicalFormula="C2H3O2",
+            names={"chebi": [{"name": "acetate", "isPreferred": True}]},
+            annotation={
+                "chebi": [
+                    {"biologyQualifier": "is", "identifier": "CHEBI:30089"},
+                    {
+                        "biologyQualifier": "isVersionOf",
+                        "identifier": "CHEBI:15366",
+                        "isDeprecated": True,
+                    },
+                ]
+            },
+        ),
+        ReactionModel(
+            id="r",
+            reactants={"x": {"stoichiometry": "2", "compartment": "c"}},
+            products={"y": {"stoichiometry": "1", "compartment": "e"}},
+        ),
+    ],
+)
+def test_round_trip(model):
+    """Expect that converting to a record and back yields an equal model."""
+    record = to_record(model)
+    assert record.id == model.id
+    assert to_model(record) == model
+
+
+def test_record_fields():
+    """Expect that records hold the same values as the models."""
+    record = to_record(
+        ReactionModel(
+            id="r",
+            names={"rhea": [{"name": "reaction"}]},
+            annotation={"rhea": [{"biologyQualifier": "is", "identifier": "25290"}]},
+            reactants={"x": {"stoichiometry": "2", "compartment": "c"}},
+        )
+    )
+    assert record == ReactionRecord(
+        id="r",
+        names={"rhea": [NameRecord("reaction", False)]},
+        annotation={"rhea": [AnnotationRecord("is", "25290", False)]},
+        reactants={"x": ParticipantRecord("2", "c")},
+        products={},
+    )
+
+
+@pytest.mark.raises(exception=ValueError, message="valid biology qualifiers")
+def test_validation():
+    """Expect that invalid records are rejected when converted to models."""
+    to_model(
+        CompoundRecord(
+            id="x", names={}, annotation={"chebi": [AnnotationRecord("was", "a")]}
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "func, obj",
+    [
+        (to_record, NameModel(name="foo")),
+        (to_model, NameRecord("foo")),
+    ],
+)
+def test_unknown_type(func, obj):
+    """Expect that other types cannot be converted."""
+    with pytest.raises(TypeError):
+        func(obj)